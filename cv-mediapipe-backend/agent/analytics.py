@@ -0,0 +1,320 @@
+# analytics.py
+"""
+Batch engagement analytics over recorded sessions (see agent/recorder.py).
+
+Every metric is computed with whole-array numpy operations over the recorded
+columns, so millions of frames take seconds and nothing is replayed through
+MediaPipe. Rollups are cached next to each recording as rollup.json and only
+recomputed when the recording changes; sessions are analyzed in parallel
+processes. The API serves cached rollups through RollupService, which
+recomputes stale ones in the background:
+
+    python -m agent.analytics recordings --workers 4 --output weekly.json
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .landmarks import GESTURE_NAMES
+from .recorder import SessionRecording, list_recordings
+
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_FILE = 'rollup.json'
+SCALAR_COLUMNS = ['timestamp', 'attention', 'face_present', 'event_id', 'workflow']
+
+BUCKET_SECONDS = 60.0
+MAX_FRAME_GAP = 1.0        # Longer gaps between frames (pauses, restarts) count as this long
+FOCUS_THRESHOLD = 0.5      # Attention at or above this counts as focused
+FOCUS_MERGE_GAP = 1.0      # Focus runs separated by less than this many seconds are merged
+
+
+def frame_durations(timestamps, max_gap=MAX_FRAME_GAP):
+    """Time each frame stands for - the gap to the next frame, capped; the last frame gets the median"""
+    if len(timestamps) == 0:
+        return np.empty(0)
+    gaps = np.diff(timestamps)
+    last = np.median(gaps) if len(gaps) else 0.0
+    return np.minimum(np.append(gaps, last), max_gap)
+
+
+def attention_series(timestamps, attention, face_present, bucket_seconds=BUCKET_SECONDS):
+    """Per-bucket mean attention (face frames only) and face presence ratio"""
+    if len(timestamps) == 0:
+        return {'bucket_seconds': bucket_seconds, 'start': None, 'attention': [], 'presence': []}
+
+    start = timestamps[0]
+    buckets = ((timestamps - start) // bucket_seconds).astype(np.int64)
+    count = buckets[-1] + 1
+    frames = np.bincount(buckets, minlength=count)
+    faces = np.bincount(buckets, weights=face_present, minlength=count)
+    attention_sum = np.bincount(buckets, weights=attention * face_present, minlength=count)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_attention = np.where(faces > 0, attention_sum / faces, np.nan)
+        presence = np.where(frames > 0, faces / frames, np.nan)
+    return {
+        'bucket_seconds': bucket_seconds,
+        'start': float(start),
+        # NaN (no frames / no face in the bucket) becomes null in JSON
+        'attention': [None if np.isnan(v) else round(float(v), 4) for v in mean_attention],
+        'presence': [None if np.isnan(v) else round(float(v), 4) for v in presence]
+    }
+
+
+def focus_intervals(timestamps, attention, face_present, threshold=FOCUS_THRESHOLD,
+                    merge_gap=FOCUS_MERGE_GAP, durations=None):
+    """(start, end) timestamps of focused stretches, with short interruptions merged"""
+    if len(timestamps) == 0:
+        return np.empty((0, 2))
+
+    focused = (face_present > 0) & (attention >= threshold)
+    edges = np.diff(np.concatenate(([0], focused.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1) - 1
+    if len(starts) == 0:
+        return np.empty((0, 2))
+
+    if durations is None:
+        durations = frame_durations(timestamps)
+    start_times = timestamps[starts]
+    end_times = timestamps[ends] + durations[ends]
+
+    # Merge a run into the previous one when the gap between them is short
+    keep = np.ones(len(starts), dtype=bool)
+    keep[1:] = start_times[1:] - end_times[:-1] >= merge_gap
+    first = np.flatnonzero(keep)
+    return np.column_stack((start_times[first], np.maximum.reduceat(end_times, first)))
+
+
+def gesture_event_counts(event_id):
+    counts = np.bincount(event_id, minlength=len(GESTURE_NAMES))
+    return {name: int(counts[index]) for index, name in enumerate(GESTURE_NAMES) if name}
+
+
+def workflow_engagement(workflow, attention, face_present, event_id, durations, workflow_ids):
+    """Time, face presence, mean attention and gesture events while each workflow was running"""
+    size = len(workflow_ids) + 1
+    time_spent = np.bincount(workflow, weights=durations, minlength=size)
+    face_time = np.bincount(workflow, weights=durations * face_present, minlength=size)
+    attention_time = np.bincount(workflow, weights=durations * face_present * attention, minlength=size)
+    events = np.bincount(workflow, weights=event_id > 0, minlength=size)
+
+    engagement = {}
+    for index, workflow_id in enumerate(workflow_ids, start=1):
+        if time_spent[index] <= 0:
+            continue
+        engagement[workflow_id] = {
+            'seconds': float(time_spent[index]),
+            'face_seconds': float(face_time[index]),
+            'mean_attention': float(attention_time[index] / face_time[index]) if face_time[index] > 0 else None,
+            'gesture_events': int(events[index])
+        }
+    return engagement
+
+
+def analyze_recording(path, bucket_seconds=BUCKET_SECONDS):
+    """Compute the rollup of one recording"""
+    recording = SessionRecording(path)
+    data = recording.load(SCALAR_COLUMNS)
+    timestamps = data['timestamp']
+    attention = data['attention'].astype(np.float64)
+    face_present = data['face_present'].astype(np.float64)
+    event_id = data['event_id'].astype(np.int64)
+    workflow = data['workflow'].astype(np.int64)
+
+    durations = frame_durations(timestamps)
+    intervals = focus_intervals(timestamps, attention, face_present, durations=durations)
+    focus_lengths = intervals[:, 1] - intervals[:, 0]
+    face_seconds = float(np.dot(durations, face_present))
+
+    return {
+        'path': path,
+        'session_id': recording.session_id,
+        'frames': int(len(timestamps)),
+        'start': float(timestamps[0]) if len(timestamps) else None,
+        'end': float(timestamps[-1]) if len(timestamps) else None,
+        'seconds': float(durations.sum()),
+        'face_seconds': face_seconds,
+        'mean_attention': float(np.dot(durations * face_present, attention) / face_seconds) if face_seconds else None,
+        'attention_series': attention_series(timestamps, attention, face_present, bucket_seconds),
+        'focus': {
+            'intervals': int(len(intervals)),
+            'seconds': float(focus_lengths.sum()),
+            'longest_seconds': float(focus_lengths.max()) if len(focus_lengths) else 0.0,
+            'mean_seconds': float(focus_lengths.mean()) if len(focus_lengths) else 0.0
+        },
+        'gesture_events': gesture_event_counts(event_id),
+        'workflows': workflow_engagement(workflow, attention, face_present, event_id, durations,
+                                         recording.workflows)
+    }
+
+
+def rollup_is_fresh(path):
+    """Whether the cached rollup is newer than the recording, including a segment still being written"""
+    rollup_path = os.path.join(path, ROLLUP_FILE)
+    if not os.path.exists(rollup_path):
+        return False
+    recording = SessionRecording(path)
+    changed = os.path.getmtime(os.path.join(path, 'session.json'))
+    if recording.metadata['segments']:
+        last_segment = os.path.join(path, recording.metadata['segments'][-1]['name'], 'timestamp.npy')
+        changed = max(changed, os.path.getmtime(last_segment))
+    return os.path.getmtime(rollup_path) >= changed
+
+
+def analyze_and_cache(path):
+    """Worker entry point - analyze a recording and store its rollup next to it"""
+    rollup = analyze_recording(path)
+    # Written aside and renamed, so readers never see a half-written rollup
+    temporary = os.path.join(path, ROLLUP_FILE + '.tmp')
+    with open(temporary, 'w') as f:
+        json.dump(rollup, f)
+    os.replace(temporary, os.path.join(path, ROLLUP_FILE))
+    return rollup
+
+
+def load_rollups(root, session_id=None, workers=None, refresh=False):
+    """Rollups of all recordings under `root`, recomputing stale ones across processes"""
+    paths = list_recordings(root, session_id)
+    stale = [path for path in paths if refresh or not rollup_is_fresh(path)]
+
+    rollups = {}
+    if len(stale) > 1:
+        # Spawned workers - the callers (Flask, CLI) run threads that fork would not copy safely
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            for path, rollup in zip(stale, pool.map(analyze_and_cache, stale)):
+                rollups[path] = rollup
+    elif stale:
+        rollups[stale[0]] = analyze_and_cache(stale[0])
+
+    for path in paths:
+        if path not in rollups:
+            rollups[path] = read_rollup(path)
+    return [rollups[path] for path in paths]
+
+
+def read_rollup(path):
+    with open(os.path.join(path, ROLLUP_FILE)) as f:
+        return json.load(f)
+
+
+class RollupService:
+    """
+    Cached rollups for the API. Requests only read rollup.json files; stale or
+    missing rollups are recomputed in the background on one long-lived process
+    pool, and a stale rollup is served until its replacement is written.
+    """
+
+    def __init__(self, root, workers=None):
+        self.root = root
+        self.workers = workers
+        self.lock = threading.Lock()
+        self.pool = None        # Spawned on the first recompute and kept
+        self.computing = {}     # path -> Future
+
+    def rollups(self, session_id=None, refresh=False):
+        """(cached rollups, paths of recordings without a rollup yet); `refresh` recomputes all of them"""
+        rollups, pending = [], []
+        for path in list_recordings(self.root, session_id):
+            fresh = rollup_is_fresh(path)
+            if refresh or not fresh:
+                self.recompute(path)
+            if os.path.exists(os.path.join(path, ROLLUP_FILE)):
+                rollups.append(read_rollup(path))
+            else:
+                pending.append(path)
+        return rollups, pending
+
+    def recompute(self, path):
+        with self.lock:
+            if path in self.computing:
+                return
+            if self.pool is None:
+                # Spawned workers - Flask runs threads that fork would not copy safely
+                self.pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                mp_context=multiprocessing.get_context('spawn'))
+            future = self.pool.submit(analyze_and_cache, path)
+            self.computing[path] = future
+        future.add_done_callback(lambda done: self.finished(path, done))
+
+    def finished(self, path, future):
+        with self.lock:
+            self.computing.pop(path, None)
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Failed to analyze recording {path}: {future.exception()}")
+
+    def close(self):
+        with self.lock:
+            pool, self.pool = self.pool, None
+            self.computing = {}
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def combine_rollups(rollups):
+    """Totals across sessions: time, attention, focus, gesture events and per-workflow engagement"""
+    face_seconds = sum(r['face_seconds'] for r in rollups)
+    attention_time = sum(r['mean_attention'] * r['face_seconds'] for r in rollups if r['mean_attention'] is not None)
+
+    gesture_events = {name: 0 for name in GESTURE_NAMES if name}
+    workflows = {}
+    for rollup in rollups:
+        for name, count in rollup['gesture_events'].items():
+            gesture_events[name] = gesture_events.get(name, 0) + count
+        for workflow_id, stats in rollup['workflows'].items():
+            total = workflows.setdefault(workflow_id, {'seconds': 0.0, 'face_seconds': 0.0,
+                                                       'attention_time': 0.0, 'gesture_events': 0})
+            total['seconds'] += stats['seconds']
+            total['face_seconds'] += stats['face_seconds']
+            total['attention_time'] += (stats['mean_attention'] or 0.0) * stats['face_seconds']
+            total['gesture_events'] += stats['gesture_events']
+
+    for total in workflows.values():
+        attention = total.pop('attention_time')
+        total['mean_attention'] = attention / total['face_seconds'] if total['face_seconds'] else None
+
+    return {
+        'sessions': len(rollups),
+        'frames': sum(r['frames'] for r in rollups),
+        'seconds': sum(r['seconds'] for r in rollups),
+        'face_seconds': face_seconds,
+        'mean_attention': attention_time / face_seconds if face_seconds else None,
+        'focus_seconds': sum(r['focus']['seconds'] for r in rollups),
+        'focus_intervals': sum(r['focus']['intervals'] for r in rollups),
+        'gesture_events': gesture_events,
+        'workflows': workflows
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Engagement analytics over recorded Conductor sessions')
+    parser.add_argument('root', help='Recordings directory')
+    parser.add_argument('--session', help='Only analyze this session id')
+    parser.add_argument('--workers', type=int, default=None, help='Analysis processes (default: CPU count)')
+    parser.add_argument('--refresh', action='store_true', help='Recompute cached rollups')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    args = parser.parse_args(argv)
+
+    rollups = load_rollups(args.root, args.session, workers=args.workers, refresh=args.refresh)
+    report = {'totals': combine_rollups(rollups), 'sessions': rollups}
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    print(text)
+    return 0 if rollups else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
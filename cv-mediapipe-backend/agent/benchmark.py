@@ -0,0 +1,134 @@
+# benchmark.py
+"""
+Offline CV pipeline benchmark.
+
+Replays a video file or a directory of frames through the service at max
+speed and reports per-stage timings, throughput and latency percentiles as
+JSON, so regressions can be caught in CI without a camera:
+
+    python -m agent.benchmark recordings/standup.mp4 --frames 600 --output bench.json
+"""
+import argparse
+import json
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from .emotion_monitor import ConductorOrchestrationService
+
+
+STAGES = ('color', 'face_mesh', 'hands', 'gesture', 'overlay', 'encode')
+
+
+def summarize(samples):
+    """Mean and tail percentiles of a list of durations, in milliseconds"""
+    if not samples:
+        return {'count': 0}
+    values = np.asarray(samples) * 1000.0
+    p50, p95, p99 = np.percentile(values, (50, 95, 99))
+    return {
+        'count': len(values),
+        'mean_ms': float(values.mean()),
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99),
+        'max_ms': float(values.max())
+    }
+
+
+def run_benchmark(source, max_frames=None, warmup_frames=10, adaptive=False,
+                  overlay=True, encode_quality=80, inference_workers=0):
+    """Run every frame of a recorded source through the pipeline stages in order"""
+    service = ConductorOrchestrationService(source=source, headless=True, realtime=False,
+                                            inference_workers=inference_workers)
+    # Startup cost is not part of the per-frame numbers
+    service.wait_until_ready()
+    service.governor.enabled = adaptive
+    # Measure the full models on every frame, including stretches without a face
+    service.presence.enabled = False
+    service.start_orchestration_session()
+    service.clear_avatar_message()
+
+    timings = {stage: [] for stage in STAGES}
+    latencies = []
+    frames = 0
+    started = None
+
+    try:
+        while max_frames is None or frames < max_frames + warmup_frames:
+            ret, frame = service.cap.read()
+            if not ret:
+                break
+
+            frame_started = time.perf_counter()
+            if frames == warmup_frames:
+                started = frame_started
+
+            service.process_user_interaction(frame)
+            stage_times = dict(service.last_stage_times)
+
+            if overlay:
+                stage_started = time.perf_counter()
+                service.annotate_frame(frame, service.last_landmarks)
+                stage_times['overlay'] = time.perf_counter() - stage_started
+
+                stage_started = time.perf_counter()
+                cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, encode_quality])
+                stage_times['encode'] = time.perf_counter() - stage_started
+
+            frames += 1
+            if frames <= warmup_frames:
+                continue
+
+            latencies.append(time.perf_counter() - frame_started)
+            for stage, elapsed in stage_times.items():
+                if stage in timings:
+                    timings[stage].append(elapsed)
+    finally:
+        service.stop()
+
+    measured = len(latencies)
+    elapsed = time.perf_counter() - started if started is not None else 0.0
+    return {
+        'source': str(source),
+        'frames': measured,
+        'warmup_frames': min(frames, warmup_frames),
+        'adaptive': adaptive,
+        'overlay': overlay,
+        'inference_workers': inference_workers,
+        'elapsed_s': elapsed,
+        'throughput_fps': measured / elapsed if elapsed > 0 else 0.0,
+        'latency': summarize(latencies),
+        'stages': {stage: summarize(samples) for stage, samples in timings.items()},
+        'governor': service.governor.get_state()
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the Conductor CV pipeline on a recording')
+    parser.add_argument('source', help='Video file or directory of frames')
+    parser.add_argument('--frames', type=int, default=None, help='Frames to measure (default: all)')
+    parser.add_argument('--warmup', type=int, default=10, help='Frames to run before measuring')
+    parser.add_argument('--adaptive', action='store_true', help='Let the frame-budget governor adapt')
+    parser.add_argument('--no-overlay', action='store_true', help='Skip the overlay and encode stages')
+    parser.add_argument('--inference-workers', type=int, default=0,
+                        help='Run the models in this many worker processes (0 = in-process)')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.source, max_frames=args.frames, warmup_frames=args.warmup,
+                           adaptive=args.adaptive, overlay=not args.no_overlay,
+                           inference_workers=args.inference_workers)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    print(text)
+    return 0 if report['frames'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,5 @@
 # conductor_service.py
 import cv2
-import mediapipe as mp
 from collections import deque
 import time
 import numpy as np
@@ -8,33 +7,80 @@ import json
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 import threading
-import queue
+
+from .frame_pipeline import FramePipeline, DROP_OLDEST, BLOCK
+from .frame_sources import open_frame_source
+from .metrics import STAGE_SECONDS, PRESENCE
+from .frame_governor import FrameBudgetGovernor
+from .roi_tracker import RegionTracker
+from .inference_worker import (
+    MODEL_FACE, MODEL_HANDS, MODEL_FACTORIES, MODEL_STAGES, InferencePool, prepare_model_input, run_model
+)
+from .startup import ComponentLoader
+from .presence import PresenceDetector
+from .frame_buffers import FrameBufferPool, ScratchBuffers
+from .engagement import EngagementBuffer
+from .overlay import OverlayCompositor, OverlayPanel
+from .gesture_tracker import GestureTracker
+from .scheduler import TimerScheduler
+from .workflow_registry import WorkflowRegistry
+from .workflow_store import WorkflowStore, new_workflow_id, new_execution_id
+from .workflow_triggers import WorkflowTriggerScheduler, parse_schedule, parse_triggers
+from .execution_queue import DEFAULT_PRIORITY, PRIORITY_WEIGHTS
+from .workflow_executor import WorkflowExecutor, STEP_RUNNING, STEP_PENDING, step_dependencies
+from .recorder import SessionRecorder
+from .landmarks import (
+    FACE_LANDMARK_COUNT, HAND_LANDMARK_COUNT, GESTURE_NAMES, GESTURE_IDS, FACE_CONNECTIONS, HAND_CONNECTIONS,
+    GestureClassifier, attention_scores, draw_landmark_array
+)
+
+
+AVATAR_MESSAGE_SECONDS = 3.0
+WARMUP_FRAME_SHAPE = (480, 640, 3)
+OVERLAY_WORKFLOWS = 6   # Rows the workflow panel shows (the sixth only its name); later rows fall outside it
 
 
 class ConductorOrchestrationService:
     """
     Conductor AI Orchestration Platform
-    Manages multi-platform workflow execution with 3D avatar guidance
+    Manages multi-platform workflow execution with 3D avatar guidance.
+    One instance serves one camera source; CameraSessionManager runs more.
     """
-    _instance = None
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(ConductorOrchestrationService, cls).__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
     
-    def __init__(self):
-        if self._initialized:
-            return
-            
-        # Computer Vision Setup
-        self.cap = cv2.VideoCapture(0)
+    def __init__(self, source=0, headless=False, session_id='default', realtime=True, inference_workers=0,
+                 warmup=True, workflow_workers=4, workflow_db=None, max_running_workflows=8,
+                 workflow_queue_capacity=100):
+        # Computer Vision Setup - a camera, stream URL, video file or directory of frames.
+        # Recorded sources replay at their own frame rate, or at max speed with realtime=False.
+        # The camera and models are opened lazily and in parallel (see register_components)
+        self.session_id = session_id
+        self.source = source
+        self.realtime = realtime
+        self.inference_workers = inference_workers
+        self.warmup = warmup
+        self.startup = ComponentLoader()
+        self.register_components()
         self.is_running = True
         self.is_monitoring = False
         
+        # Headless mode skips all drawing and GUI calls; annotated frames are
+        # only rendered while a frame consumer (e.g. a debug stream) is attached
+        self.headless = headless
+        self.frame_consumers = []
+        self.landmark_consumers = []   # Called per inferred frame, without drawing anything
+        
+        # Opt-in recording of every processed frame to memory-mapped segments
+        self.recorder = None
+        self.recorder_lock = threading.Lock()
+        self.latest_interaction = None
+        
+        # When set, gesture commands are handed to this callback instead of
+        # being executed here (camera sessions forward them to the app process)
+        self.command_sink = None
+        
         # Workflow State Management
-        self.active_workflows = {}
+        # Indexed by status; readers never lock, status changes go through set_status()
+        self.active_workflows = WorkflowRegistry()
         self.workflow_history = deque(maxlen=100)
         self.execution_buffer = deque(maxlen=50)
         
@@ -55,153 +101,277 @@ class ConductorOrchestrationService:
             'crm': {'connected': False, 'last_sync': None}
         }
         
-        # Initialize MediaPipe for face detection and tracking
-        self.mp_face_mesh = mp.solutions.face_mesh
-        self.face_mesh = self.mp_face_mesh.FaceMesh(
-            max_num_faces=1,
-            refine_landmarks=True,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.7
-        )
-        self.mp_drawing = mp.solutions.drawing_utils
-        self.mp_drawing_styles = mp.solutions.drawing_styles
-        
-        # Hand tracking for gesture recognition
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=2,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.5
-        )
-        
         # User attention and engagement tracking
-        self.attention_buffer = deque(maxlen=30)  # 30 frames for attention tracking
+        self.engagement = EngagementBuffer(capacity=9000, windows=(30, 300, 1800))  # ~5 minutes at 30 FPS
         self.engagement_metrics = {
             'focus_duration': 0,
             'interaction_count': 0,
             'workflow_completion_rate': 0.0
         }
         
-        # Workflow orchestration
+        # Workflow orchestration - steps run through the engine's platform adapters on a
+        # bounded pool; the executor's threads start with the first workflow execution.
+        # The lock orders queueing an execution against the executor starting it
         self.workflow_engine = WorkflowEngine()
-        self.task_queue = queue.Queue()
         self.execution_lock = threading.Lock()
         
-        if not self.cap.isOpened():
-            raise RuntimeError("Could not open video capture device")
-        
-        self._initialized = True
+        # Capture / inference / render stage configuration
+        self.pipeline_config = {
+            'capture_depth': 1,
+            # Max-speed replay processes every frame instead of dropping stale ones
+            'capture_drop': DROP_OLDEST if realtime else BLOCK,
+            'render_depth': 2,
+            'render_drop': DROP_OLDEST
+        }
+        self.pipeline = None
+        
+        # Captured frames and model inputs are written into reused buffers instead of new arrays
+        self.frame_buffers = FrameBufferPool(name=session_id)
+        self.input_buffers = ScratchBuffers(name=session_id)
+        
+        # Frame budget governor - adapts model cadence and input scale
+        self.governor = FrameBudgetGovernor(target_frame_time=1/30)
+        self.last_face_results = None
+        self.last_hand_results = None
+        self.last_stage_times = {}
+        self.last_landmarks = {
+            'face': np.empty((0, FACE_LANDMARK_COUNT, 3), dtype=np.float32),
+            'hands': np.empty((0, HAND_LANDMARK_COUNT, 3), dtype=np.float32)
+        }
+        self.gesture_classifier = GestureClassifier()
+        
+        # Skips FaceMesh and Hands and throttles capture while nobody is in front of the camera
+        self.presence = PresenceDetector()
+        self.was_present = None
+        
+        # Avatar message expiry, workflow timeouts and other delayed callbacks share one thread
+        self.scheduler = TimerScheduler(name=f'scheduler-{session_id}')
+        self.workflow_executor = WorkflowExecutor(self.workflow_engine, workers=workflow_workers,
+                                                  scheduler=self.scheduler, on_finished=self.finish_workflow,
+                                                  on_progress=self.persist_workflow,
+                                                  on_start=self.start_queued_workflow,
+                                                  max_running=max_running_workflows,
+                                                  queue_capacity=workflow_queue_capacity)
+        # Cron/interval schedules share the scheduler's timer heap; event triggers fire on gestures,
+        # presence changes, platform connections and other workflows finishing
+        self.workflow_triggers = WorkflowTriggerScheduler(self.run_triggered_workflow, timer=self.scheduler,
+                                                          on_fired=self.persist_workflow)
+        # Optional SQLite store (path or ':memory:'); workflows survive restarts and running ones resume
+        self.workflow_store = None
+        if workflow_db is not None:
+            self.workflow_store = WorkflowStore(workflow_db)
+            self.active_workflows.on_status_change = self.persist_status
+            self.recover_workflows()
+        
+        # Per-hand temporal recognizer - a held gesture fires its command once
+        self.gesture_tracker = GestureTracker()
+        
+        # Cached overlay panels, re-rendered only when their state changes
+        self.overlay = OverlayCompositor()
+        
+        # Region-of-interest trackers - inference runs on crops around the last detections
+        self.face_tracker = RegionTracker(padding=0.3, min_size=0.2)
+        self.hand_tracker = RegionTracker(padding=0.5, min_size=0.3, reacquire_every=60)
+
+    def register_components(self):
+        """
+        Camera and MediaPipe models load on their own threads on first use.
+        With inference_workers > 0 the models run in worker processes fed through
+        shared memory, off this process's GIL.
+        """
+        self.startup.register('camera', self.open_camera)
+        if self.inference_workers:
+            self.startup.register('inference_workers', self.start_inference_pool)
+        else:
+            self.startup.register(MODEL_FACE, lambda: self.load_model(MODEL_FACE))
+            self.startup.register(MODEL_HANDS, lambda: self.load_model(MODEL_HANDS))
+
+    def open_camera(self):
+        cap = open_frame_source(self.source, realtime=self.realtime)
+        if not cap.isOpened():
+            cap.release()
+            raise RuntimeError(f"Could not open video capture source: {self.source}")
+        return cap
+
+    def load_model(self, name):
+        model = MODEL_FACTORIES[name]()
+        if self.warmup:
+            # The first process() call sets up the inference delegates
+            model.process(np.zeros(WARMUP_FRAME_SHAPE, dtype=np.uint8))
+        return model
+
+    def start_inference_pool(self):
+        pool = InferencePool(workers=self.inference_workers)
+        if not pool.wait_ready():
+            pool.close()
+            raise RuntimeError("Inference workers did not start in time")
+        if self.warmup:
+            pool.infer(np.zeros(WARMUP_FRAME_SHAPE, dtype=np.uint8),
+                       [(MODEL_FACE, None, 1.0), (MODEL_HANDS, None, 1.0)])
+        return pool
+
+    @property
+    def cap(self):
+        """The capture source, or None until it has been opened"""
+        return self.startup.peek('camera')
+
+    def wait_until_ready(self, timeout=None):
+        """Load every component now; raises RuntimeError if one of them fails"""
+        self.startup.wait_all(timeout)
+
+    def get_readiness(self):
+        """Per-component initialization status"""
+        return self.startup.describe()
 
     def process_user_interaction(self, frame):
         """Process user face and hand tracking for interaction"""
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        frame_started = time.perf_counter()
+        plan = self.governor.plan_frame()
+        stage_times = {}
+        
+        # Idle - nobody has been seen for a while and nothing moved; only the motion check runs
+        now = time.time()
+        present = self.presence.should_infer(frame, now)
+        if not present:
+            plan = dict(plan, run_face=False, run_hands=False, reuse_landmarks=False)
+        
+        # Face and hand inference on crops around the tracked regions
+        tasks = []
+        if plan['run_face']:
+            tasks.append((MODEL_FACE, self.face_tracker.next_region(), plan['scale']))
+        if plan['run_hands']:
+            tasks.append((MODEL_HANDS, self.hand_tracker.next_region(), plan['scale']))
+        outputs = self.run_inference(frame, tasks, stage_times)
+        regions = {name: region for name, region, _ in tasks}
+        
+        # Landmarks are arrays from here on; a failed worker counts as a miss
+        if MODEL_FACE in regions:
+            faces = outputs.get(MODEL_FACE, self.empty_landmarks(FACE_LANDMARK_COUNT))
+            self.face_tracker.map_to_frame(faces, regions[MODEL_FACE], frame.shape)
+            self.face_tracker.update(faces, regions[MODEL_FACE])
+            if self.face_tracker.coasting and self.last_face_results is not None:
+                faces = self.last_face_results[0]
+            else:
+                self.last_face_results = (faces, time.time())
+        else:
+            faces = self.reuse_results(self.last_face_results, plan, FACE_LANDMARK_COUNT)
+        
+        if MODEL_HANDS in regions:
+            hands = outputs.get(MODEL_HANDS, self.empty_landmarks(HAND_LANDMARK_COUNT))
+            self.hand_tracker.map_to_frame(hands, regions[MODEL_HANDS], frame.shape)
+            self.hand_tracker.update(hands, regions[MODEL_HANDS])
+            if self.hand_tracker.coasting and self.last_hand_results is not None:
+                hands = self.last_hand_results[0]
+            else:
+                self.last_hand_results = (hands, time.time())
+        else:
+            hands = self.reuse_results(self.last_hand_results, plan, HAND_LANDMARK_COUNT)
         
-        # Face detection and tracking
-        face_results = self.face_mesh.process(frame_rgb)
-        hand_results = self.hands.process(frame_rgb)
+        interaction_data = self.empty_interaction(now)
+        if tasks:
+            self.presence.observe(len(faces) > 0 or len(hands) > 0, now)
         
-        interaction_data = {
-            'timestamp': time.time(),
-            'face_detected': False,
-            'hands_detected': 0,
-            'attention_score': 0.0,
-            'gesture_recognized': None
-        }
+        started = time.perf_counter()
         
         # Process face tracking
-        if face_results.multi_face_landmarks:
-            face_landmarks = face_results.multi_face_landmarks[0]
+        if len(faces):
             interaction_data['face_detected'] = True
             
             # Calculate attention score based on face orientation
-            attention_score = self.calculate_attention_score(face_landmarks, frame.shape)
+            attention_score = float(self.calculate_attention_score(faces)[0])
             interaction_data['attention_score'] = attention_score
-            self.attention_buffer.append(attention_score)
-            
-            # Draw face landmarks
-            self.mp_drawing.draw_landmarks(
-                image=frame,
-                landmark_list=face_landmarks,
-                connections=self.mp_face_mesh.FACEMESH_CONTOURS,
-                landmark_drawing_spec=None,
-                connection_drawing_spec=self.mp_drawing_styles.get_default_face_mesh_contours_style()
-            )
-        
-        # Process hand tracking for gestures
-        if hand_results.multi_hand_landmarks:
-            interaction_data['hands_detected'] = len(hand_results.multi_hand_landmarks)
-            
-            for hand_landmarks in hand_results.multi_hand_landmarks:
-                # Recognize gestures
-                gesture = self.recognize_gesture(hand_landmarks)
-                if gesture:
-                    interaction_data['gesture_recognized'] = gesture
-                    self.handle_gesture_command(gesture)
-                
-                # Draw hand landmarks
-                self.mp_drawing.draw_landmarks(
-                    frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
+        
+        # Process hand tracking for gestures - the tracker is fed on empty frames too,
+        # so gestures end when the hands leave
+        interaction_data['hands_detected'] = len(hands)
+        gesture_ids = self.gesture_classifier.classify(hands)
+        events = self.gesture_tracker.update(hands, gesture_ids, interaction_data['timestamp'])
+        
+        active = self.gesture_tracker.active_gestures()
+        if active:
+            interaction_data['gesture_recognized'] = active[0]
+        interaction_data['gesture_events'] = events
+        for gesture in events:
+            self.handle_gesture_command(gesture)
+        stage_times['gesture'] = time.perf_counter() - started
+        
+        self.engagement.append(
+            interaction_data['timestamp'],
+            interaction_data['attention_score'],
+            interaction_data['face_detected'],
+            interaction_data['hands_detected'],
+            GESTURE_IDS[interaction_data['gesture_recognized']]
+        )
+        
+        if self.recorder is not None:
+            with self.recorder_lock:
+                if self.recorder is not None:
+                    self.recorder.append(
+                        interaction_data,
+                        GESTURE_IDS[interaction_data['gesture_recognized']],
+                        GESTURE_IDS[events[0]] if events else 0,
+                        self.current_workflow_id(),
+                        faces, hands
+                    )
+        
+        self.last_landmarks = {'face': faces, 'hands': hands}
+        self.latest_interaction = interaction_data
+        self.last_stage_times = stage_times
+        if present:
+            # Idle frames would drag the governor's timings towards zero
+            self.governor.record(stage_times, time.perf_counter() - frame_started)
+        for stage, elapsed in stage_times.items():
+            STAGE_SECONDS.observe(elapsed, self.session_id, stage)
         
         return interaction_data
 
-    def calculate_attention_score(self, face_landmarks, frame_shape):
-        """Calculate user attention score based on face orientation"""
-        h, w, _ = frame_shape
-        
-        # Key landmarks for attention calculation
-        nose_tip = face_landmarks.landmark[1]
-        left_eye = face_landmarks.landmark[33]
-        right_eye = face_landmarks.landmark[263]
-        
-        # Convert to pixel coordinates
-        nose_x, nose_y = int(nose_tip.x * w), int(nose_tip.y * h)
-        left_eye_x = int(left_eye.x * w)
-        right_eye_x = int(right_eye.x * w)
-        
-        # Calculate face center and deviation from screen center
-        face_center_x = (left_eye_x + right_eye_x) // 2
-        screen_center_x = w // 2
-        
-        # Attention score (1.0 = looking directly at screen, 0.0 = looking away)
-        deviation = abs(face_center_x - screen_center_x) / (w // 2)
-        attention_score = max(0.0, 1.0 - deviation)
-        
-        return attention_score
-
-    def recognize_gesture(self, hand_landmarks):
-        """Recognize hand gestures for workflow control"""
-        # Get landmark positions
-        landmarks = []
-        for lm in hand_landmarks.landmark:
-            landmarks.append([lm.x, lm.y])
-        
-        # Simple gesture recognition logic
-        thumb_tip = landmarks[4]
-        index_tip = landmarks[8]
-        middle_tip = landmarks[12]
-        ring_tip = landmarks[16]
-        pinky_tip = landmarks[20]
-        
-        # Thumbs up gesture
-        if thumb_tip[1] < landmarks[3][1] and index_tip[1] > landmarks[6][1]:
-            return "thumbs_up"
-        
-        # Point gesture (index finger extended)
-        if (index_tip[1] < landmarks[6][1] and 
-            middle_tip[1] > landmarks[10][1] and
-            ring_tip[1] > landmarks[14][1]):
-            return "point"
-        
-        # Open palm (all fingers extended)
-        if (thumb_tip[1] < landmarks[3][1] and
-            index_tip[1] < landmarks[6][1] and
-            middle_tip[1] < landmarks[10][1] and
-            ring_tip[1] < landmarks[14][1] and
-            pinky_tip[1] < landmarks[18][1]):
-            return "open_palm"
-        
-        return None
+    def run_inference(self, frame, tasks, stage_times):
+        """Run (model, region, scale) tasks in-process or on the inference workers"""
+        if self.inference_workers:
+            outputs, times = self.startup.get('inference_workers').infer(frame, tasks)
+            stage_times.update(times)
+            return outputs
+        
+        outputs, rgb_inputs = {}, {}
+        for name, region, scale in tasks:
+            model = self.startup.get(name)
+            started = time.perf_counter()
+            frame_rgb = prepare_model_input(frame, region, scale, rgb_inputs, self.input_buffers)
+            stage_times['color'] = stage_times.get('color', 0.0) + time.perf_counter() - started
+            
+            started = time.perf_counter()
+            outputs[name] = run_model(model, name, frame_rgb)
+            stage_times[MODEL_STAGES[name]] = time.perf_counter() - started
+        return outputs
+
+    def empty_interaction(self, timestamp):
+        return {
+            'timestamp': timestamp,
+            'face_detected': False,
+            'hands_detected': 0,
+            'attention_score': 0.0,
+            'gesture_recognized': None,
+            'gesture_events': []
+        }
+
+    def empty_landmarks(self, count):
+        return np.empty((0, count, 3), dtype=np.float32)
+
+    def reuse_results(self, last_results, plan, count):
+        """Reuse the previous landmarks on frames where a model is skipped"""
+        if plan['reuse_landmarks'] and last_results is not None:
+            landmarks, produced_at = last_results
+            if time.time() - produced_at <= self.governor.max_reuse_age:
+                return landmarks
+        return self.empty_landmarks(count)
+
+    def calculate_attention_score(self, faces):
+        """Calculate attention scores for a (faces, landmarks, 3) array based on face orientation"""
+        return attention_scores(faces)
+
+    def recognize_gesture(self, hands):
+        """Recognize hand gestures for workflow control, one result per hand in a (hands, 21, 3) array"""
+        return [GESTURE_NAMES[gesture_id] for gesture_id in self.gesture_classifier.classify(hands)]
 
     def handle_gesture_command(self, gesture):
         """Handle recognized gestures for workflow control"""
@@ -213,7 +383,12 @@ class ConductorOrchestrationService:
         
         if gesture in gesture_commands:
             command = gesture_commands[gesture]
-            self.execute_gesture_command(command)
+            if self.command_sink is not None:
+                self.command_sink(command)
+            else:
+                self.execute_gesture_command(command)
+        # After the command, so a pause gesture does not pause the workflow it triggered
+        self.workflow_triggers.fire_event('gesture', {'gesture': gesture})
 
     def execute_gesture_command(self, command):
         """Execute workflow commands from gestures"""
@@ -229,123 +404,245 @@ class ConductorOrchestrationService:
 
     def run_conductor_interface(self):
         """Main interface loop - displays video feed with workflow guidance"""
-        cv2.namedWindow('Conductor AI Orchestration', cv2.WINDOW_NORMAL)
-        cv2.resizeWindow('Conductor AI Orchestration', 1200, 800)
+        if not self.headless:
+            cv2.namedWindow('Conductor AI Orchestration', cv2.WINDOW_NORMAL)
+            cv2.resizeWindow('Conductor AI Orchestration', 1200, 800)
+        
+        # Blocks until the camera is open; raises RuntimeError if it cannot be
+        cap = self.startup.get('camera')
+        self.pipeline = FramePipeline(cap, self.infer_frame, name=self.session_id, buffers=self.frame_buffers,
+                                      **self.pipeline_config)
+        self.pipeline.start()
+        
+        try:
+            while self.is_running:
+                packet = self.pipeline.next_rendered(timeout=0.1)
+                if packet is not None:
+                    self.render_frame(packet)
+                    self.pipeline.release(packet)
+                elif self.pipeline.is_finished():
+                    break
+                
+                if not self.headless:
+                    started = time.perf_counter()
+                    key = cv2.waitKey(1) & 0xFF
+                    STAGE_SECONDS.observe(time.perf_counter() - started, self.session_id, 'display')
+                    if not self.handle_key(key):
+                        break
+        finally:
+            self.pipeline.stop()
+
+    def infer_frame(self, frame):
+        """Inference stage - runs on the pipeline's inference thread"""
+        now = time.time()
+        if not (self.is_monitoring or self.landmark_consumers or self.recorder is not None):
+            # Nobody uses the interaction data - the models stay off and capture runs at the idle rate
+            self.update_capture_rate(False, now)
+            return self.empty_interaction(now), {
+                'face': self.empty_landmarks(FACE_LANDMARK_COUNT),
+                'hands': self.empty_landmarks(HAND_LANDMARK_COUNT)
+            }
         
-        while self.is_running:
-            ret, frame = self.cap.read()
-            if not ret:
-                continue
+        interaction_data = self.process_user_interaction(frame)
+        self.update_capture_rate(self.presence.is_present(now), now)
+        
+        if self.is_monitoring:
+            self.update_engagement_metrics(interaction_data)
+        
+        for consumer in self.landmark_consumers:
+            consumer(interaction_data, self.last_landmarks)
+        
+        return interaction_data, self.last_landmarks
 
-            # Process user interaction
-            if self.is_monitoring:
-                interaction_data = self.process_user_interaction(frame)
-                self.update_engagement_metrics(interaction_data)
-                
-                # Display workflow status
-                self.draw_workflow_overlay(frame)
-                
-                # Display platform connections
-                self.draw_platform_status(frame)
-                
-                # Display avatar guidance
-                self.draw_avatar_guidance(frame)
-                
-            else:
-                cv2.putText(frame, "Conductor AI Ready - Press 'S' to Start", 
-                           (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-                # Still process interaction when not actively monitoring
-                self.process_user_interaction(frame)
+    def update_capture_rate(self, present, now):
+        """Drop to the idle capture rate while nobody is present; viewers of the video keep full rate"""
+        if present != self.was_present:
+            self.was_present = present
+            PRESENCE.set(1 if present else 0, self.session_id)
+            self.workflow_triggers.fire_event('presence', {'present': present})
+        if self.pipeline is None:
+            return
+        idle = not present and self.presence.enabled and not self.frame_consumers
+        self.pipeline.set_capture_interval(1.0 / self.presence.idle_fps if idle and self.presence.idle_fps else 0.0)
 
+    def resume_capture(self):
+        """Back to full capture rate without waiting out the idle frame interval"""
+        if self.pipeline is not None:
+            self.pipeline.set_capture_interval(0.0)
+
+    def get_presence_status(self):
+        return self.presence.get_status(time.time())
+
+    def render_frame(self, packet):
+        """Render stage - annotates the frame only when someone will see it"""
+        consumers = self.frame_consumers
+        if self.headless and not consumers:
+            return
+        
+        interaction_data, landmarks = packet.result
+        frame = packet.frame
+        started = time.perf_counter()
+        self.annotate_frame(frame, landmarks)
+        STAGE_SECONDS.observe(time.perf_counter() - started, self.session_id, 'draw')
+        
+        if not self.headless:
+            started = time.perf_counter()
             cv2.imshow('Conductor AI Orchestration', frame)
+            STAGE_SECONDS.observe(time.perf_counter() - started, self.session_id, 'display')
+        
+        for consumer in consumers:
+            consumer(frame, interaction_data)
+
+    def annotate_frame(self, frame, landmarks):
+        """Draw landmarks and the guidance overlays onto a frame"""
+        self.draw_landmarks(frame, landmarks)
+        
+        if self.is_monitoring:
+            # Display workflow status
+            self.draw_workflow_overlay(frame)
             
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord('q'):
-                self.is_running = False
-                break
-            elif key == ord('s'):
-                self.start_orchestration_session()
-            elif key == ord('p'):
-                self.pause_active_workflow()
+            # Display platform connections
+            self.draw_platform_status(frame)
+            
+            # Display avatar guidance
+            self.draw_avatar_guidance(frame)
+        else:
+            cv2.putText(frame, "Conductor AI Ready - Press 'S' to Start", 
+                       (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+
+    def draw_landmarks(self, frame, landmarks):
+        """Draw face and hand landmarks"""
+        for face in landmarks['face']:
+            draw_landmark_array(frame, face, FACE_CONNECTIONS, (224, 224, 224))
+        
+        for hand in landmarks['hands']:
+            draw_landmark_array(frame, hand, HAND_CONNECTIONS, (255, 255, 255), (0, 0, 255))
+
+    def add_frame_consumer(self, consumer):
+        """Register a callback(frame, interaction_data) for annotated frames"""
+        self.frame_consumers = self.frame_consumers + [consumer]
+        self.resume_capture()
+
+    def remove_frame_consumer(self, consumer):
+        """Unregister an annotated frame callback"""
+        self.frame_consumers = [c for c in self.frame_consumers if c != consumer]
+
+    def add_landmark_consumer(self, consumer):
+        """Register a callback(interaction_data, landmarks) for every inferred frame"""
+        self.landmark_consumers = self.landmark_consumers + [consumer]
+        self.resume_capture()
+
+    def remove_landmark_consumer(self, consumer):
+        """Unregister a landmark callback"""
+        self.landmark_consumers = [c for c in self.landmark_consumers if c != consumer]
+
+    def handle_key(self, key):
+        """Handle keyboard controls; returns False when the interface should exit"""
+        if key == ord('q'):
+            self.is_running = False
+            return False
+        elif key == ord('s'):
+            self.start_orchestration_session()
+        elif key == ord('p'):
+            self.pause_active_workflow()
+        return True
 
     def draw_workflow_overlay(self, frame):
         """Draw workflow status overlay on video feed"""
         h, w, _ = frame.shape
         
-        # Create semi-transparent overlay
-        overlay = frame.copy()
-        
-        # Draw workflow panel
-        cv2.rectangle(overlay, (w-400, 10), (w-10, 300), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
+        # Every workflow in creation order, as far as the panel has room
+        workflows, _ = self.active_workflows.list(limit=OVERLAY_WORKFLOWS)
+        state_key = tuple(
+            (workflow['name'][:20], workflow['status'] == 'running', int(300 * workflow.get('progress', 0)))
+            for workflow in workflows
+        )
+        self.overlay.composite(frame, 'workflows', state_key, self.render_workflow_panel, (w-400, 10))
+
+    def render_workflow_panel(self, state_key):
+        """Render the semi-transparent workflow panel"""
+        panel = OverlayPanel(391, 291, dim=0.3)
         
         # Workflow information
-        y_offset = 40
-        cv2.putText(frame, "Active Workflows:", (w-390, y_offset), 
+        y_offset = 30
+        cv2.putText(panel.image, "Active Workflows:", (10, y_offset), 
                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
         
         y_offset += 30
-        for workflow_id, workflow in self.active_workflows.items():
-            status_color = (0, 255, 0) if workflow['status'] == 'running' else (0, 255, 255)
-            cv2.putText(frame, f"• {workflow['name'][:20]}", (w-380, y_offset), 
+        for name, running, bar_width in state_key:
+            status_color = (0, 255, 0) if running else (0, 255, 255)
+            cv2.putText(panel.image, f"• {name}", (20, y_offset), 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, status_color, 1)
             y_offset += 25
             
             # Progress bar
-            progress = workflow.get('progress', 0)
-            bar_width = int(300 * progress)
-            cv2.rectangle(frame, (w-380, y_offset-5), (w-380+bar_width, y_offset+5), 
+            cv2.rectangle(panel.image, (20, y_offset-5), (20+bar_width, y_offset+5), 
                          status_color, -1)
-            cv2.rectangle(frame, (w-380, y_offset-5), (w-80, y_offset+5), 
+            cv2.rectangle(panel.image, (20, y_offset-5), (320, y_offset+5), 
                          (100, 100, 100), 2)
             y_offset += 20
+        
+        return panel
 
     def draw_platform_status(self, frame):
         """Draw platform connection status"""
         h, w, _ = frame.shape
         
-        # Platform status panel
-        y_start = h - 150
-        cv2.rectangle(frame, (10, y_start), (350, h-10), (0, 0, 0), -1)
+        state_key = tuple(
+            (platform, status['connected']) for platform, status in list(self.platform_connections.items())
+        )
+        self.overlay.composite(frame, 'platforms', state_key, self.render_platform_panel, (10, h-150))
+
+    def render_platform_panel(self, state_key):
+        """Render the platform status panel"""
+        panel = OverlayPanel(341, 141)
         
-        y_offset = y_start + 30
-        cv2.putText(frame, "Platform Connections:", (20, y_offset), 
+        y_offset = 30
+        cv2.putText(panel.image, "Platform Connections:", (10, y_offset), 
                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
         
         y_offset += 25
-        for platform, status in self.platform_connections.items():
-            color = (0, 255, 0) if status['connected'] else (0, 0, 255)
-            status_text = "Connected" if status['connected'] else "Disconnected"
-            cv2.putText(frame, f"{platform.upper()}: {status_text}", 
-                       (20, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
+        for platform, connected in state_key:
+            color = (0, 255, 0) if connected else (0, 0, 255)
+            status_text = "Connected" if connected else "Disconnected"
+            cv2.putText(panel.image, f"{platform.upper()}: {status_text}", 
+                       (10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
             y_offset += 20
+        
+        return panel
 
     def draw_avatar_guidance(self, frame):
         """Draw avatar guidance and messages"""
-        if self.avatar_state['current_message']:
+        message = self.avatar_state['current_message']
+        if message:
             h, w, _ = frame.shape
             
-            # Message bubble
-            message = self.avatar_state['current_message']
-            text_size = cv2.getTextSize(message, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)[0]
-            
-            # Center the message
-            x = (w - text_size[0]) // 2
-            y = 100
-            
-            # Draw bubble background
-            cv2.rectangle(frame, (x-20, y-30), (x+text_size[0]+20, y+10), 
-                         (255, 255, 255), -1)
-            cv2.rectangle(frame, (x-20, y-30), (x+text_size[0]+20, y+10), 
-                         (0, 0, 0), 2)
-            
-            # Draw message text
-            cv2.putText(frame, message, (x, y), cv2.FONT_HERSHEY_SIMPLEX, 
-                       0.7, (0, 0, 0), 2)
+            # Center the message bubble
+            panel = self.overlay.get_panel('avatar', message, self.render_avatar_panel)
+            bubble_w = panel.image.shape[1]
+            self.overlay.composite(frame, 'avatar', message, self.render_avatar_panel,
+                                   ((w - bubble_w) // 2, 70))
+
+    def render_avatar_panel(self, message):
+        """Render the avatar message bubble"""
+        text_size = cv2.getTextSize(message, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)[0]
+        panel = OverlayPanel(text_size[0] + 41, 41, background=(255, 255, 255))
+        
+        # Bubble border
+        cv2.rectangle(panel.image, (0, 0), (text_size[0] + 40, 40), (0, 0, 0), 2)
+        
+        # Message text
+        cv2.putText(panel.image, message, (20, 30), cv2.FONT_HERSHEY_SIMPLEX, 
+                   0.7, (0, 0, 0), 2)
+        
+        return panel
 
     def start_orchestration_session(self):
         """Start a new orchestration monitoring session"""
         self.is_monitoring = True
+        self.startup.retry()   # A camera or model that failed earlier gets another attempt
+        self.presence.reset()
+        self.resume_capture()
         self.engagement_metrics = {
             'focus_duration': 0,
             'interaction_count': 0,
@@ -358,8 +655,9 @@ class ConductorOrchestrationService:
         self.avatar_state['current_message'] = message
         self.avatar_state['is_speaking'] = True
         
-        # Clear message after 3 seconds (in a real implementation, this would sync with TTS)
-        threading.Timer(3.0, self.clear_avatar_message).start()
+        # Clear message after 3 seconds (in a real implementation, this would sync with TTS).
+        # Re-scheduling replaces the previous expiry, so an old timer cannot clear this message
+        self.scheduler.schedule(AVATAR_MESSAGE_SECONDS, self.clear_avatar_message, key='avatar_message')
     
     def clear_avatar_message(self):
         """Clear avatar message"""
@@ -369,14 +667,21 @@ class ConductorOrchestrationService:
     def update_engagement_metrics(self, interaction_data):
         """Update user engagement metrics"""
         if interaction_data['face_detected']:
-            self.engagement_metrics['focus_duration'] += 1/30  # Assuming 30 FPS
+            # Real interval since the previous processed frame
+            self.engagement_metrics['focus_duration'] += self.engagement.last_interval
         
-        if interaction_data['gesture_recognized']:
-            self.engagement_metrics['interaction_count'] += 1
+        # Count discrete gesture events, not frames a gesture is held for
+        self.engagement_metrics['interaction_count'] += len(interaction_data['gesture_events'])
 
     def create_workflow(self, workflow_config):
-        """Create a new workflow from configuration"""
-        workflow_id = f"workflow_{int(time.time())}"
+        """Create a new workflow from configuration; raises ValueError on invalid steps, schedule or triggers"""
+        step_dependencies(workflow_config.get('steps', []))
+        if workflow_config.get('priority', DEFAULT_PRIORITY) not in PRIORITY_WEIGHTS:
+            raise ValueError(f"Unknown priority {workflow_config['priority']!r}, "
+                             f"expected one of {', '.join(PRIORITY_WEIGHTS)}")
+        parse_schedule(workflow_config.get('schedule'))
+        parse_triggers(workflow_config.get('triggers'))
+        workflow_id = new_workflow_id()
         
         workflow = {
             'id': workflow_id,
@@ -385,92 +690,259 @@ class ConductorOrchestrationService:
             'status': 'created',
             'progress': 0.0,
             'created_at': datetime.now(),
-            'platforms': workflow_config.get('platforms', [])
+            'platforms': workflow_config.get('platforms', []),
+            'timeout': workflow_config.get('timeout'),   # Seconds of running time, None = no limit
+            'schedule': workflow_config.get('schedule'),
+            'triggers': workflow_config.get('triggers', []),
+            'priority': workflow_config.get('priority', DEFAULT_PRIORITY),
+            'step_results': []
         }
         
-        self.active_workflows[workflow_id] = workflow
+        if self.workflow_store is not None:
+            self.workflow_store.create(workflow)
+        self.active_workflows.add(workflow)
+        self.workflow_triggers.add(workflow)
         return workflow_id
 
-    def execute_workflow(self, workflow_id):
-        """Execute a workflow"""
-        if workflow_id not in self.active_workflows:
-            return False
-        
-        workflow = self.active_workflows[workflow_id]
-        workflow['status'] = 'running'
-        
-        # Add to execution queue
-        self.task_queue.put({
-            'type': 'execute_workflow',
-            'workflow_id': workflow_id
-        })
-        
+    def execute_workflow(self, workflow_id, trigger='manual'):
+        """
+        Queue a new execution of a workflow, or resume its active run. Returns the execution id,
+        or None if there is no such workflow; raises ExecutionQueueFull when the queue has no room.
+        """
+        with self.execution_lock:
+            workflow = self.active_workflows.record(workflow_id)
+            if workflow is None:
+                return None
+            
+            if workflow['status'] == 'queued':
+                return workflow['execution_id']
+            if workflow['status'] in ('running', 'paused'):
+                workflow.pop('error', None)
+                self.active_workflows.touch(workflow_id)
+                self.active_workflows.set_status(workflow_id, 'running')
+                self.schedule_workflow_timeout(workflow)
+                self.workflow_executor.submit(workflow, resume=True)
+                self.avatar_speak(f"Starting workflow: {workflow['name']}")
+                return workflow['execution_id']
+            
+            # A new execution, from the first step, once the executor has a free slot
+            self.workflow_executor.enqueue(workflow, workflow.get('priority', DEFAULT_PRIORITY))
+            workflow['step_results'] = []
+            workflow['execution_id'] = new_execution_id()
+            workflow['queued_at'] = time.time()
+            workflow['trigger'] = trigger   # 'manual', 'schedule' or 'event:<name>'
+            workflow.pop('error', None)
+            if self.workflow_store is not None:
+                self.workflow_store.save_execution(workflow['execution_id'], workflow_id, 'queued',
+                                                   workflow['queued_at'])
+            self.active_workflows.set_status(workflow_id, 'queued')
+            return workflow['execution_id']
+
+    def start_queued_workflow(self, workflow, waited):
+        """Executor callback when a queued execution gets a slot - runs on the executor's dispatch thread"""
+        with self.execution_lock:
+            if workflow['status'] != 'queued':
+                return False
+            workflow['execution_started_at'] = time.time()
+            workflow['queue_wait'] = waited
+            self.active_workflows.set_status(workflow['id'], 'running')
+            if self.workflow_store is not None:
+                self.workflow_store.save_execution(workflow['execution_id'], workflow['id'], 'running',
+                                                   workflow['execution_started_at'])
+            self.schedule_workflow_timeout(workflow)
         self.avatar_speak(f"Starting workflow: {workflow['name']}")
         return True
 
+    def schedule_workflow_timeout(self, workflow):
+        if workflow.get('timeout'):
+            self.scheduler.schedule(workflow['timeout'], self.expire_workflow, workflow['id'],
+                                    key=('workflow_timeout', workflow['id']))
+
+    def finish_workflow(self, workflow, status):
+        """Executor callback when a run ends - runs on the executor's dispatch thread"""
+        self.scheduler.cancel(('workflow_timeout', workflow['id']))
+        self.active_workflows.set_status(workflow['id'], status)
+        if self.workflow_store is not None and workflow.get('execution_id'):
+            self.workflow_store.save_execution(workflow['execution_id'], workflow['id'], status,
+                                               workflow['execution_started_at'], time.time(),
+                                               workflow['step_results'])
+        if status == 'completed':
+            self.avatar_speak("Workflow completed successfully!")
+        elif status == 'failed':
+            self.avatar_speak(f"Workflow failed: {workflow['name']}")
+        self.workflow_triggers.workflow_finished(workflow['id'])
+        self.workflow_triggers.fire_event(f"workflow_{status}", {'workflow_id': workflow['id'], 'name': workflow['name']})
+
+    def run_triggered_workflow(self, workflow_id, trigger):
+        """
+        Trigger scheduler callback - starts a new execution unless the workflow is already running.
+        ExecutionQueueFull propagates so the trigger scheduler can retry caught-up fires.
+        """
+        workflow = self.active_workflows.get(workflow_id)
+        if workflow is None or workflow['status'] in ('queued', 'running', 'paused'):
+            return None
+        return self.execute_workflow(workflow_id, trigger=trigger)
+
+    def persist_status(self, workflow, old_status, new_status):
+        """Registry callback - status changes reach the store in the next (early) batch"""
+        self.workflow_store.save(workflow, urgent=True)
+
+    def persist_workflow(self, workflow):
+        """Executor and trigger callback - republishes the record; progress and step results are written behind in batches"""
+        self.active_workflows.touch(workflow['id'])
+        if self.workflow_store is not None:
+            self.workflow_store.save(workflow)
+
+    def recover_workflows(self):
+        """Rebuild the registry from the store and resume running workflows; returns (loaded, resumed)"""
+        workflows = self.workflow_store.load_workflows()
+        self.active_workflows.add_many(workflows)
+        
+        resumed = 0
+        for workflow in workflows:
+            # Fires missed while the service was down follow each schedule's misfire policy
+            self.workflow_triggers.add(workflow)
+            if workflow['status'] == 'queued':
+                # Already admitted once, so the capacity limit does not apply again
+                self.workflow_executor.enqueue(workflow, workflow.get('priority', DEFAULT_PRIORITY), force=True)
+                continue
+            if workflow['status'] != 'running':
+                continue
+            # The deadline restarts; steps that had succeeded are not repeated
+            self.schedule_workflow_timeout(workflow)
+            self.workflow_executor.submit(workflow, resume=True)
+            resumed += 1
+        return len(workflows), resumed
+
+    def expire_workflow(self, workflow_id):
+        """Workflow timeout callback - runs on the scheduler thread"""
+        if self.active_workflows.set_status(workflow_id, 'timed_out', expected=('running', 'paused')):
+            workflow = self.active_workflows[workflow_id]
+            self.workflow_executor.wake(workflow_id)
+            self.avatar_speak(f"Workflow timed out: {workflow['name']}")
+
     def pause_active_workflow(self):
         """Pause currently active workflow"""
-        for workflow_id, workflow in self.active_workflows.items():
-            if workflow['status'] == 'running':
-                workflow['status'] = 'paused'
-                self.avatar_speak("Workflow paused.")
-                break
+        workflow = self.active_workflows.first('running')
+        if workflow is not None and self.active_workflows.set_status(workflow['id'], 'paused', expected=('running',)):
+            self.avatar_speak("Workflow paused.")
 
     def continue_active_workflow(self):
         """Continue paused workflow"""
-        for workflow_id, workflow in self.active_workflows.items():
-            if workflow['status'] == 'paused':
-                workflow['status'] = 'running'
-                self.avatar_speak("Resuming workflow execution.")
-                break
+        workflow = self.active_workflows.first('paused')
+        if workflow is not None and self.active_workflows.set_status(workflow['id'], 'running', expected=('paused',)):
+            # Paused workflows restored from the store have no run yet
+            self.workflow_executor.submit(self.active_workflows.record(workflow['id']), resume=True)
+            self.avatar_speak("Resuming workflow execution.")
 
     def advance_workflow_step(self):
-        """Advance to next step in active workflow"""
-        for workflow_id, workflow in self.active_workflows.items():
-            if workflow['status'] == 'running':
-                current_progress = workflow['progress']
-                workflow['progress'] = min(1.0, current_progress + 0.2)
-                
-                if workflow['progress'] >= 1.0:
-                    workflow['status'] = 'completed'
-                    self.avatar_speak("Workflow completed successfully!")
-                else:
-                    self.avatar_speak("Moving to next workflow step.")
+        """Announce the step the active workflow is on; progress follows step completion"""
+        workflow = self.active_workflows.first('running')
+        if workflow is None:
+            return
+        for status in (STEP_RUNNING, STEP_PENDING):
+            step = next((r for r in workflow['step_results'] if r['status'] == status), None)
+            if step is not None:
+                self.avatar_speak(f"Working on {step['platform']}: {step['action']}")
                 break
 
+    def current_workflow_id(self):
+        """Id of the running workflow the user is working on, if any"""
+        workflow = self.active_workflows.first('running')
+        return workflow['id'] if workflow is not None else None
+
+    def start_recording(self, root, record_landmarks=True):
+        """Start recording processed frames under `root`; returns the recording status"""
+        with self.recorder_lock:
+            if self.recorder is None:
+                self.recorder = SessionRecorder(root, self.session_id, record_landmarks=record_landmarks)
+            return self.recorder.get_status()
+
+    def stop_recording(self):
+        """Stop recording; returns the final status, or None if nothing was being recorded"""
+        with self.recorder_lock:
+            recorder, self.recorder = self.recorder, None
+            if recorder is None:
+                return None
+            recorder.close()
+            return recorder.get_status()
+
+    def get_recording_status(self):
+        recorder = self.recorder
+        return recorder.get_status() if recorder is not None else None
+
     def get_workflow_status(self, workflow_id):
         """Get status of a specific workflow"""
         return self.active_workflows.get(workflow_id, None)
 
     def get_engagement_report(self):
         """Generate user engagement analytics"""
-        avg_attention = np.mean(list(self.attention_buffer)) if self.attention_buffer else 0
+        attention = self.engagement.summary(30)
         
         return {
-            'average_attention_score': avg_attention,
+            'average_attention_score': attention['mean_attention'],
+            'attention_ewma': attention['ewma_attention'],
+            'attention_p50': attention['p50_attention'],
+            'attention_p90': attention['p90_attention'],
             'focus_duration': self.engagement_metrics['focus_duration'],
             'total_interactions': self.engagement_metrics['interaction_count'],
             'active_workflows': len(self.active_workflows),
             'platform_connections': sum(1 for p in self.platform_connections.values() if p['connected'])
         }
 
+    def get_attention_history(self, frames=300):
+        """Attention scores of face-detected frames among the last `frames` samples"""
+        window = self.engagement.window(frames)
+        return window['attention'][window['face_present'] == 1]
+
     def connect_platform(self, platform_name, auth_token=None):
         """Connect to an enterprise platform"""
         if platform_name in self.platform_connections:
+            if platform_name not in self.workflow_engine.platform_adapters:
+                self.workflow_engine.register_platform_adapter(
+                    platform_name, SimulatedPlatformAdapter(platform_name, self.platform_connections[platform_name]))
             self.platform_connections[platform_name]['connected'] = True
             self.platform_connections[platform_name]['last_sync'] = datetime.now()
             self.avatar_speak(f"{platform_name.upper()} connected successfully!")
+            self.workflow_triggers.fire_event('platform_connected', {'platform': platform_name})
             return True
         return False
 
     def stop(self):
         """Stop orchestration service and release resources"""
         self.is_running = False
-        if self.cap is not None:
-            self.cap.release()
-        self.face_mesh.close()
-        self.hands.close()
-        cv2.destroyAllWindows()
+        self.workflow_executor.stop()
+        self.scheduler.stop()
+        if self.workflow_store is not None:
+            self.workflow_store.close()
+        self.stop_recording()
+        if self.pipeline is not None:
+            self.pipeline.stop()
+        # Components still loading are left to their threads; everything ready is released
+        for name in self.startup.components:
+            component = self.startup.peek(name)
+            if component is None:
+                continue
+            if name == 'camera':
+                component.release()
+            else:
+                component.close()
+        if not self.headless:
+            cv2.destroyAllWindows()
+
+
+class SimulatedPlatformAdapter:
+    """Stand-in for a connected platform without a real integration; acknowledges every action"""
+    
+    def __init__(self, platform_name, connection):
+        self.platform_name = platform_name
+        self.connection = connection   # Entry of platform_connections; steps fail once disconnected
+    
+    def execute_action(self, action, parameters):
+        if not self.connection['connected']:
+            return {'success': False, 'error': f'{self.platform_name} is not connected'}
+        self.connection['last_sync'] = datetime.now()
+        return {'success': True, 'platform': self.platform_name, 'action': action, 'simulated': True}
 
 
 class WorkflowEngine:
@@ -0,0 +1,125 @@
+# engagement.py
+import numpy as np
+
+
+SAMPLE_DTYPE = np.dtype([
+    ('timestamp', 'f8'),
+    ('attention', 'f4'),
+    ('face_present', 'u1'),
+    ('hands', 'u1'),
+    ('gesture_id', 'u1')
+])
+
+ATTENTION_BINS = 100
+
+
+class WindowAggregate:
+    """Running sums and an attention histogram over the last `size` samples"""
+
+    def __init__(self, size):
+        self.size = size
+        self.attention_sum = 0.0
+        self.face_count = 0
+        self.histogram = np.zeros(ATTENTION_BINS, dtype=np.int64)
+
+    def add(self, attention, face_present, sign=1):
+        if face_present:
+            self.attention_sum += sign * attention
+            self.face_count += sign
+            self.histogram[attention_bin(attention)] += sign
+
+    def mean(self):
+        return self.attention_sum / self.face_count if self.face_count else 0.0
+
+    def percentile(self, q):
+        """Attention percentile (0-100), at histogram bin resolution"""
+        if not self.face_count:
+            return 0.0
+        rank = q / 100 * (self.face_count - 1)
+        index = int(np.searchsorted(np.cumsum(self.histogram), rank, side='right'))
+        return (min(index, ATTENTION_BINS - 1) + 0.5) / ATTENTION_BINS
+
+
+def attention_bin(attention):
+    return min(int(attention * ATTENTION_BINS), ATTENTION_BINS - 1)
+
+
+class EngagementBuffer:
+    """
+    Fixed-capacity ring buffer of per-frame engagement samples.
+    Every sample is written twice (at i and i + capacity) so any trailing
+    window is one contiguous view - readers never copy or reassemble.
+    Aggregates are maintained incrementally as samples enter and leave.
+    """
+
+    def __init__(self, capacity=9000, windows=(30, 300, 1800), ewma_alpha=0.1, max_frame_gap=1.0):
+        if max(windows) > capacity:
+            raise ValueError("Aggregate windows cannot be larger than the buffer capacity")
+
+        self.capacity = capacity
+        self.samples = np.zeros(2 * capacity, dtype=SAMPLE_DTYPE)
+        self.head = 0
+        self.count = 0
+
+        self.windows = {size: WindowAggregate(size) for size in windows}
+        self.ewma_alpha = ewma_alpha
+        self.attention_ewma = None
+
+        # Real interval since the previous sample, capped so stalls don't count as focus time
+        self.max_frame_gap = max_frame_gap
+        self.last_timestamp = None
+        self.last_interval = 0.0
+
+    def append(self, timestamp, attention, face_present, hands, gesture_id):
+        """Add one frame's sample and update all aggregates in O(1)"""
+        for size, aggregate in self.windows.items():
+            if self.count >= size:
+                leaving = self.samples[self.head + self.capacity - size]
+                aggregate.add(float(leaving['attention']), leaving['face_present'], sign=-1)
+            aggregate.add(attention, face_present)
+
+        row = (timestamp, attention, face_present, hands, gesture_id)
+        self.samples[self.head] = row
+        self.samples[self.head + self.capacity] = row
+        self.head = (self.head + 1) % self.capacity
+        self.count += 1
+
+        if face_present:
+            if self.attention_ewma is None:
+                self.attention_ewma = attention
+            else:
+                self.attention_ewma += self.ewma_alpha * (attention - self.attention_ewma)
+
+        if self.last_timestamp is None:
+            self.last_interval = 0.0
+        else:
+            self.last_interval = min(max(0.0, timestamp - self.last_timestamp), self.max_frame_gap)
+        self.last_timestamp = timestamp
+
+    def window(self, size=None):
+        """View of the last `size` samples in time order (no copy)"""
+        size = min(self.count, self.capacity if size is None else size)
+        end = self.head + self.capacity
+        return self.samples[end - size:end]
+
+    def mean_attention(self, window):
+        return self.windows[window].mean()
+
+    def attention_percentile(self, q, window):
+        return self.windows[window].percentile(q)
+
+    def summary(self, window=None):
+        """Aggregates for one window (the smallest by default)"""
+        aggregate = self.windows[window or min(self.windows)]
+        return {
+            'window_frames': aggregate.size,
+            'mean_attention': aggregate.mean(),
+            'ewma_attention': self.attention_ewma or 0.0,
+            'p50_attention': aggregate.percentile(50),
+            'p90_attention': aggregate.percentile(90),
+            'face_frames': aggregate.face_count
+        }
+
+    def reset(self):
+        """Clear all samples and aggregates"""
+        self.__init__(self.capacity, tuple(self.windows), self.ewma_alpha, self.max_frame_gap)
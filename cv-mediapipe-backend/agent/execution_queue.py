@@ -0,0 +1,113 @@
+# execution_queue.py
+import math
+import threading
+import time
+from collections import deque
+
+from .metrics import WORKFLOW_QUEUE_DEPTH, WORKFLOW_QUEUE_REJECTIONS
+
+
+DEFAULT_PRIORITY = 'medium'
+# Share of dequeues each priority gets while all of them are waiting
+PRIORITY_WEIGHTS = {'critical': 8, 'high': 4, 'medium': 2, 'low': 1}
+# Fraction of the capacity a priority may fill - a burst of bulk work leaves room for urgent work
+ADMISSION_LIMITS = {'critical': 1.0, 'high': 0.9, 'medium': 0.75, 'low': 0.5}
+DEFAULT_RETRY_AFTER = 5
+MAX_RETRY_AFTER = 300
+
+
+class ExecutionQueueFull(Exception):
+    """Raised when an execution is not admitted; `retry_after` is the suggested wait in seconds"""
+
+    def __init__(self, priority, depth, retry_after):
+        super().__init__(f"Execution queue is full for {priority} priority ({depth} waiting)")
+        self.priority = priority
+        self.depth = depth
+        self.retry_after = retry_after
+
+
+class ExecutionQueue:
+    """
+    Bounded queue of workflow executions waiting for a free slot, one FIFO per
+    priority. pop() picks the priority by smooth weighted round robin, so
+    higher priorities go first in proportion to their weight and low priority
+    still makes progress. Admission is checked against the priority's share
+    of the capacity.
+    """
+
+    def __init__(self, capacity=100, weights=None, limits=None):
+        self.capacity = capacity
+        self.weights = dict(weights or PRIORITY_WEIGHTS)
+        self.limits = dict(limits or ADMISSION_LIMITS)
+        self.lock = threading.Lock()
+        self.queues = {priority: deque() for priority in self.weights}
+        self.credit = {priority: 0 for priority in self.weights}
+        self.depth = 0
+        self.started = deque(maxlen=50)   # Recent dequeue times, for the drain rate
+        self.rejected = 0
+
+    def put(self, item, priority=DEFAULT_PRIORITY, force=False):
+        """Queue `item`; raises ExecutionQueueFull unless there is room at this priority (or `force`)"""
+        if priority not in self.queues:
+            raise ValueError(f"Unknown priority: {priority}")
+        with self.lock:
+            limit = math.ceil(self.capacity * self.limits.get(priority, 1.0))
+            if self.depth >= limit and not force:
+                self.rejected += 1
+                retry_after = self.retry_after(self.depth - limit + 1)
+                depth = self.depth
+            else:
+                self.queues[priority].append((time.time(), item))
+                self.depth += 1
+                WORKFLOW_QUEUE_DEPTH.set(len(self.queues[priority]), priority)
+                return
+        WORKFLOW_QUEUE_REJECTIONS.inc(priority)
+        raise ExecutionQueueFull(priority, depth, retry_after)
+
+    def pop(self):
+        """Next (priority, queued_at, item), or None when nothing is waiting"""
+        with self.lock:
+            waiting = [priority for priority, queue in self.queues.items() if queue]
+            if not waiting:
+                return None
+            total = 0
+            for priority in waiting:
+                self.credit[priority] += self.weights[priority]
+                total += self.weights[priority]
+            chosen = max(waiting, key=lambda priority: self.credit[priority])
+            self.credit[chosen] -= total
+            for priority, queue in self.queues.items():
+                if not queue and priority != chosen:
+                    self.credit[priority] = 0   # No credit builds up while a priority has nothing queued
+
+            queued_at, item = self.queues[chosen].popleft()
+            self.depth -= 1
+            self.started.append(time.time())
+            WORKFLOW_QUEUE_DEPTH.set(len(self.queues[chosen]), chosen)
+            return chosen, queued_at, item
+
+    def retry_after(self, ahead):
+        """Seconds until `ahead` executions have left the queue at the recent drain rate (called with the lock)"""
+        if len(self.started) < 2:
+            return DEFAULT_RETRY_AFTER
+        elapsed = max(time.time() - self.started[0], 1e-3)
+        rate = (len(self.started) - 1) / elapsed
+        return min(max(math.ceil(ahead / rate), 1), MAX_RETRY_AFTER)
+
+    def __len__(self):
+        return self.depth
+
+    def get_stats(self):
+        with self.lock:
+            now = time.time()
+            return {
+                'capacity': self.capacity,
+                'depth': self.depth,
+                'rejected': self.rejected,
+                'by_priority': {
+                    priority: {
+                        'depth': len(queue),
+                        'oldest_wait': now - queue[0][0] if queue else 0.0
+                    } for priority, queue in self.queues.items()
+                }
+            }
@@ -0,0 +1,107 @@
+# frame_buffers.py
+import threading
+
+import numpy as np
+
+from .metrics import FRAME_ALLOCATIONS
+
+
+class FrameBufferPool:
+    """
+    Reusable frame arrays for the capture stage.
+    A buffer is handed out with one reference; holders that keep a frame past
+    their callback (e.g. an encoder thread) retain() it, and the buffer goes
+    back to the pool when the last holder releases it.
+    """
+
+    def __init__(self, max_free=8, name='default'):
+        self.max_free = max_free
+        self.name = name   # Session label for metrics
+        self.lock = threading.Lock()
+        self.free = {}     # (shape, dtype) -> [array]
+        self.held = {}     # id(array) -> [array, references]
+        self.allocations = 0
+        self.reuses = 0
+
+    def acquire(self, shape, dtype=np.uint8):
+        """A free buffer of this shape, allocating one only if none is free"""
+        key = (tuple(shape), np.dtype(dtype).str)
+        with self.lock:
+            free = self.free.get(key)
+            array = free.pop() if free else None
+            if array is not None:
+                self.reuses += 1
+        if array is None:
+            array = np.empty(shape, dtype=dtype)
+            self.count_allocation()
+        with self.lock:
+            self.held[id(array)] = [array, 1]
+        return array
+
+    def adopt(self, array):
+        """Track a frame allocated elsewhere (e.g. a source that could not fill the buffer) as pooled"""
+        self.count_allocation()
+        with self.lock:
+            self.held[id(array)] = [array, 1]
+        return array
+
+    def count_allocation(self):
+        self.allocations += 1
+        FRAME_ALLOCATIONS.inc(self.name, 'capture')
+
+    def retain(self, array):
+        """Add a reference to a pooled buffer; arrays from outside the pool are ignored"""
+        with self.lock:
+            entry = self.held.get(id(array))
+            if entry is not None:
+                entry[1] += 1
+
+    def release(self, array):
+        """Drop a reference; the last one returns the buffer to the pool"""
+        with self.lock:
+            entry = self.held.get(id(array))
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+            del self.held[id(array)]
+            free = self.free.setdefault((array.shape, array.dtype.str), [])
+            if len(free) < self.max_free:
+                free.append(array)
+
+    def clear(self):
+        with self.lock:
+            self.free = {}
+            self.held = {}
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                'allocations': self.allocations,
+                'reuses': self.reuses,
+                'held': len(self.held),
+                'free': sum(len(free) for free in self.free.values())
+            }
+
+
+class ScratchBuffers:
+    """
+    Named flat buffers viewed as contiguous arrays of any smaller shape, so
+    crops and resized model inputs of varying size reuse the same memory.
+    """
+
+    def __init__(self, name=None):
+        self.name = name   # Session label for metrics; None inside worker processes
+        self.buffers = {}
+        self.allocations = 0
+
+    def view(self, key, shape, dtype=np.uint8):
+        size = int(np.prod(shape))
+        data = self.buffers.get(key)
+        if data is None or data.size < size or data.dtype != dtype:
+            data = self.buffers[key] = np.empty(size, dtype=dtype)
+            self.allocations += 1
+            if self.name is not None:
+                FRAME_ALLOCATIONS.inc(self.name, 'model_input')
+        return data[:size].reshape(shape)
@@ -0,0 +1,108 @@
+# frame_governor.py
+
+
+class FrameBudgetGovernor:
+    """
+    Keeps the inference stage within a target frame time by adapting how often
+    FaceMesh and Hands run, the inference input scale, and landmark reuse.
+    """
+
+    def __init__(self, target_frame_time=1 / 30, min_scale=0.4, max_interval=4,
+                 adjust_every=15, smoothing=0.2, max_reuse_age=0.5):
+        self.target_frame_time = target_frame_time
+        self.min_scale = min_scale
+        self.max_interval = max_interval
+        self.adjust_every = adjust_every
+        self.smoothing = smoothing
+        self.max_reuse_age = max_reuse_age
+        self.enabled = True   # When disabled, timings are still tracked but the operating point is fixed
+
+        # Current operating point
+        self.face_interval = 1
+        self.hands_interval = 1
+        self.input_scale = 1.0
+        self.reuse_landmarks = False
+
+        # Smoothed per-stage timings (seconds)
+        self.stage_times = {}
+        self.frame_index = 0
+
+    def plan_frame(self):
+        """Decide what the next frame should run"""
+        index = self.frame_index
+        return {
+            'run_face': index % self.face_interval == 0,
+            # Offset hands so skipped models are spread over alternate frames
+            'run_hands': (index + self.hands_interval // 2) % self.hands_interval == 0,
+            'scale': self.input_scale,
+            'reuse_landmarks': self.reuse_landmarks
+        }
+
+    def record(self, stage_times, frame_time):
+        """Record the measured stage times of a finished frame"""
+        model_time = stage_times.get('face_mesh', 0.0) + stage_times.get('hands', 0.0)
+        stage_times = dict(stage_times, other=max(0.0, frame_time - model_time))
+
+        for stage, elapsed in stage_times.items():
+            previous = self.stage_times.get(stage)
+            if previous is None:
+                self.stage_times[stage] = elapsed
+            else:
+                self.stage_times[stage] = previous + self.smoothing * (elapsed - previous)
+
+        self.frame_index += 1
+        if self.enabled and self.frame_index % self.adjust_every == 0:
+            self.adjust()
+
+    def estimated_frame_time(self):
+        """Average frame cost at the current cadence, from the smoothed stage times"""
+        face_time = self.stage_times.get('face_mesh', 0.0) / self.face_interval
+        hands_time = self.stage_times.get('hands', 0.0) / self.hands_interval
+        return self.stage_times.get('other', 0.0) + face_time + hands_time
+
+    def adjust(self):
+        """Step the operating point towards the frame budget"""
+        estimate = self.estimated_frame_time()
+        if estimate > self.target_frame_time * 1.05:
+            self.degrade()
+        elif estimate < self.target_frame_time * 0.7:
+            self.recover()
+
+        self.reuse_landmarks = self.face_interval > 1 or self.hands_interval > 1
+
+    def degrade(self):
+        """Spend less per frame: skip the costlier model more often, then shrink input"""
+        face_time = self.stage_times.get('face_mesh', 0.0) / self.face_interval
+        hands_time = self.stage_times.get('hands', 0.0) / self.hands_interval
+
+        if face_time >= hands_time and self.face_interval < self.max_interval:
+            self.face_interval += 1
+        elif self.hands_interval < self.max_interval:
+            self.hands_interval += 1
+        elif self.face_interval < self.max_interval:
+            self.face_interval += 1
+        elif self.input_scale > self.min_scale:
+            self.input_scale = max(self.min_scale, round(self.input_scale - 0.1, 2))
+
+    def recover(self):
+        """Spend more per frame in the reverse order of degrade()"""
+        if self.input_scale < 1.0:
+            self.input_scale = min(1.0, round(self.input_scale + 0.1, 2))
+        elif self.hands_interval > 1 and self.hands_interval >= self.face_interval:
+            self.hands_interval -= 1
+        elif self.face_interval > 1:
+            self.face_interval -= 1
+        elif self.hands_interval > 1:
+            self.hands_interval -= 1
+
+    def get_state(self):
+        """Current operating point and timings"""
+        return {
+            'target_frame_time': self.target_frame_time,
+            'estimated_frame_time': self.estimated_frame_time(),
+            'face_interval': self.face_interval,
+            'hands_interval': self.hands_interval,
+            'input_scale': self.input_scale,
+            'reuse_landmarks': self.reuse_landmarks,
+            'stage_times': dict(self.stage_times)
+        }
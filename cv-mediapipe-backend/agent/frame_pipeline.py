@@ -0,0 +1,247 @@
+# frame_pipeline.py
+import threading
+import time
+from collections import deque
+
+from .metrics import STAGE_SECONDS, FRAMES_TOTAL, FRAMES_DROPPED
+
+
+DROP_OLDEST = 'drop_oldest'
+DROP_NEWEST = 'drop_newest'
+BLOCK = 'block'   # Lossless - the producer waits for space (offline replay)
+
+
+class StageQueue:
+    """Bounded hand-off between two pipeline stages with a drop policy"""
+
+    def __init__(self, depth=1, drop_policy=DROP_OLDEST, on_drop=None):
+        if depth < 1:
+            raise ValueError("Stage queue depth must be at least 1")
+        if drop_policy not in (DROP_OLDEST, DROP_NEWEST, BLOCK):
+            raise ValueError(f"Unknown drop policy: {drop_policy}")
+
+        self.depth = depth
+        self.drop_policy = drop_policy
+        self.on_drop = on_drop   # Called with each item that is dropped or refused
+        self.items = deque()
+        self.dropped = 0
+        self.closed = False
+        self.condition = threading.Condition()
+
+    def put(self, item):
+        """Add an item; when full, drop the oldest queued item or the new one, or wait (BLOCK)"""
+        dropped = None
+        with self.condition:
+            if self.drop_policy == BLOCK:
+                while len(self.items) >= self.depth and not self.closed:
+                    self.condition.wait()
+
+            if self.closed:
+                dropped = item
+            elif len(self.items) >= self.depth:
+                self.dropped += 1
+                if self.drop_policy == DROP_NEWEST:
+                    dropped = item
+                else:
+                    dropped = self.items.popleft()
+
+            if dropped is not item:
+                self.items.append(item)
+                self.condition.notify()
+
+        if dropped is not None and self.on_drop is not None:
+            self.on_drop(dropped)
+        return dropped is not item
+
+    def get(self, timeout=None):
+        """Wait for the next item; returns None on timeout or once closed"""
+        with self.condition:
+            if not self.items and not self.closed:
+                self.condition.wait(timeout)
+            if not self.items:
+                return None
+            item = self.items.popleft()
+            if self.drop_policy == BLOCK:
+                self.condition.notify_all()
+            return item
+
+    def close(self):
+        """Wake up all waiters and refuse further items"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def __len__(self):
+        return len(self.items)
+
+
+class FramePacket:
+    """A captured frame travelling through the pipeline"""
+    __slots__ = ('seq', 'captured_at', 'frame', 'result', 'inferred_at')
+
+    def __init__(self, seq, captured_at, frame):
+        self.seq = seq
+        self.captured_at = captured_at
+        self.frame = frame
+        self.result = None
+        self.inferred_at = None
+
+
+class FramePipeline:
+    """
+    Staged capture -> inference -> render pipeline.
+    Capture and inference run on their own threads; the render stage is pulled
+    by the caller so GUI calls stay on the thread that owns the window.
+    """
+
+    def __init__(self, capture, infer, capture_depth=1, capture_drop=DROP_OLDEST,
+                 render_depth=2, render_drop=DROP_OLDEST, name='default', buffers=None):
+        self.capture = capture
+        self.infer = infer
+        self.name = name   # Session label for metrics
+        # FrameBufferPool the capture stage reads into; frames go back to it in release()
+        self.buffers = buffers
+        self.frame_shape = None
+
+        # The capture queue acts as a latest-frame slot with the default depth of 1
+        self.capture_queue = StageQueue(capture_depth, capture_drop, on_drop=self.release)
+        self.render_queue = StageQueue(render_depth, render_drop, on_drop=self.release)
+
+        self.is_running = False
+        self.threads = []
+        self.capture_finished = False
+        self.inference_finished = False
+        self.frames_captured = 0
+        self.frames_inferred = 0
+        self.frames_rendered = 0
+        self.last_latency = 0.0
+
+        # Minimum seconds between captures (idle throttling); setting it to 0 wakes the capture loop
+        self.capture_interval = 0.0
+        self.capture_wake = threading.Event()
+
+    def start(self):
+        """Start the capture and inference threads"""
+        if self.is_running:
+            return
+
+        self.is_running = True
+        self.threads = [
+            threading.Thread(target=self._capture_loop, name='pipeline-capture', daemon=True),
+            threading.Thread(target=self._inference_loop, name='pipeline-inference', daemon=True)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self, timeout=2.0):
+        """Stop all stages and wait for the worker threads to exit"""
+        self.is_running = False
+        self.capture_wake.set()
+        self.capture_queue.close()
+        self.render_queue.close()
+        for thread in self.threads:
+            thread.join(timeout)
+        self.threads = []
+
+    def _capture_loop(self):
+        seq = 0
+        while self.is_running:
+            started = time.perf_counter()
+            ret, frame = self.read_frame()
+            STAGE_SECONDS.observe(time.perf_counter() - started, self.name, 'capture_wait')
+            if not ret:
+                if getattr(self.capture, 'exhausted', False):
+                    # End of a recorded source
+                    break
+                time.sleep(0.005)
+                continue
+
+            seq += 1
+            self.frames_captured += 1
+            FRAMES_TOTAL.inc(self.name, 'capture')
+            self.put_counted(self.capture_queue, 'capture', FramePacket(seq, time.time(), frame))
+
+            self.capture_wake.clear()
+            interval = self.capture_interval
+            if interval:
+                self.capture_wake.wait(max(0.0, interval - (time.perf_counter() - started)))
+        self.capture_finished = True
+
+    def read_frame(self):
+        """Read the next frame into a pooled buffer when the source supports it"""
+        if self.buffers is None:
+            return self.capture.read()
+
+        image = self.buffers.acquire(self.frame_shape) if self.frame_shape else None
+        ret, frame = self.capture.read(image) if image is not None else self.capture.read()
+        if frame is not image:
+            # First frame, a resolution change, or a source that allocates its own frames
+            if image is not None:
+                self.buffers.release(image)
+            if ret:
+                self.buffers.adopt(frame)
+                self.frame_shape = frame.shape
+        elif not ret:
+            self.buffers.release(image)
+        return ret, frame
+
+    def release(self, packet):
+        """Return a packet's frame to the buffer pool once no stage needs it any more"""
+        if self.buffers is not None and packet.frame is not None:
+            self.buffers.release(packet.frame)
+            packet.frame = None
+
+    def _inference_loop(self):
+        while self.is_running:
+            packet = self.capture_queue.get(timeout=0.1)
+            if packet is None:
+                if self.capture_finished and not len(self.capture_queue):
+                    break
+                continue
+
+            packet.result = self.infer(packet.frame)
+            packet.inferred_at = time.time()
+            self.frames_inferred += 1
+            FRAMES_TOTAL.inc(self.name, 'inference')
+            self.put_counted(self.render_queue, 'render', packet)
+        self.inference_finished = True
+
+    def set_capture_interval(self, interval):
+        """Throttle capture to one frame per `interval` seconds; 0 resumes full rate at once"""
+        if interval == self.capture_interval:
+            return
+        self.capture_interval = interval
+        if not interval:
+            self.capture_wake.set()
+
+    def put_counted(self, stage_queue, queue_name, packet):
+        dropped = stage_queue.dropped
+        stage_queue.put(packet)
+        if stage_queue.dropped != dropped:
+            FRAMES_DROPPED.inc(self.name, queue_name)
+
+    def is_finished(self):
+        """Whether a finite source has been fully captured, inferred and rendered"""
+        return self.inference_finished and not len(self.render_queue)
+
+    def next_rendered(self, timeout=None):
+        """Get the next inferred frame for the render stage, or None on timeout"""
+        packet = self.render_queue.get(timeout)
+        if packet is not None:
+            self.frames_rendered += 1
+            FRAMES_TOTAL.inc(self.name, 'render')
+            self.last_latency = time.time() - packet.captured_at
+        return packet
+
+    def get_stats(self):
+        """Frame counters and drop counts per stage"""
+        return {
+            'frames_captured': self.frames_captured,
+            'frames_inferred': self.frames_inferred,
+            'frames_rendered': self.frames_rendered,
+            'capture_dropped': self.capture_queue.dropped,
+            'render_dropped': self.render_queue.dropped,
+            'capture_interval': self.capture_interval,
+            'last_latency': self.last_latency,
+            'buffers': self.buffers.get_stats() if self.buffers is not None else None
+        }
@@ -0,0 +1,120 @@
+# frame_sources.py
+import os
+import time
+
+import cv2
+
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+class FrameDirectorySource:
+    """Reads a directory of image files in name order, like a VideoCapture"""
+
+    def __init__(self, path, fps=30.0):
+        self.path = path
+        self.fps = fps
+        self.files = sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self.position = 0
+        self.exhausted = False
+
+    def isOpened(self):
+        return bool(self.files)
+
+    def read(self, image=None):
+        """`image` is accepted for VideoCapture compatibility; imread always allocates"""
+        while self.position < len(self.files):
+            frame = cv2.imread(self.files[self.position])
+            self.position += 1
+            if frame is not None:
+                return True, frame
+        self.exhausted = True
+        return False, None
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return len(self.files)
+        return 0.0
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            self.position = int(value)
+            self.exhausted = False
+            return True
+        return False
+
+    def release(self):
+        self.files = []
+
+
+class ReplaySource:
+    """
+    Wraps a recorded source (video file or frame directory).
+    In realtime mode reads are paced to the recording's frame rate;
+    otherwise frames are returned as fast as they can be decoded.
+    """
+
+    def __init__(self, capture, realtime=True, loop=False):
+        self.capture = capture
+        self.realtime = realtime
+        self.loop = loop
+        self.exhausted = False
+
+        fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+        self.frame_interval = 1.0 / fps
+        self.next_frame_at = None
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def read(self, image=None):
+        """Next frame, decoded into `image` when it has the frame's shape"""
+        ret, frame = self.read_capture(image)
+        if not ret and self.loop:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.read_capture(image)
+        if not ret:
+            self.exhausted = True
+            return False, None
+
+        if self.realtime:
+            now = time.perf_counter()
+            if self.next_frame_at is None or now - self.next_frame_at > self.frame_interval:
+                # First frame, or we fell behind - resynchronise instead of bursting
+                self.next_frame_at = now
+            elif self.next_frame_at > now:
+                time.sleep(self.next_frame_at - now)
+            self.next_frame_at += self.frame_interval
+
+        return True, frame
+
+    def read_capture(self, image):
+        return self.capture.read(image) if image is not None else self.capture.read()
+
+    def get(self, prop):
+        return self.capture.get(prop)
+
+    def set(self, prop, value):
+        return self.capture.set(prop, value)
+
+    def release(self):
+        self.capture.release()
+
+
+def open_frame_source(source, realtime=True, loop=False):
+    """
+    Open a camera index, video file, directory of frames or stream URL.
+    Recorded sources (files and directories) are wrapped for replay.
+    """
+    if isinstance(source, int):
+        return cv2.VideoCapture(source)
+    if os.path.isdir(source):
+        return ReplaySource(FrameDirectorySource(source), realtime=realtime, loop=loop)
+    if os.path.isfile(source):
+        return ReplaySource(cv2.VideoCapture(source), realtime=realtime, loop=loop)
+    return cv2.VideoCapture(source)
@@ -0,0 +1,138 @@
+# gesture_tracker.py
+from collections import deque
+
+import numpy as np
+
+from .landmarks import GESTURE_NAMES
+
+
+WRIST = 0
+
+# Seconds before the same gesture can fire its command again, from any hand
+GESTURE_COOLDOWNS = {
+    'thumbs_up': 2.0,
+    'point': 1.0,
+    'open_palm': 2.0
+}
+
+
+class HandTrack:
+    """Recent per-frame gesture votes of one physical hand"""
+
+    def __init__(self, track_id, wrist, window):
+        self.track_id = track_id
+        self.wrist = wrist
+        self.votes = deque(maxlen=window)
+        self.active = 0      # Stable gesture id, 0 = none
+        self.missing = 0     # Consecutive frames without a matching detection
+
+    def count(self, gesture_id):
+        return sum(1 for vote in self.votes if vote == gesture_id)
+
+
+class GestureTracker:
+    """
+    Turns per-frame gesture classifications into discrete gesture events.
+    Hands keep their identity across frames by nearest wrist position. A gesture
+    becomes active once it wins `enter_votes` of the last `window` frames and
+    stays active until it drops below `exit_votes`, so a held gesture fires
+    once and a flickering classification does not re-fire it.
+    """
+
+    def __init__(self, window=8, enter_votes=5, exit_votes=2, max_match_distance=0.15,
+                 max_missing=5, cooldowns=None, default_cooldown=1.5):
+        if not 0 < exit_votes <= enter_votes <= window:
+            raise ValueError("Gesture votes must satisfy 0 < exit_votes <= enter_votes <= window")
+
+        self.window = window
+        self.enter_votes = enter_votes
+        self.exit_votes = exit_votes
+        self.max_match_distance = max_match_distance
+        self.max_missing = max_missing
+        self.cooldowns = dict(GESTURE_COOLDOWNS if cooldowns is None else cooldowns)
+        self.default_cooldown = default_cooldown
+
+        self.tracks = []
+        self.next_track_id = 0
+        self.last_fired = {}   # gesture name -> timestamp
+
+    def update(self, hands, gesture_ids, timestamp):
+        """
+        Feed one frame of hands (n, 21, 3) and their classified gesture ids.
+        Returns the gesture names that fired on this frame.
+        """
+        wrists = hands[:, WRIST, :2] if len(hands) else np.empty((0, 2), dtype=np.float32)
+        matched = self.match(wrists)
+
+        events = []
+        updated = set()
+        for index, track in enumerate(matched):
+            if track is None:
+                track = HandTrack(self.next_track_id, wrists[index], self.window)
+                self.next_track_id += 1
+                self.tracks.append(track)
+            track.wrist = wrists[index]
+            track.missing = 0
+            track.votes.append(int(gesture_ids[index]))
+            updated.add(track.track_id)
+
+            gesture = self.vote(track, timestamp)
+            if gesture is not None:
+                events.append(gesture)
+
+        for track in self.tracks:
+            if track.track_id not in updated:
+                track.missing += 1
+                track.votes.append(0)
+                if track.active and track.count(track.active) < self.exit_votes:
+                    track.active = 0
+        self.tracks = [track for track in self.tracks if track.missing <= self.max_missing]
+        return events
+
+    def match(self, wrists):
+        """Greedy nearest-wrist assignment of detections to existing tracks (None = new hand)"""
+        matched = [None] * len(wrists)
+        if not len(wrists) or not self.tracks:
+            return matched
+
+        previous = np.array([track.wrist for track in self.tracks], dtype=np.float32)
+        distances = np.linalg.norm(wrists[:, None, :] - previous[None, :, :], axis=2)
+
+        used = set()
+        for flat in np.argsort(distances, axis=None):
+            detection, track_index = np.unravel_index(flat, distances.shape)
+            if distances[detection, track_index] > self.max_match_distance:
+                break
+            if matched[detection] is not None or track_index in used:
+                continue
+            matched[detection] = self.tracks[track_index]
+            used.add(track_index)
+        return matched
+
+    def vote(self, track, timestamp):
+        """Apply enter/exit hysteresis to a track; returns the gesture name if it fires now"""
+        if track.active and track.count(track.active) >= self.exit_votes:
+            return None
+
+        track.active = 0
+        for gesture_id in set(track.votes):
+            if gesture_id and track.count(gesture_id) >= self.enter_votes:
+                track.active = gesture_id
+                break
+        if not track.active:
+            return None
+
+        gesture = GESTURE_NAMES[track.active]
+        cooldown = self.cooldowns.get(gesture, self.default_cooldown)
+        if timestamp - self.last_fired.get(gesture, float('-inf')) < cooldown:
+            return None
+        self.last_fired[gesture] = timestamp
+        return gesture
+
+    def active_gestures(self):
+        """Stable gesture name per tracked hand, skipping hands with none"""
+        return [GESTURE_NAMES[track.active] for track in self.tracks if track.active]
+
+    def reset(self):
+        self.tracks = []
+        self.last_fired = {}
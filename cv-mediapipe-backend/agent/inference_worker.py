@@ -0,0 +1,320 @@
+# inference_worker.py
+import itertools
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from .landmarks import (
+    FACE_LANDMARK_COUNT, HAND_LANDMARK_COUNT, create_face_mesh, create_hands, landmarks_to_array
+)
+from .roi_tracker import crop_region
+from .frame_buffers import ScratchBuffers
+
+
+logger = logging.getLogger(__name__)
+
+MODEL_FACE = 'face'
+MODEL_HANDS = 'hands'
+MODEL_FACTORIES = {MODEL_FACE: create_face_mesh, MODEL_HANDS: create_hands}
+MODEL_STAGES = {MODEL_FACE: 'face_mesh', MODEL_HANDS: 'hands'}   # Stage names used in timings
+MAX_WORKER_RESTARTS = 3   # Deaths in a row before a worker's models are given up on
+
+
+def prepare_model_input(frame, region, scale, rgb_inputs, buffers=None):
+    """
+    Crop to a normalized region, downscale and convert to RGB; cached per region in `rgb_inputs`.
+    With `buffers` (ScratchBuffers) the resized and RGB images are written into reused memory.
+    """
+    if region in rgb_inputs:
+        return rgb_inputs[region]
+
+    slot = len(rgb_inputs)
+    inference_frame = crop_region(frame, region)
+    h, w = inference_frame.shape[:2]
+    if scale < 1.0:
+        # Landmarks are normalized, so a downscaled input maps straight back
+        size = (max(1, round(w * scale)), max(1, round(h * scale)))
+        resized = buffers.view((slot, 'resized'), (size[1], size[0], 3)) if buffers is not None else None
+        inference_frame = cv2.resize(inference_frame, size, dst=resized, interpolation=cv2.INTER_AREA)
+    rgb = buffers.view((slot, 'rgb'), inference_frame.shape) if buffers is not None else None
+    frame_rgb = cv2.cvtColor(inference_frame, cv2.COLOR_BGR2RGB, dst=rgb)
+    rgb_inputs[region] = frame_rgb
+    return frame_rgb
+
+
+def run_model(model, name, frame_rgb):
+    """Run a MediaPipe model and return its landmarks as a (n, count, 3) float32 array"""
+    results = model.process(frame_rgb)
+    if name == MODEL_FACE:
+        return landmarks_to_array(results.multi_face_landmarks, FACE_LANDMARK_COUNT)
+    return landmarks_to_array(results.multi_hand_landmarks, HAND_LANDMARK_COUNT)
+
+
+class SharedFrameRing:
+    """Preallocated frame slots in one shared memory block, viewed as a (slots, h, w, c) array"""
+
+    def __init__(self, slots, frame_shape, name=None):
+        self.slots = slots
+        self.frame_shape = tuple(frame_shape)
+        size = slots * int(np.prod(self.frame_shape))
+        self.owner = name is None
+        self.memory = shared_memory.SharedMemory(name=name, create=self.owner, size=size if self.owner else 0)
+        self.frames = np.ndarray((slots,) + self.frame_shape, dtype=np.uint8, buffer=self.memory.buf)
+        self.next_slot = 0
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    def write(self, frame, busy=()):
+        """Copy a frame into the next slot not in `busy` and return its index; None if every slot is busy"""
+        for _ in range(self.slots):
+            slot = self.next_slot
+            self.next_slot = (slot + 1) % self.slots
+            if slot not in busy:
+                np.copyto(self.frames[slot], frame)
+                return slot
+        return None
+
+    def close(self):
+        self.frames = None
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+
+def inference_worker_main(index, requests, results):
+    """
+    Entry point of an inference worker process.
+    Messages: ('attach', ring_name, (slots, frame_shape)), ('infer', request_id, (slot, tasks)),
+    ('shutdown', None, None). Each task is (model, region, scale); the worker replies
+    ('result', request_id, ({model: landmarks}, {stage: seconds})) with landmarks
+    normalized to the task's region, after announcing ('ready', index, None).
+    """
+    models = {name: factory() for name, factory in MODEL_FACTORIES.items()}
+    buffers = ScratchBuffers()
+    results.put(('ready', index, None))
+    ring = None
+    while True:
+        kind, key, payload = requests.get()
+        if kind == 'shutdown':
+            break
+
+        if kind == 'attach':
+            if ring is not None:
+                ring.close()
+            slots, frame_shape = payload
+            ring = SharedFrameRing(slots, frame_shape, name=key)
+
+        elif kind == 'infer':
+            slot, tasks = payload
+            outputs, stage_times, rgb_inputs = {}, {}, {}
+            try:
+                frame = ring.frames[slot]
+                for name, region, scale in tasks:
+                    started = time.perf_counter()
+                    frame_rgb = prepare_model_input(frame, region, scale, rgb_inputs, buffers)
+                    stage_times['color'] = stage_times.get('color', 0.0) + time.perf_counter() - started
+
+                    started = time.perf_counter()
+                    outputs[name] = run_model(models[name], name, frame_rgb)
+                    stage_times[MODEL_STAGES[name]] = time.perf_counter() - started
+            except Exception as e:
+                logger.error(f"Inference request {key} failed: {e}")
+            results.put(('result', key, (outputs, stage_times)))
+
+    for model in models.values():
+        model.close()
+    if ring is not None:
+        ring.close()
+
+
+class InferencePool:
+    """
+    Runs face and hand models in worker processes. Frames travel through a
+    shared-memory ring - only slot indices, regions and the resulting landmark
+    arrays cross the process boundary. With two or more workers the face and
+    hand models of one frame run in parallel. Each model always runs on the
+    same worker, since FaceMesh and Hands keep tracking state between frames.
+    A worker that dies is restarted; one that keeps dying has its models disabled.
+    """
+
+    def __init__(self, workers=1, slots=4, timeout=2.0, startup_timeout=60.0):
+        self.workers_count = max(1, workers)
+        self.slots = slots
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self.ready = set()
+        self.failed = set()   # Workers given up on after MAX_WORKER_RESTARTS
+
+        self.context = multiprocessing.get_context('spawn')
+        self.results = self.context.Queue()
+        self.workers = [self.start_worker(index) for index in range(self.workers_count)]
+        self.restarts = [0] * self.workers_count
+
+        # Fixed model -> worker assignment; with one worker both models share it
+        self.model_workers = {MODEL_FACE: 0, MODEL_HANDS: 1 % self.workers_count}
+        self.ring = None
+        self.in_flight = {}   # request id -> (worker, ring slot), for timed-out requests a worker may still be reading
+        self.request_ids = itertools.count()
+        self.lock = threading.Lock()
+
+    def infer(self, frame, tasks):
+        """
+        Run (model, region, scale) tasks on a frame.
+        Returns ({model: landmarks}, {stage: seconds}); models whose worker
+        failed or timed out are missing from the landmarks.
+        """
+        with self.lock:
+            if self.starting() and not self.wait_ready():
+                return {}, {}
+            if self.ring is None or self.ring.frame_shape != frame.shape:
+                self.attach_ring(frame.shape)
+
+            started = time.perf_counter()
+            slot = self.write_frame(frame)
+            stage_times = {'frame_copy': time.perf_counter() - started}
+
+            # Each worker answers once per request
+            batches = {}
+            for task in tasks:
+                worker_index = self.model_workers[task[0]]
+                if worker_index not in self.failed:
+                    batches.setdefault(worker_index, []).append(task)
+            pending = {}
+            for worker_index, batch in batches.items():
+                request_id = next(self.request_ids)
+                _, requests = self.workers[worker_index]
+                requests.put(('infer', request_id, (slot, batch)))
+                pending[request_id] = (worker_index, [name for name, _, _ in batch])
+
+            outputs = {}
+            deadline = time.monotonic() + self.timeout
+            while pending:
+                remaining = deadline - time.monotonic()
+                try:
+                    kind, request_id, payload = self.results.get(timeout=max(0.0, remaining))
+                except queue.Empty:
+                    models = sorted(name for _, names in pending.values() for name in names)
+                    logger.error(f"Inference timed out for {models}")
+                    # The slot stays reserved until the worker answers, so no newer frame overwrites it
+                    self.in_flight.update((request_id, (worker_index, slot))
+                                          for request_id, (worker_index, _) in pending.items())
+                    self.restart_dead_workers()
+                    break
+                if kind == 'ready':
+                    self.ready.add(request_id)   # A restarted worker; the key is its index, not a request id
+                    continue
+                request = pending.pop(request_id, None)
+                if request is None:
+                    self.in_flight.pop(request_id, None)   # Late reply to a request that already timed out
+                    continue
+                self.restarts[request[0]] = 0
+                landmarks, times = payload
+                outputs.update(landmarks)
+                for stage, elapsed in times.items():
+                    stage_times[stage] = stage_times.get(stage, 0.0) + elapsed
+            return outputs, stage_times
+
+    def write_frame(self, frame):
+        """Copy the frame into a ring slot no timed-out request is still reading"""
+        slot = self.ring.write(frame, busy={slot for _, slot in self.in_flight.values()})
+        if slot is None:
+            self.collect_late_results()
+            slot = self.ring.write(frame, busy={slot for _, slot in self.in_flight.values()})
+        if slot is None:
+            # A worker is stuck on every slot - give the workers a fresh ring. Requests queued before
+            # the 'attach' message still read the old memory, which stays mapped until they get to it
+            self.attach_ring(frame.shape)
+            slot = self.ring.write(frame)
+        return slot
+
+    def collect_late_results(self):
+        """Drop replies to timed-out requests that have arrived, releasing their slots"""
+        while True:
+            try:
+                kind, request_id, _ = self.results.get_nowait()
+            except queue.Empty:
+                return
+            if kind == 'result':
+                self.in_flight.pop(request_id, None)
+            elif kind == 'ready':
+                self.ready.add(request_id)
+
+    def starting(self):
+        """Whether a worker is still loading its models"""
+        return len(self.ready | self.failed) < self.workers_count
+
+    def wait_ready(self):
+        """Block until every worker has loaded its models; False if they did not start in time"""
+        deadline = time.monotonic() + self.startup_timeout
+        while self.starting():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.error("Inference workers did not start in time")
+                return False
+            try:
+                kind, key, _ = self.results.get(timeout=min(remaining, 1.0))
+            except queue.Empty:
+                self.restart_dead_workers()
+                continue
+            if kind == 'ready':
+                self.ready.add(key)
+            elif kind == 'result':
+                self.in_flight.pop(key, None)
+        return True
+
+    def start_worker(self, index):
+        requests = self.context.Queue()
+        process = self.context.Process(target=inference_worker_main, args=(index, requests, self.results),
+                                       name=f'inference-worker-{index}', daemon=True)
+        process.start()
+        return process, requests
+
+    def restart_dead_workers(self):
+        """Respawn workers that died (e.g. crashed in native code), up to MAX_WORKER_RESTARTS times each"""
+        for index, (process, _) in enumerate(self.workers):
+            if index in self.failed or process.is_alive():
+                continue
+            self.ready.discard(index)
+            # Nothing will answer the dead worker's requests, so their slots are free again
+            self.in_flight = {request_id: entry for request_id, entry in self.in_flight.items() if entry[0] != index}
+            if self.restarts[index] >= MAX_WORKER_RESTARTS:
+                models = sorted(model for model, worker in self.model_workers.items() if worker == index)
+                logger.error(f"Inference worker {index} keeps dying; disabling {models}")
+                self.failed.add(index)
+                continue
+            self.restarts[index] += 1
+            logger.error(f"Inference worker {index} died (exit code {process.exitcode}); restarting it")
+            self.workers[index] = self.start_worker(index)
+            if self.ring is not None:
+                self.workers[index][1].put(('attach', self.ring.name, (self.slots, self.ring.frame_shape)))
+
+    def attach_ring(self, frame_shape):
+        previous = self.ring
+        self.ring = SharedFrameRing(self.slots, frame_shape)
+        self.in_flight = {}
+        for _, requests in self.workers:
+            requests.put(('attach', self.ring.name, (self.slots, self.ring.frame_shape)))
+        if previous is not None:
+            previous.close()
+
+    def close(self, timeout=5.0):
+        """Stop the workers and release the shared frame ring"""
+        with self.lock:
+            for _, requests in self.workers:
+                requests.put(('shutdown', None, None))
+            for process, _ in self.workers:
+                process.join(timeout)
+                if process.is_alive():
+                    process.terminate()
+            self.workers = []
+            if self.ring is not None:
+                self.ring.close()
+                self.ring = None
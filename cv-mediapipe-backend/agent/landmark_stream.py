@@ -0,0 +1,258 @@
+# landmark_stream.py
+"""
+Binary landmark stream for the avatar frontends.
+
+Each packet is a little-endian header followed by float16 coordinates:
+
+    version   u8    PACKET_VERSION
+    flags     u8    FLAG_KEYFRAME | FLAG_COMPRESSED
+    seq       u16   packet counter of the stream, wraps
+    timestamp f64   capture time of the frame (unix seconds)
+    gesture   u8    id from landmarks.GESTURE_NAMES, 0 = none
+    faces     u8    number of faces (478 landmarks each)
+    hands     u8    number of hands (21 landmarks each)
+    payload         (faces * 478 + hands * 21) * 3 float16 values, zlib-compressed
+                    when FLAG_COMPRESSED is set
+
+Keyframes carry absolute coordinates; other packets carry the difference to the
+previous frame as the client reconstructed it, snapped to DELTA_QUANTUM, so
+rounding never accumulates and landmarks that barely move compress to almost
+nothing. On the wire each packet is prefixed by its u32 length; a zero length
+is a heartbeat with no packet, sent while no frames arrive.
+"""
+import struct
+import threading
+import zlib
+from collections import deque
+
+import numpy as np
+
+from .landmarks import FACE_LANDMARK_COUNT, HAND_LANDMARK_COUNT, GESTURE_IDS
+
+
+PACKET_VERSION = 1
+FLAG_KEYFRAME = 1
+FLAG_COMPRESSED = 2
+
+HEADER = struct.Struct('<BBHdBBB')
+LENGTH = struct.Struct('<I')
+
+STREAM_RATES = (1, 5, 10, 15, 30)   # Packets per second a client can subscribe at
+KEYFRAME_INTERVAL = 60              # Packets between forced keyframes
+DELTA_QUANTUM = 2.0 ** -12          # Deltas snap to this step (~0.16 px at 640 px), so still points send zeros
+SUBSCRIBER_BACKLOG = 8              # Packets a slow client may fall behind before it is resynced
+
+
+def stream_rate(rate):
+    """Snap a requested rate to the nearest supported one, so clients share encoders"""
+    return min(STREAM_RATES, key=lambda r: abs(r - rate))
+
+
+def pack_landmarks(faces, hands):
+    """Flatten face and hand arrays into one float32 vector"""
+    return np.concatenate([faces.reshape(-1), hands.reshape(-1)]).astype(np.float32)
+
+
+class LandmarkEncoder:
+    """Delta-encodes successive frames against the reconstruction the client holds"""
+
+    def __init__(self, keyframe_interval=KEYFRAME_INTERVAL, compress=True):
+        self.keyframe_interval = keyframe_interval
+        self.compress = compress
+        self.reference = None
+        self.counts = None
+        self.seq = 0
+        self.since_keyframe = 0
+        self.force_keyframe = True
+
+    def encode(self, timestamp, gesture_id, faces, hands):
+        values = pack_landmarks(faces, hands)
+        counts = (len(faces), len(hands))
+
+        keyframe = (self.force_keyframe or counts != self.counts or
+                    self.since_keyframe >= self.keyframe_interval)
+        if keyframe:
+            quantized = values.astype(np.float16)
+            self.reference = quantized.astype(np.float32)
+            self.since_keyframe = 0
+            self.force_keyframe = False
+        else:
+            # Adding 0.0 turns the -0.0 that rounding leaves for tiny negative deltas into 0.0, so still points compress
+            quantized = (np.round((values - self.reference) / DELTA_QUANTUM) * DELTA_QUANTUM + 0.0).astype(np.float16)
+            self.reference += quantized.astype(np.float32)
+            self.since_keyframe += 1
+        self.counts = counts
+
+        flags = FLAG_KEYFRAME if keyframe else 0
+        payload = quantized.tobytes()
+        if self.compress:
+            flags |= FLAG_COMPRESSED
+            payload = zlib.compress(payload, 1)
+
+        header = HEADER.pack(PACKET_VERSION, flags, self.seq & 0xFFFF, timestamp, gesture_id, *counts)
+        self.seq += 1
+        return header + payload
+
+
+class LandmarkDecoder:
+    """Client-side reconstruction; decode() returns None until the first keyframe arrives"""
+
+    def __init__(self):
+        self.reference = None
+
+    def decode(self, packet):
+        version, flags, seq, timestamp, gesture_id, face_count, hand_count = HEADER.unpack_from(packet)
+        if version != PACKET_VERSION:
+            raise ValueError(f"Unsupported landmark packet version: {version}")
+
+        payload = packet[HEADER.size:]
+        if flags & FLAG_COMPRESSED:
+            payload = zlib.decompress(payload)
+        values = np.frombuffer(payload, dtype=np.float16).astype(np.float32)
+
+        if flags & FLAG_KEYFRAME:
+            self.reference = values
+        elif self.reference is None or len(self.reference) != len(values):
+            return None
+        else:
+            self.reference = self.reference + values
+
+        face_values = face_count * FACE_LANDMARK_COUNT * 3
+        return {
+            'seq': seq,
+            'timestamp': timestamp,
+            'gesture_id': gesture_id,
+            'faces': self.reference[:face_values].reshape(face_count, FACE_LANDMARK_COUNT, 3),
+            'hands': self.reference[face_values:].reshape(hand_count, HAND_LANDMARK_COUNT, 3)
+        }
+
+
+class LandmarkSubscriber:
+    """A client's packet queue; overflowing it drops the backlog and asks for a keyframe"""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.packets = deque()
+        self.condition = threading.Condition()
+        self.needs_keyframe = True   # Every client starts from a keyframe
+        self.resyncs = 0
+        self.closed = False
+
+    def publish(self, packet):
+        with self.condition:
+            if len(self.packets) >= SUBSCRIBER_BACKLOG:
+                # Deltas cannot be skipped - start over from the next keyframe
+                self.packets.clear()
+                self.needs_keyframe = True
+                self.resyncs += 1
+                return
+            self.packets.append(packet)
+            self.condition.notify()
+
+    def next_packet(self, timeout=1.0):
+        with self.condition:
+            if not self.packets and not self.closed:
+                self.condition.wait(timeout)
+            if self.closed or not self.packets:
+                return None
+            return self.packets.popleft()
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+
+
+class LandmarkBroadcaster:
+    """
+    Streams the service's landmarks to frontends at 1-30 packets per second.
+    Packets are encoded once per rate on a dedicated thread. The broadcaster is
+    a landmark consumer of the service only while clients are subscribed.
+    """
+
+    def __init__(self, service):
+        self.service = service
+        self.subscribers = []
+        self.encoders = {}       # rate -> (LandmarkEncoder, last emitted timestamp)
+        self.condition = threading.Condition()
+        self.pending = None
+        self.thread = None
+
+    def subscribe(self, rate=15):
+        subscriber = LandmarkSubscriber(stream_rate(rate))
+        with self.condition:
+            self.subscribers = self.subscribers + [subscriber]
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._encode_loop, name='landmark-encoder', daemon=True)
+                self.thread.start()
+                self.service.add_landmark_consumer(self.on_landmarks)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        subscriber.close()
+        with self.condition:
+            self.subscribers = [s for s in self.subscribers if s is not subscriber]
+            rates = {s.rate for s in self.subscribers}
+            self.encoders = {rate: encoder for rate, encoder in self.encoders.items() if rate in rates}
+            if not self.subscribers and self.thread is not None:
+                self.service.remove_landmark_consumer(self.on_landmarks)
+                self.thread = None
+                self.pending = None
+                self.condition.notify()
+
+    def on_landmarks(self, interaction_data, landmarks):
+        """Landmark consumer - runs on the inference thread, so it only hands the frame over"""
+        with self.condition:
+            self.pending = (interaction_data, landmarks)
+            self.condition.notify()
+
+    def _encode_loop(self):
+        current = threading.current_thread()
+        while True:
+            with self.condition:
+                while self.pending is None and self.thread is current:
+                    self.condition.wait()
+                if self.thread is not current:
+                    return
+                (interaction_data, landmarks), self.pending = self.pending, None
+                subscribers = self.subscribers
+
+            timestamp = interaction_data['timestamp']
+            gesture_id = GESTURE_IDS[interaction_data['gesture_recognized']]
+            for rate in {s.rate for s in subscribers}:
+                encoder, last_sent = self.encoders.get(rate) or (LandmarkEncoder(), None)
+                # Half a frame of slack so 30 Hz clients get every frame of a 30 FPS camera
+                if last_sent is not None and timestamp - last_sent < 1.0 / rate - 0.017:
+                    continue
+
+                group = [s for s in subscribers if s.rate == rate]
+                if any(s.needs_keyframe for s in group):
+                    encoder.force_keyframe = True
+                    for s in group:
+                        s.needs_keyframe = False
+                packet = encoder.encode(timestamp, gesture_id, landmarks['face'], landmarks['hands'])
+                self.encoders[rate] = (encoder, timestamp)
+                for s in group:
+                    s.publish(packet)
+
+    def binary_stream(self, rate=15):
+        """Generator of length-prefixed packets; unsubscribes when the client goes away"""
+        subscriber = self.subscribe(rate)
+        try:
+            while True:
+                packet = subscriber.next_packet(timeout=1.0)
+                if packet is None:
+                    # Heartbeat - the write fails once the client has gone, which ends the stream
+                    yield LENGTH.pack(0)
+                    continue
+                yield LENGTH.pack(len(packet)) + packet
+        finally:
+            self.unsubscribe(subscriber)
+
+    def get_stats(self):
+        subscribers = self.subscribers
+        return {
+            'subscribers': len(subscribers),
+            'rates': sorted({s.rate for s in subscribers}),
+            'resyncs': sum(s.resyncs for s in subscribers)
+        }
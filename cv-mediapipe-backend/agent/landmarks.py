@@ -0,0 +1,113 @@
+# landmarks.py
+import cv2
+import mediapipe as mp
+import numpy as np
+
+
+HAND_LANDMARK_COUNT = 21
+FACE_LANDMARK_COUNT = 478   # 468 mesh points + 10 iris points with refine_landmarks=True
+
+# Face landmark indices used for attention
+LEFT_EYE_OUTER = 33
+RIGHT_EYE_OUTER = 263
+
+# Gesture rules, evaluated in order - the first matching rule wins.
+# Each condition is (landmark, reference, relation) on the image y axis:
+# 'above' means the landmark is higher in the image than the reference.
+GESTURE_RULES = [
+    ('thumbs_up', [(4, 3, 'above'), (8, 6, 'below')]),
+    ('point', [(8, 6, 'above'), (12, 10, 'below'), (16, 14, 'below')]),
+    ('open_palm', [(4, 3, 'above'), (8, 6, 'above'), (12, 10, 'above'),
+                   (16, 14, 'above'), (20, 18, 'above')])
+]
+
+# Gesture ids are stable small integers; 0 means no gesture
+GESTURE_NAMES = [None] + [name for name, _ in GESTURE_RULES]
+GESTURE_IDS = {name: index for index, name in enumerate(GESTURE_NAMES)}
+
+FACE_CONNECTIONS = np.array(sorted(mp.solutions.face_mesh.FACEMESH_CONTOURS), dtype=np.int32)
+HAND_CONNECTIONS = np.array(sorted(mp.solutions.hands.HAND_CONNECTIONS), dtype=np.int32)
+
+
+def create_face_mesh():
+    """MediaPipe face mesh used for attention tracking"""
+    return mp.solutions.face_mesh.FaceMesh(
+        max_num_faces=1,
+        refine_landmarks=True,
+        min_detection_confidence=0.7,
+        min_tracking_confidence=0.7
+    )
+
+
+def create_hands():
+    """MediaPipe hand tracker used for gesture recognition"""
+    return mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=2,
+        min_detection_confidence=0.7,
+        min_tracking_confidence=0.5
+    )
+
+
+def landmarks_to_array(landmark_lists, count):
+    """Convert MediaPipe landmark lists into one (n, count, 3) float32 array"""
+    if not landmark_lists:
+        return np.empty((0, count, 3), dtype=np.float32)
+    return np.array(
+        [[(lm.x, lm.y, lm.z) for lm in landmark_list.landmark] for landmark_list in landmark_lists],
+        dtype=np.float32
+    )
+
+
+def attention_scores(faces):
+    """
+    Attention per face (1.0 = looking directly at screen, 0.0 = looking away),
+    from how far the eye midpoint sits from the horizontal frame centre.
+    """
+    face_center_x = (faces[:, LEFT_EYE_OUTER, 0] + faces[:, RIGHT_EYE_OUTER, 0]) / 2
+    deviation = np.abs(face_center_x - 0.5) / 0.5
+    return np.maximum(0.0, 1.0 - deviation)
+
+
+class GestureClassifier:
+    """Evaluates the gesture rule table over all detected hands at once"""
+
+    def __init__(self, rules=GESTURE_RULES):
+        first, second, signs, owners = [], [], [], []
+        for rule_index, (_, conditions) in enumerate(rules):
+            for landmark, reference, relation in conditions:
+                if relation not in ('above', 'below'):
+                    raise ValueError(f"Unknown gesture relation: {relation}")
+                first.append(landmark)
+                second.append(reference)
+                signs.append(1.0 if relation == 'above' else -1.0)
+                owners.append(rule_index)
+
+        self.first = np.array(first, dtype=np.intp)
+        self.second = np.array(second, dtype=np.intp)
+        self.signs = np.array(signs, dtype=np.float32)
+
+        # (conditions, rules) membership, so failed conditions can be counted per rule
+        self.membership = np.zeros((len(first), len(rules)), dtype=np.int32)
+        self.membership[np.arange(len(first)), owners] = 1
+
+    def classify(self, hands):
+        """Gesture ids for a (hands, 21, 3) array; 0 where no rule matches"""
+        if len(hands) == 0:
+            return np.zeros(0, dtype=np.int32)
+
+        y = hands[:, :, 1]
+        failed = self.signs * (y[:, self.first] - y[:, self.second]) >= 0
+        matched = (failed.astype(np.int32) @ self.membership) == 0
+        return np.where(matched.any(axis=1), matched.argmax(axis=1) + 1, 0).astype(np.int32)
+
+
+def draw_landmark_array(frame, points, connections, line_color, point_color=None):
+    """Draw one landmark set (n, 3) in normalized coordinates onto a frame"""
+    h, w = frame.shape[:2]
+    pixels = (points[:, :2] * (w, h)).astype(np.int32)
+    cv2.polylines(frame, pixels[connections], False, line_color, 1, cv2.LINE_AA)
+
+    if point_color is not None:
+        for x, y in pixels:
+            cv2.circle(frame, (int(x), int(y)), 2, point_color, -1)
@@ -0,0 +1,201 @@
+# metrics.py
+import bisect
+import threading
+
+
+# Seconds - spans sub-millisecond CV stages up to slow HTTP requests
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def format_labels(labelnames, labels):
+    if not labelnames:
+        return ''
+    pairs = ','.join(f'{name}="{escape_label(value)}"' for name, value in zip(labelnames, labels))
+    return '{' + pairs + '}'
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.values)
+
+    def load(self, values):
+        """Replace the series for the given labels (values exported by another process)"""
+        with self.lock:
+            self.values.update(values)
+
+    def collect(self):
+        with self.lock:
+            items = list(self.values.items())
+        return [f'{self.name}{format_labels(self.labelnames, labels)} {value}' for labels, value in items]
+
+
+class Gauge(Counter):
+    """Value that can go up and down, optionally computed at scrape time"""
+    kind = 'gauge'
+
+    def __init__(self, name, help_text, labelnames=(), callback=None):
+        super().__init__(name, help_text, labelnames)
+        self.callback = callback   # () -> {labels: value}
+
+    def set(self, value, *labels):
+        with self.lock:
+            self.values[labels] = value
+
+    def collect(self):
+        if self.callback is not None:
+            try:
+                values = self.callback()
+            except Exception:
+                values = {}
+            with self.lock:
+                self.values = dict(values)
+        return super().collect()
+
+
+class Histogram:
+    """Fixed-bucket histogram; observe() is a bisect and two increments"""
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.series = {}   # labels -> [bucket counts..., +Inf count, sum]
+        self.lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def snapshot(self):
+        with self.lock:
+            return {labels: list(series) for labels, series in self.series.items()}
+
+    def load(self, series):
+        """Replace the series for the given labels (values exported by another process)"""
+        with self.lock:
+            self.series.update(series)
+
+    def collect(self):
+        with self.lock:
+            items = [(labels, list(series)) for labels, series in self.series.items()]
+
+        lines = []
+        names = self.labelnames + ('le',)
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series[:-1]):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{format_labels(names, labels + (bound,))} {cumulative}')
+            label_text = format_labels(self.labelnames, labels)
+            lines.append(f'{self.name}_sum{label_text} {series[-1]}')
+            lines.append(f'{self.name}_count{label_text} {cumulative}')
+        return lines
+
+
+class MetricsRegistry:
+    """Holds metrics and renders them in the Prometheus text format"""
+
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def register(self, metric):
+        with self.lock:
+            existing = self.metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self.metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self.register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=(), callback=None):
+        gauge = self.register(Gauge(name, help_text, labelnames, callback))
+        if callback is not None:
+            gauge.callback = callback
+        return gauge
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def export(self, names):
+        """Snapshot named metrics so a worker process can ship them to the parent"""
+        return {name: self.metrics[name].snapshot() for name in names if name in self.metrics}
+
+    def load(self, exported):
+        for name, values in exported.items():
+            metric = self.metrics.get(name)
+            if metric is not None:
+                metric.load(values)
+
+    def render(self):
+        with self.lock:
+            metrics = list(self.metrics.values())
+
+        lines = []
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.help_text}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+# CV pipeline
+STAGE_SECONDS = REGISTRY.histogram(
+    'conductor_stage_seconds', 'Time spent in each CV pipeline stage', ('session', 'stage'))
+FRAMES_TOTAL = REGISTRY.counter(
+    'conductor_frames_total', 'Frames that completed each pipeline stage', ('session', 'stage'))
+FRAMES_DROPPED = REGISTRY.counter(
+    'conductor_frames_dropped_total', 'Frames dropped at a pipeline hand-off', ('session', 'queue'))
+FRAME_ALLOCATIONS = REGISTRY.counter(
+    'conductor_frame_allocations_total', 'Frame-sized buffers allocated instead of reused', ('session', 'buffer'))
+PRESENCE = REGISTRY.gauge(
+    'conductor_presence', 'Whether someone is in front of the camera (1) or the session is idle (0)', ('session',))
+
+# Per-session series recorded inside camera worker processes
+WORKER_METRICS = (STAGE_SECONDS.name, FRAMES_TOTAL.name, FRAMES_DROPPED.name, FRAME_ALLOCATIONS.name, PRESENCE.name)
+
+# HTTP API
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    'conductor_http_request_seconds', 'Flask request handling time', ('route', 'method'))
+HTTP_REQUESTS_TOTAL = REGISTRY.counter(
+    'conductor_http_requests_total', 'Flask requests by route and status', ('route', 'method', 'status'))
+
+# Workflow executions
+QUEUE_WAIT_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+WORKFLOW_QUEUE_DEPTH = REGISTRY.gauge(
+    'conductor_workflow_queue_depth', 'Workflow executions waiting for a slot', ('priority',))
+WORKFLOW_QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    'conductor_workflow_queue_wait_seconds', 'Time executions waited in the queue before starting', ('priority',),
+    buckets=QUEUE_WAIT_BUCKETS)
+WORKFLOW_QUEUE_REJECTIONS = REGISTRY.counter(
+    'conductor_workflow_queue_rejections_total', 'Executions refused because the queue was full', ('priority',))
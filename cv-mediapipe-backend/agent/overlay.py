@@ -0,0 +1,76 @@
+# overlay.py
+import cv2
+import numpy as np
+
+
+class OverlayPanel:
+    """
+    A pre-rendered overlay panel.
+    `image` holds the panel pixels and `ink` marks the pixels drawn on top of
+    the background (text, bars, borders). With a `dim` factor the frame behind
+    the panel is darkened instead of covered, matching a black fill blended at
+    (1 - dim) opacity.
+    """
+
+    def __init__(self, width, height, background=(0, 0, 0), dim=None):
+        self.image = np.empty((height, width, 3), dtype=np.uint8)
+        self.image[:] = background
+        self.dim = dim
+        self.ink = None
+
+    def finish(self):
+        """Compute the ink mask once drawing is done (only needed for dimmed panels)"""
+        if self.dim is not None:
+            self.ink = self.image.any(axis=2)
+        return self
+
+
+class OverlayCompositor:
+    """
+    Caches rendered overlay panels and blends them into frames.
+    A panel is re-rendered only when its state key changes, and only the
+    panel's region of the frame is touched.
+    """
+
+    def __init__(self):
+        self.panels = {}
+        self.renders = 0
+
+    def get_panel(self, name, state_key, render):
+        """Return the cached panel for a state key, re-rendering on change"""
+        cached = self.panels.get(name)
+        if cached is not None and cached[0] == state_key:
+            return cached[1]
+
+        panel = render(state_key).finish()
+        self.panels[name] = (state_key, panel)
+        self.renders += 1
+        return panel
+
+    def composite(self, frame, name, state_key, render, origin):
+        """Blend a panel into the frame at origin (x, y), clipped to the frame"""
+        panel = self.get_panel(name, state_key, render)
+
+        h, w = frame.shape[:2]
+        ph, pw = panel.image.shape[:2]
+        x, y = origin
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + pw, w), min(y + ph, h)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        roi = frame[y0:y1, x0:x1]
+        source = panel.image[y0 - y:y1 - y, x0 - x:x1 - x]
+
+        if panel.dim is None:
+            roi[:] = source
+        else:
+            cv2.convertScaleAbs(roi, dst=roi, alpha=panel.dim)
+            np.copyto(roi, source, where=panel.ink[y0 - y:y1 - y, x0 - x:x1 - x, None])
+
+    def invalidate(self, name=None):
+        """Drop one cached panel, or all of them"""
+        if name is None:
+            self.panels.clear()
+        else:
+            self.panels.pop(name, None)
@@ -0,0 +1,88 @@
+# presence.py
+import cv2
+import numpy as np
+
+
+class PresenceDetector:
+    """
+    Decides whether the heavy models need to run on a frame.
+    While someone is detected the session is active. After `idle_after` seconds
+    without a face or hand it goes idle: frames are only checked for motion on a
+    small grayscale thumbnail every `check_interval` seconds, with a full model
+    probe every `probe_interval` seconds to catch someone standing still.
+    Motion or a detection makes the session active again immediately.
+    """
+
+    def __init__(self, idle_after=10.0, check_interval=0.5, probe_interval=5.0, motion_hold=2.0,
+                 motion_threshold=0.01, pixel_threshold=25, thumbnail_size=(64, 48), idle_fps=5.0):
+        self.idle_after = idle_after
+        self.check_interval = check_interval
+        self.probe_interval = probe_interval
+        self.motion_hold = motion_hold             # Seconds of full inference a motion hit buys
+        self.motion_threshold = motion_threshold   # Fraction of changed thumbnail pixels counted as motion
+        self.pixel_threshold = pixel_threshold     # Gray level change that counts a pixel as changed
+        self.thumbnail_size = thumbnail_size
+        self.idle_fps = idle_fps                   # Capture rate while idle
+        self.enabled = True
+
+        self.active_until = None   # None until the first frame - sessions start active
+        self.last_check = 0.0
+        self.last_probe = 0.0
+        self.previous = None
+        self.motion_checks = 0
+        self.wakeups = 0
+
+    def is_present(self, now):
+        return not self.enabled or self.active_until is None or now < self.active_until
+
+    def should_infer(self, frame, now):
+        """Whether this frame gets the full models; runs the motion check while idle"""
+        if self.active_until is None:
+            self.active_until = now + self.idle_after
+        if self.is_present(now):
+            return True
+        if now - self.last_check < self.check_interval:
+            return False
+
+        self.last_check = now
+        if self.motion(frame) >= self.motion_threshold:
+            self.active_until = now + self.motion_hold
+            self.wakeups += 1
+            return True
+        if now - self.last_probe >= self.probe_interval:
+            self.last_probe = now
+            return True
+        return False
+
+    def motion(self, frame):
+        """Fraction of thumbnail pixels that changed since the previous check"""
+        thumbnail = cv2.cvtColor(cv2.resize(frame, self.thumbnail_size, interpolation=cv2.INTER_AREA),
+                                 cv2.COLOR_BGR2GRAY)
+        previous, self.previous = self.previous, thumbnail
+        self.motion_checks += 1
+        if previous is None:
+            return 0.0
+        return np.count_nonzero(cv2.absdiff(thumbnail, previous) > self.pixel_threshold) / thumbnail.size
+
+    def observe(self, detected, now):
+        """Feed back whether the models found a face or hand on an inferred frame"""
+        if detected:
+            if not self.is_present(now):
+                self.wakeups += 1
+            self.active_until = max(self.active_until or now, now + self.idle_after)
+            # Compare against a fresh thumbnail once the session goes idle again
+            self.previous = None
+
+    def reset(self):
+        """Start over as active, e.g. when a monitoring session begins"""
+        self.active_until = None
+        self.previous = None
+
+    def get_status(self, now):
+        return {
+            'present': self.is_present(now),
+            'enabled': self.enabled,
+            'idle_fps': self.idle_fps,
+            'motion_checks': self.motion_checks,
+            'wakeups': self.wakeups
+        }
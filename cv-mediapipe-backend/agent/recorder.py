@@ -0,0 +1,244 @@
+# recorder.py
+"""
+Memory-mapped session recorder.
+
+A recording is a directory of fixed-size segments, one .npy file per column:
+
+    recordings/<session_id>/<started>/
+        session.json              metadata, workflow id table, frames per segment
+        segment_0000/timestamp.npy, attention.npy, ..., faces.npy, hands_landmarks.npy
+        segment_0001/...
+
+Segment files are preallocated with open_memmap, so appending a frame only
+writes into mapped pages - nothing is allocated per frame and memory use does
+not grow with the length of a session.
+"""
+import json
+import os
+import re
+import time
+from datetime import datetime
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from .landmarks import FACE_LANDMARK_COUNT, HAND_LANDMARK_COUNT
+
+
+SEGMENT_FRAMES = 9000   # 5 minutes at 30 FPS
+MAX_FACES = 1
+MAX_HANDS = 2
+
+# Column name -> (dtype, per-frame shape)
+COLUMNS = {
+    'timestamp': (np.float64, ()),
+    'attention': (np.float32, ()),
+    'face_present': (np.uint8, ()),
+    'hands': (np.uint8, ()),
+    'gesture_id': (np.uint8, ()),      # Stable gesture on this frame
+    'event_id': (np.uint8, ()),        # Gesture that fired a command on this frame, 0 = none
+    'workflow': (np.uint16, ()),       # 1-based index into session.json 'workflows', 0 = none
+}
+LANDMARK_COLUMNS = {
+    'faces': (np.float16, (MAX_FACES, FACE_LANDMARK_COUNT, 3)),
+    'hands_landmarks': (np.float16, (MAX_HANDS, HAND_LANDMARK_COUNT, 3)),
+}
+
+# Session ids become directory names under the recordings root
+SESSION_ID_PATTERN = re.compile(r'[A-Za-z0-9_-]{1,64}')
+
+
+def is_valid_session_id(session_id):
+    return isinstance(session_id, str) and SESSION_ID_PATTERN.fullmatch(session_id) is not None
+
+
+def session_path(root, session_id):
+    """Directory of a session's recordings; raises ValueError for ids that could leave `root`"""
+    if not is_valid_session_id(session_id):
+        raise ValueError(f"Invalid session id: {session_id!r}")
+    root = os.path.realpath(root)
+    path = os.path.realpath(os.path.join(root, session_id))
+    if os.path.dirname(path) != root:
+        raise ValueError(f"Session path outside the recordings directory: {session_id!r}")
+    return path
+
+
+class SessionRecorder:
+    """Appends per-frame interaction fields and landmarks to rolling memory-mapped segments"""
+
+    def __init__(self, root, session_id, segment_frames=SEGMENT_FRAMES, record_landmarks=True):
+        self.session_id = session_id
+        self.segment_frames = segment_frames
+        self.record_landmarks = record_landmarks
+        self.path = os.path.join(session_path(root, session_id), datetime.now().strftime('%Y%m%d-%H%M%S'))
+        suffix = 1
+        while os.path.exists(self.path + ('' if suffix == 1 else f'-{suffix}')):
+            suffix += 1
+        self.path += '' if suffix == 1 else f'-{suffix}'
+        os.makedirs(self.path)
+
+        self.columns = dict(COLUMNS, **LANDMARK_COLUMNS) if record_landmarks else dict(COLUMNS)
+        self.workflows = {}       # workflow id -> 1-based index
+        self.segments = []        # [{'name', 'frames'}]
+        self.started_at = time.time()
+        self.arrays = None
+        self.position = 0
+        self.frames = 0
+        self.open_segment()
+
+    def open_segment(self):
+        name = f'segment_{len(self.segments):04d}'
+        segment_path = os.path.join(self.path, name)
+        os.makedirs(segment_path, exist_ok=True)
+        self.arrays = {
+            column: open_memmap(os.path.join(segment_path, f'{column}.npy'), mode='w+',
+                                dtype=dtype, shape=(self.segment_frames,) + shape)
+            for column, (dtype, shape) in self.columns.items()
+        }
+        self.segments.append({'name': name, 'frames': 0})
+        self.position = 0
+        self.write_metadata()
+
+    def close_segment(self):
+        for array in self.arrays.values():
+            array.flush()
+        self.segments[-1]['frames'] = self.position
+        self.arrays = None
+
+    def append(self, interaction_data, gesture_id, event_id, workflow_id, faces, hands):
+        """Record one processed frame"""
+        if self.position >= self.segment_frames:
+            self.close_segment()
+            self.open_segment()
+
+        row = self.position
+        arrays = self.arrays
+        arrays['timestamp'][row] = interaction_data['timestamp']
+        arrays['attention'][row] = interaction_data['attention_score']
+        arrays['face_present'][row] = interaction_data['face_detected']
+        arrays['hands'][row] = interaction_data['hands_detected']
+        arrays['gesture_id'][row] = gesture_id
+        arrays['event_id'][row] = event_id
+        arrays['workflow'][row] = self.workflow_index(workflow_id)
+
+        if self.record_landmarks:
+            # Rows are preallocated; unused face/hand slots are zeroed
+            face_slots = arrays['faces'][row]
+            count = min(len(faces), MAX_FACES)
+            face_slots[:count] = faces[:count]
+            face_slots[count:] = 0
+            hand_slots = arrays['hands_landmarks'][row]
+            count = min(len(hands), MAX_HANDS)
+            hand_slots[:count] = hands[:count]
+            hand_slots[count:] = 0
+
+        self.position += 1
+        self.frames += 1
+
+    def workflow_index(self, workflow_id):
+        if workflow_id is None:
+            return 0
+        index = self.workflows.get(workflow_id)
+        if index is None:
+            index = self.workflows[workflow_id] = len(self.workflows) + 1
+            # Rare, and keeps the id table readable if the process dies mid-segment
+            self.write_metadata()
+        return index
+
+    def write_metadata(self):
+        metadata = {
+            'session_id': self.session_id,
+            'started_at': self.started_at,
+            'segment_frames': self.segment_frames,
+            'columns': {column: [np.dtype(dtype).str, list(shape)] for column, (dtype, shape) in self.columns.items()},
+            'workflows': sorted(self.workflows, key=self.workflows.get),
+            'segments': self.segments
+        }
+        with open(os.path.join(self.path, 'session.json'), 'w') as f:
+            json.dump(metadata, f, indent=2)
+
+    def close(self):
+        """Flush the open segment and finalize the metadata"""
+        if self.arrays is None:
+            return
+        self.close_segment()
+        self.write_metadata()
+
+    def get_status(self):
+        return {
+            'path': self.path,
+            'frames': self.frames,
+            'segments': len(self.segments),
+            'started_at': self.started_at
+        }
+
+
+class SessionRecording:
+    """Read-only view of a recording; columns are memory-mapped, not loaded"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'session.json')) as f:
+            self.metadata = json.load(f)
+        self.session_id = self.metadata['session_id']
+        self.workflows = self.metadata['workflows']
+        self.columns = list(self.metadata['columns'])
+
+    def segment_lengths(self):
+        """Frames per segment; a segment left open by a crash is measured by its written timestamps"""
+        lengths = []
+        for segment in self.metadata['segments']:
+            frames = segment['frames']
+            if not frames:
+                timestamps = np.load(os.path.join(self.path, segment['name'], 'timestamp.npy'), mmap_mode='r')
+                frames = int(np.count_nonzero(timestamps))
+            lengths.append(frames)
+        return lengths
+
+    def iter_segments(self, columns=None):
+        """Yield {column: memory-mapped array} per segment, trimmed to the recorded frames"""
+        columns = columns or self.columns
+        for segment, frames in zip(self.metadata['segments'], self.segment_lengths()):
+            if not frames:
+                continue
+            yield {
+                column: np.load(os.path.join(self.path, segment['name'], f'{column}.npy'), mmap_mode='r')[:frames]
+                for column in columns
+            }
+
+    def load(self, columns=None):
+        """Concatenate columns across segments into in-memory arrays"""
+        columns = columns or self.columns
+        parts = {column: [] for column in columns}
+        for segment in self.iter_segments(columns):
+            for column in columns:
+                parts[column].append(segment[column])
+        return {
+            column: np.concatenate(arrays) if arrays else np.empty((0,) + tuple(self.metadata['columns'][column][1]),
+                                                                   dtype=self.metadata['columns'][column][0])
+            for column, arrays in parts.items()
+        }
+
+    def __len__(self):
+        return sum(self.segment_lengths())
+
+
+def list_recordings(root, session_id=None):
+    """
+    Paths of all recordings under `root`, optionally for one session, oldest first.
+    Raises ValueError for a session id that is not a valid directory name under `root`.
+    """
+    if not os.path.isdir(root):
+        return []
+    if session_id:
+        directories = [session_path(root, session_id)]
+    else:
+        directories = [os.path.join(root, name) for name in sorted(os.listdir(root)) if is_valid_session_id(name)]
+    paths = []
+    for directory in directories:
+        if not os.path.isdir(directory):
+            continue
+        for name in sorted(os.listdir(directory)):
+            if os.path.isfile(os.path.join(directory, name, 'session.json')):
+                paths.append(os.path.join(directory, name))
+    return paths
@@ -0,0 +1,111 @@
+# roi_tracker.py
+
+
+def crop_region(frame, region):
+    """Crop a frame to a normalized region; returns a view, not a copy"""
+    if region is None:
+        return frame
+    h, w = frame.shape[:2]
+    x0, y0, x1, y1 = region
+    return frame[int(y0 * h):int(y1 * h), int(x0 * w):int(x1 * w)]
+
+
+class RegionTracker:
+    """
+    Tracks a padded region of interest from the previous frame's landmarks so
+    inference can run on a crop instead of the whole frame.
+    Regions are kept in normalized (0-1) frame coordinates.
+    """
+
+    def __init__(self, padding=0.3, min_size=0.2, margin=0.1, reacquire_every=None, max_misses=2):
+        self.padding = padding                   # Padding around the landmark box, relative to its size
+        self.min_size = min_size                 # Minimum region side, relative to the frame
+        self.margin = margin                     # Landmarks closer than this to the edge trigger a re-centre
+        self.reacquire_every = reacquire_every   # Force a full-frame pass to pick up new subjects
+        self.max_misses = max_misses             # Crop misses tolerated before falling back to full frame
+        self.region = None
+        self.frames_since_full = 0
+        self.misses = 0
+
+    def next_region(self):
+        """Region to run the next inference on, or None for a full-frame pass"""
+        if self.region is None:
+            return None
+        if self.reacquire_every is not None and self.frames_since_full >= self.reacquire_every:
+            return None
+        return self.region
+
+    @property
+    def coasting(self):
+        """Whether the last crop missed but the region is still held"""
+        return self.region is not None and self.misses > 0
+
+    def pixel_region(self, frame_shape, region):
+        """The normalized region snapped to the pixel grid used by crop_region()"""
+        h, w = frame_shape[:2]
+        x0, y0, x1, y1 = region
+        return (int(x0 * w) / w, int(y0 * h) / h, int(x1 * w) / w, int(y1 * h) / h)
+
+    def map_to_frame(self, landmarks, region, frame_shape):
+        """Map a landmark array detected on a crop back into full-frame coordinates, in place"""
+        if region is None or len(landmarks) == 0:
+            return
+        x0, y0, x1, y1 = self.pixel_region(frame_shape, region)
+        width, height = x1 - x0, y1 - y0
+
+        landmarks[..., 0] *= width
+        landmarks[..., 0] += x0
+        landmarks[..., 1] *= height
+        landmarks[..., 1] += y0
+        # z shares the scale of x
+        landmarks[..., 2] *= width
+
+    def update(self, landmarks, region_used):
+        """Update the tracked region from this frame's (full-frame) landmark array"""
+        if region_used is None:
+            self.frames_since_full = 0
+        else:
+            self.frames_since_full += 1
+
+        if len(landmarks) == 0:
+            # MediaPipe's own tracker can miss right after the input geometry
+            # changes, so only re-acquire on the full frame after repeated misses
+            self.misses += 1
+            if region_used is None or self.misses > self.max_misses:
+                self.region = None
+                self.misses = 0
+            return
+
+        self.misses = 0
+
+        points = landmarks[..., :2].reshape(-1, 2)
+        low = points.min(axis=0)
+        high = points.max(axis=0)
+        box = (float(low[0]), float(low[1]), float(high[0]), float(high[1]))
+
+        if self.region is not None and self.contains(self.region, box):
+            return
+        self.region = self.padded_region(box)
+
+    def contains(self, region, box):
+        """Whether a landmark box is still well inside a region"""
+        x0, y0, x1, y1 = region
+        inset_x = (x1 - x0) * self.margin
+        inset_y = (y1 - y0) * self.margin
+        return (box[0] >= x0 + inset_x and box[1] >= y0 + inset_y and
+                box[2] <= x1 - inset_x and box[3] <= y1 - inset_y)
+
+    def padded_region(self, box):
+        """Pad a landmark box, enforce the minimum size and clamp to the frame"""
+        x0, y0, x1, y1 = box
+        half_w = max((x1 - x0) * (1 + 2 * self.padding), self.min_size) / 2
+        half_h = max((y1 - y0) * (1 + 2 * self.padding), self.min_size) / 2
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        return (max(0.0, cx - half_w), max(0.0, cy - half_h),
+                min(1.0, cx + half_w), min(1.0, cy + half_h))
+
+    def reset(self):
+        """Drop the tracked region"""
+        self.region = None
+        self.frames_since_full = 0
+        self.misses = 0
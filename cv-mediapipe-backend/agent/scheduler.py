@@ -0,0 +1,126 @@
+# scheduler.py
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledCall:
+    """A pending callback; cancelled entries stay in the heap and are skipped when due"""
+    __slots__ = ('deadline', 'seq', 'key', 'callback', 'args', 'cancelled')
+
+    def __init__(self, deadline, seq, key, callback, args):
+        self.deadline = deadline
+        self.seq = seq
+        self.key = key
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def __lt__(self, other):
+        return (self.deadline, self.seq) < (other.deadline, other.seq)
+
+
+class TimerScheduler:
+    """
+    Runs delayed callbacks from one thread over a deadline heap.
+    Keyed calls replace any pending call with the same key, so a newer avatar
+    message or workflow deadline is never undone by a stale timer.
+    """
+
+    def __init__(self, name='timer-scheduler'):
+        self.name = name
+        self.heap = []
+        self.keyed = {}                 # key -> pending ScheduledCall
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+        self.thread = None
+        self.is_running = False
+
+    def schedule(self, delay, callback, *args, key=None):
+        """Call `callback(*args)` after `delay` seconds; replaces a pending call with the same key"""
+        with self.condition:
+            call = ScheduledCall(time.monotonic() + delay, next(self.counter), key, callback, args)
+            if key is not None:
+                previous = self.keyed.get(key)
+                if previous is not None:
+                    previous.cancelled = True
+                self.keyed[key] = call
+            heapq.heappush(self.heap, call)
+
+            if self.thread is None:
+                self.is_running = True
+                self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self.thread.start()
+            elif self.heap[0] is call:
+                # New earliest deadline - wake the thread so it re-arms its wait
+                self.condition.notify()
+            return call
+
+    def cancel(self, key_or_call):
+        """Cancel a pending call by key or by the handle schedule() returned"""
+        with self.condition:
+            if isinstance(key_or_call, ScheduledCall):
+                call = key_or_call
+                if call.key is not None and self.keyed.get(call.key) is call:
+                    del self.keyed[call.key]
+            else:
+                call = self.keyed.pop(key_or_call, None)
+            if call is None or call.cancelled:
+                return False
+            call.cancelled = True
+            return True
+
+    def pending(self, key):
+        """Whether a call is scheduled under `key`"""
+        with self.condition:
+            return key in self.keyed
+
+    def __len__(self):
+        with self.condition:
+            return sum(1 for call in self.heap if not call.cancelled)
+
+    def stop(self, timeout=2.0):
+        """Drop pending calls and stop the scheduler thread"""
+        with self.condition:
+            self.is_running = False
+            self.heap = []
+            self.keyed = {}
+            self.condition.notify_all()
+            thread = self.thread
+            self.thread = None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self.condition:
+                call = None
+                # A thread replaced after stop() exits instead of competing with its successor
+                while self.is_running and self.thread is threading.current_thread():
+                    if not self.heap:
+                        self.condition.wait()
+                        continue
+                    head = self.heap[0]
+                    if head.cancelled:
+                        heapq.heappop(self.heap)
+                        continue
+                    remaining = head.deadline - time.monotonic()
+                    if remaining > 0:
+                        self.condition.wait(remaining)
+                        continue
+                    call = heapq.heappop(self.heap)
+                    if call.key is not None and self.keyed.get(call.key) is call:
+                        del self.keyed[call.key]
+                    break
+                if call is None:
+                    return
+
+            try:
+                call.callback(*call.args)
+            except Exception as e:
+                logger.error(f"Scheduled callback {call.key or call.callback} failed: {e}")
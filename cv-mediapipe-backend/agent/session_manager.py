@@ -0,0 +1,280 @@
+# session_manager.py
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+from .metrics import REGISTRY, WORKER_METRICS
+from .recorder import is_valid_session_id
+
+logger = logging.getLogger(__name__)
+
+REPORT_INTERVAL = 1.0
+
+
+def parse_source(source):
+    """Camera sources are device indices, video files or stream URLs"""
+    if isinstance(source, str) and source.strip().isdigit():
+        return int(source)
+    return source
+
+
+def run_session(service, session_id, events, sessions, lock):
+    """
+    Session thread: waits for the camera and models, then runs the pipeline.
+    Readiness is awaited here rather than in the command loop, so a slow camera
+    open does not hold up commands for the worker's other sessions.
+    """
+    try:
+        service.wait_until_ready()
+    except Exception as e:
+        with lock:
+            sessions.pop(session_id, None)
+        service.stop()
+        events.put(('error', session_id, str(e)))
+        return
+    if not service.is_running:
+        service.stop()   # Stopped while starting - release what finished loading since
+        return
+    events.put(('started', session_id, None))
+    service.run_conductor_interface()
+
+
+def camera_worker_main(commands, events):
+    """
+    Entry point of a camera worker process.
+    Hosts any number of headless sessions and reports back over `events`:
+    ('started' | 'stopped' | 'error' | 'report' | 'gesture_command', session_id, payload)
+    """
+    from .emotion_monitor import ConductorOrchestrationService
+
+    sessions = {}
+    lock = threading.Lock()   # Session threads remove sessions that failed to start
+    while True:
+        try:
+            message = commands.get(timeout=REPORT_INTERVAL)
+        except queue.Empty:
+            message = None
+
+        if message is not None:
+            kind, session_id, payload = message
+            if kind == 'shutdown':
+                break
+
+            if kind == 'start':
+                try:
+                    service = ConductorOrchestrationService(source=payload, headless=True, session_id=session_id)
+                except Exception as e:
+                    events.put(('error', session_id, str(e)))
+                    continue
+                # Gesture commands act on workflows, which live in the parent process
+                service.command_sink = lambda command, sid=session_id: events.put(('gesture_command', sid, command))
+                # The camera and models load in parallel; a bad source is reported by the session thread
+                thread = threading.Thread(target=run_session, args=(service, session_id, events, sessions, lock),
+                                          name=f'session-{session_id}', daemon=True)
+                with lock:
+                    sessions[session_id] = (service, thread)
+                thread.start()
+
+            elif kind == 'stop':
+                with lock:
+                    entry = sessions.pop(session_id, None)
+                if entry is not None:
+                    service, thread = entry
+                    service.stop()
+                    thread.join(2.0)
+                    events.put(('stopped', session_id, None))
+
+            elif kind in ('start_monitoring', 'start_recording', 'stop_recording'):
+                with lock:
+                    entry = sessions.get(session_id)
+                if entry is not None:
+                    service = entry[0]
+                    if kind == 'start_monitoring':
+                        service.start_orchestration_session()
+                    elif kind == 'start_recording':
+                        service.start_recording(payload)
+                    else:
+                        service.stop_recording()
+
+        with lock:
+            running = list(sessions.items())
+        for session_id, (service, _) in running:
+            events.put(('report', session_id, {
+                'engagement': service.get_engagement_report(),
+                'is_monitoring': service.is_monitoring,
+                'pipeline': service.pipeline.get_stats() if service.pipeline else None,
+                'recording': service.get_recording_status(),
+                'presence': service.get_presence_status(),
+                'updated_at': time.time()
+            }))
+        if sessions:
+            events.put(('metrics', None, REGISTRY.export(WORKER_METRICS)))
+
+    with lock:
+        running = list(sessions.values())
+    for service, thread in running:
+        service.stop()
+        thread.join(2.0)
+
+
+class CameraSessionManager:
+    """
+    Runs camera sessions in a pool of worker processes sized to the available
+    cores. Each session has its own capture, pipeline, models and engagement
+    state; sessions are placed on the least loaded worker.
+    """
+
+    def __init__(self, max_workers=None, on_gesture_command=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.on_gesture_command = on_gesture_command
+
+        self.context = multiprocessing.get_context('spawn')
+        self.events = self.context.Queue()
+        self.workers = []      # [{'process', 'commands', 'sessions': set()}]
+        self.sessions = {}     # session_id -> session info
+        self.lock = threading.Lock()
+        self.event_thread = None
+
+    def create_session(self, session_id, source):
+        """Start a camera session on the least loaded worker"""
+        # Session ids become recording directory names
+        if not is_valid_session_id(session_id):
+            raise ValueError(f"Invalid session id: {session_id!r}")
+        with self.lock:
+            if session_id in self.sessions:
+                raise ValueError(f"Session {session_id} already exists")
+
+            worker = self.pick_worker()
+            worker['sessions'].add(session_id)
+            self.sessions[session_id] = {
+                'session_id': session_id,
+                'source': source,
+                'worker': worker,
+                'status': 'starting',
+                'error': None,
+                'report': None,
+                'created_at': time.time()
+            }
+            worker['commands'].put(('start', session_id, parse_source(source)))
+
+        self.ensure_event_thread()
+        return self.describe(session_id)
+
+    def pick_worker(self):
+        idle = min(self.workers, key=lambda w: len(w['sessions']), default=None)
+        if idle is not None and (not idle['sessions'] or len(self.workers) >= self.max_workers):
+            return idle
+
+        commands = self.context.Queue()
+        process = self.context.Process(target=camera_worker_main, args=(commands, self.events),
+                                       name=f'camera-worker-{len(self.workers)}', daemon=True)
+        process.start()
+        worker = {'process': process, 'commands': commands, 'sessions': set()}
+        self.workers.append(worker)
+        return worker
+
+    def stop_session(self, session_id):
+        """Stop and forget a session"""
+        with self.lock:
+            session = self.sessions.pop(session_id, None)
+            if session is None:
+                return False
+            session['worker']['sessions'].discard(session_id)
+            session['worker']['commands'].put(('stop', session_id, None))
+        return True
+
+    def start_monitoring(self, session_id):
+        """Start an orchestration session on a camera"""
+        session = self.sessions.get(session_id)
+        if session is None:
+            return False
+        session['worker']['commands'].put(('start_monitoring', session_id, None))
+        return True
+
+    def start_recording(self, session_id, root):
+        """Start recording a session's processed frames under `root`"""
+        session = self.sessions.get(session_id)
+        if session is None:
+            return False
+        session['worker']['commands'].put(('start_recording', session_id, root))
+        return True
+
+    def stop_recording(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            return False
+        session['worker']['commands'].put(('stop_recording', session_id, None))
+        return True
+
+    def get_report(self, session_id):
+        """Latest report published by the session's worker, or None"""
+        session = self.sessions.get(session_id)
+        return session['report'] if session else None
+
+    def describe(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            return None
+        return {
+            'session_id': session_id,
+            'source': session['source'],
+            'status': session['status'],
+            'error': session['error'],
+            'worker': session['worker']['process'].name,
+            'is_monitoring': bool(session['report'] and session['report']['is_monitoring']),
+            'presence': session['report']['presence'] if session['report'] else None
+        }
+
+    def list_sessions(self):
+        return [self.describe(session_id) for session_id in list(self.sessions)]
+
+    def ensure_event_thread(self):
+        if self.event_thread is None:
+            self.event_thread = threading.Thread(target=self.process_events, name='session-events', daemon=True)
+            self.event_thread.start()
+
+    def process_events(self):
+        """Apply worker events to session state"""
+        while True:
+            kind, session_id, payload = self.events.get()
+            if kind == 'shutdown':
+                break
+            if kind == 'metrics':
+                REGISTRY.load(payload)
+                continue
+
+            session = self.sessions.get(session_id)
+            if session is None:
+                continue
+
+            if kind == 'report':
+                session['report'] = payload
+            elif kind == 'started':
+                session['status'] = 'running'
+            elif kind == 'error':
+                session['status'] = 'failed'
+                session['error'] = payload
+                session['worker']['sessions'].discard(session_id)
+                logger.error(f"Camera session {session_id} failed: {payload}")
+            elif kind == 'gesture_command' and self.on_gesture_command is not None:
+                try:
+                    self.on_gesture_command(session_id, payload)
+                except Exception as e:
+                    logger.error(f"Gesture command from session {session_id} failed: {e}")
+
+    def shutdown(self):
+        """Stop all sessions and worker processes"""
+        with self.lock:
+            for worker in self.workers:
+                worker['commands'].put(('shutdown', None, None))
+            for worker in self.workers:
+                worker['process'].join(5.0)
+            self.workers = []
+            self.sessions = {}
+        if self.event_thread is not None:
+            self.events.put(('shutdown', None, None))
+            self.event_thread.join(2.0)
+            self.event_thread = None
@@ -0,0 +1,122 @@
+# startup.py
+import logging
+import threading
+import time
+
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+LOADING = 'loading'
+READY = 'ready'
+FAILED = 'failed'
+
+
+class Component:
+    """One lazily initialized dependency (camera, model, worker pool) and its readiness"""
+
+    def __init__(self, name, load):
+        self.name = name
+        self.load = load
+        self.status = PENDING
+        self.value = None
+        self.error = None
+        self.load_seconds = None
+        self.done = threading.Event()
+
+    def describe(self):
+        return {
+            'status': self.status,
+            'error': self.error,
+            'load_seconds': self.load_seconds
+        }
+
+
+class ComponentLoader:
+    """
+    Initializes independent components concurrently, each on its own thread.
+    Loading starts on first use (or start()); callers block only on the
+    component they need, and a failed component is reported rather than
+    taking the whole process down.
+    """
+
+    def __init__(self):
+        self.components = {}
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)   # Notified whenever a load finishes
+
+    def register(self, name, load):
+        self.components[name] = Component(name, load)
+
+    def start(self, *names):
+        """Begin loading the named components (all if none given) in the background"""
+        with self.lock:
+            for name in names or list(self.components):
+                component = self.components[name]
+                if component.status != PENDING:
+                    continue
+                component.status = LOADING
+                threading.Thread(target=self._load, args=(component,), name=f'load-{name}', daemon=True).start()
+
+    def retry(self, *names):
+        """Reset failed components (all if none given) to pending and load them again"""
+        with self.lock:
+            for name in names or list(self.components):
+                component = self.components[name]
+                if component.status != FAILED:
+                    continue
+                component.status = PENDING
+                component.error = None
+                component.done = threading.Event()
+        self.start(*names)
+
+    def _load(self, component):
+        started = time.perf_counter()
+        try:
+            component.value = component.load()
+            component.status = READY
+        except Exception as e:
+            component.error = str(e)
+            component.status = FAILED
+            logger.error(f"Failed to initialize {component.name}: {e}")
+        component.load_seconds = time.perf_counter() - started
+        component.done.set()
+        with self.changed:
+            self.changed.notify_all()
+
+    def get(self, name, timeout=None):
+        """Value of a component, loading it if needed; raises RuntimeError if it failed or timed out"""
+        component = self.components[name]
+        if component.status == READY:
+            return component.value
+        self.start(name)
+        if not component.done.wait(timeout):
+            raise RuntimeError(f"{name} is still initializing")
+        if component.status == FAILED:
+            raise RuntimeError(component.error)
+        return component.value
+
+    def wait_ready(self, name, timeout=None):
+        """Block until a component is ready, across failed loads and retries; returns whether it is"""
+        component = self.components[name]
+        with self.changed:
+            return self.changed.wait_for(lambda: component.status == READY, timeout)
+
+    def peek(self, name):
+        """Value of a component if it is ready, without waiting or starting it"""
+        component = self.components[name]
+        return component.value if component.status == READY else None
+
+    def wait_all(self, timeout=None):
+        """Load everything; raises RuntimeError naming the first component that failed"""
+        self.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for name in self.components:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            self.get(name, remaining)
+
+    def is_ready(self):
+        return all(component.status == READY for component in self.components.values())
+
+    def describe(self):
+        return {name: component.describe() for name, component in self.components.items()}
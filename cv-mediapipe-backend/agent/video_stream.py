@@ -0,0 +1,158 @@
+# video_stream.py
+import threading
+import time
+
+import cv2
+
+from .metrics import STAGE_SECONDS, FRAMES_TOTAL
+
+
+DEFAULT_QUALITY = 70
+MJPEG_BOUNDARY = 'frame'
+
+
+def quality_level(quality):
+    """Snap a requested JPEG quality to a multiple of 10 so clients share encodes"""
+    return min(90, max(30, int(round(quality / 10.0)) * 10))
+
+
+class StreamSubscriber:
+    """One viewer; holds only the newest encoded frame, so a slow client skips frames instead of buffering"""
+
+    def __init__(self, quality):
+        self.quality = quality
+        self.condition = threading.Condition()
+        self.jpeg = None
+        self.seq = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.closed = False
+
+    def publish(self, seq, jpeg):
+        with self.condition:
+            if self.jpeg is not None and self.delivered < self.seq:
+                self.dropped += 1
+            self.seq = seq
+            self.jpeg = jpeg
+            self.condition.notify()
+
+    def next_frame(self, timeout=1.0):
+        """Wait for a frame newer than the last one returned; None on timeout or once closed"""
+        with self.condition:
+            if self.delivered >= self.seq and not self.closed:
+                self.condition.wait(timeout)
+            if self.closed or self.delivered >= self.seq:
+                return None
+            self.delivered = self.seq
+            return self.jpeg
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+
+
+class FrameBroadcaster:
+    """
+    Fans annotated frames of a service out to any number of stream viewers.
+    Frames are JPEG-encoded on a dedicated thread, at most once per quality
+    level. The broadcaster is attached to the service as a frame consumer only
+    while someone is watching, so with no viewers nothing is drawn or encoded.
+    """
+
+    def __init__(self, service):
+        self.service = service
+        self.subscribers = []
+        self.condition = threading.Condition()
+        self.pending = None      # Newest frame not yet encoded
+        self.seq = 0
+        self.thread = None
+
+    def subscribe(self, quality=DEFAULT_QUALITY):
+        subscriber = StreamSubscriber(quality_level(quality))
+        with self.condition:
+            self.subscribers = self.subscribers + [subscriber]
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._encode_loop, name='stream-encoder', daemon=True)
+                self.thread.start()
+                self.service.add_frame_consumer(self.on_frame)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        subscriber.close()
+        with self.condition:
+            self.subscribers = [s for s in self.subscribers if s is not subscriber]
+            if not self.subscribers and self.thread is not None:
+                self.service.remove_frame_consumer(self.on_frame)
+                self.thread = None
+                if self.pending is not None:
+                    self.service.frame_buffers.release(self.pending)
+                    self.pending = None
+                self.condition.notify()
+
+    def on_frame(self, frame, interaction_data):
+        """Frame consumer - runs on the render thread, so it only hands the frame over"""
+        buffers = self.service.frame_buffers
+        with self.condition:
+            if self.thread is None:
+                # Stopped - the render thread called us from a consumer list taken before the last viewer left
+                return
+            # The frame is a pooled buffer; keep it out of the pool until it has been encoded
+            buffers.retain(frame)
+            replaced, self.pending = self.pending, frame
+            self.condition.notify()
+        if replaced is not None:
+            buffers.release(replaced)
+
+    def _encode_loop(self):
+        current = threading.current_thread()
+        while True:
+            with self.condition:
+                while self.pending is None and self.thread is current:
+                    self.condition.wait()
+                if self.thread is not current:
+                    return
+                frame, self.pending = self.pending, None
+                self.seq += 1
+                seq = self.seq
+                subscribers = self.subscribers
+
+            encoded = {}
+            for subscriber in subscribers:
+                jpeg = encoded.get(subscriber.quality)
+                if jpeg is None:
+                    started = time.perf_counter()
+                    ok, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, subscriber.quality])
+                    STAGE_SECONDS.observe(time.perf_counter() - started, self.service.session_id, 'encode')
+                    if not ok:
+                        continue
+                    jpeg = encoded[subscriber.quality] = buffer.tobytes()
+                    FRAMES_TOTAL.inc(self.service.session_id, 'encode')
+                subscriber.publish(seq, jpeg)
+            self.service.frame_buffers.release(frame)
+
+    def mjpeg_stream(self, quality=DEFAULT_QUALITY):
+        """Generator of multipart/x-mixed-replace parts; unsubscribes when the client goes away"""
+        subscriber = self.subscribe(quality)
+        last = b''
+        try:
+            while True:
+                jpeg = subscriber.next_frame(timeout=1.0)
+                if jpeg is None:
+                    # Nothing new (paused capture, stalled camera): re-send the last frame, or an empty
+                    # part before the first one, so the write fails and we notice a client that left
+                    jpeg = last
+                last = jpeg
+                yield (f'--{MJPEG_BOUNDARY}\r\nContent-Type: image/jpeg\r\n'
+                       f'Content-Length: {len(jpeg)}\r\n\r\n').encode() + jpeg + b'\r\n'
+        finally:
+            self.unsubscribe(subscriber)
+
+    def get_stats(self):
+        subscribers = self.subscribers
+        return {
+            'subscribers': len(subscribers),
+            'quality_levels': sorted({s.quality for s in subscribers}),
+            'frames_streamed': self.seq,
+            'frames_dropped': sum(s.dropped for s in subscribers)
+        }
@@ -0,0 +1,340 @@
+# workflow_executor.py
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .execution_queue import ExecutionQueue, DEFAULT_PRIORITY
+from .metrics import WORKFLOW_QUEUE_WAIT_SECONDS
+from .scheduler import TimerScheduler
+
+
+logger = logging.getLogger(__name__)
+
+STEP_PENDING = 'pending'
+STEP_RUNNING = 'running'
+STEP_SUCCEEDED = 'succeeded'
+STEP_FAILED = 'failed'
+STEP_TIMED_OUT = 'timed_out'
+STEP_SKIPPED = 'skipped'       # A dependency did not succeed
+STEP_CANCELLED = 'cancelled'   # The workflow stopped (timeout, cancel) before the step started
+STEP_DONE = (STEP_SUCCEEDED, STEP_FAILED, STEP_TIMED_OUT, STEP_SKIPPED, STEP_CANCELLED)
+
+DEFAULT_STEP_TIMEOUT = 30.0
+
+
+def step_dependencies(steps):
+    """
+    Dependency sets (step indices) of each step. `depends_on` may name steps by
+    'id' or by index. Raises ValueError on unknown references and cycles.
+    """
+    ids = {}
+    for index, step in enumerate(steps):
+        if not isinstance(step, dict):
+            raise ValueError(f"Step {index} must be an object")
+        if 'id' in step:
+            if step['id'] in ids:
+                raise ValueError(f"Duplicate step id: {step['id']}")
+            ids[step['id']] = index
+
+    dependencies = []
+    for index, step in enumerate(steps):
+        depends_on = step.get('depends_on', [])
+        if not isinstance(depends_on, list):
+            depends_on = [depends_on]
+        required = set()
+        for reference in depends_on:
+            if reference in ids:
+                required.add(ids[reference])
+            elif isinstance(reference, int) and 0 <= reference < len(steps):
+                required.add(reference)
+            else:
+                raise ValueError(f"Step {step.get('id', index)} depends on unknown step: {reference}")
+        if index in required:
+            raise ValueError(f"Step {step.get('id', index)} depends on itself")
+        dependencies.append(required)
+
+    # Kahn's algorithm - anything left over is part of a cycle
+    remaining = [len(required) for required in dependencies]
+    ready = [index for index, count in enumerate(remaining) if count == 0]
+    visited = 0
+    while ready:
+        index = ready.pop()
+        visited += 1
+        for other, required in enumerate(dependencies):
+            if index in required:
+                remaining[other] -= 1
+                if remaining[other] == 0:
+                    ready.append(other)
+    if visited != len(steps):
+        raise ValueError("Workflow steps contain a dependency cycle")
+    return dependencies
+
+
+class WorkflowRun:
+    """Execution state of one workflow run; owned by the executor's dispatch thread"""
+
+    def __init__(self, workflow, resume=False):
+        self.workflow = workflow
+        self.workflow_id = workflow['id']
+        self.steps = workflow['steps']
+        self.dependencies = step_dependencies(self.steps)
+        self.dependents = [[] for _ in self.steps]
+        for index, required in enumerate(self.dependencies):
+            for dependency in required:
+                self.dependents[dependency].append(index)
+        self.results = [{
+            'step': step.get('id', index),
+            'platform': step.get('platform'),
+            'action': step.get('action'),
+            'status': STEP_PENDING,
+            'result': None,
+            'error': None,
+            'started_at': None,
+            'finished_at': None
+        } for index, step in enumerate(self.steps)]
+        if resume:
+            # Keep steps that already succeeded (e.g. before a restart); everything else runs again
+            previous = workflow.get('step_results') or []
+            if len(previous) == len(self.results):
+                for record, old in zip(self.results, previous):
+                    if old['status'] == STEP_SUCCEEDED:
+                        record.update(old)
+        self.started_at = time.time()
+        workflow['step_results'] = self.results
+        self.update_progress()
+
+    def ready_steps(self):
+        """Pending steps whose dependencies all succeeded"""
+        return [
+            index for index, result in enumerate(self.results)
+            if result['status'] == STEP_PENDING and
+            all(self.results[d]['status'] == STEP_SUCCEEDED for d in self.dependencies[index])
+        ]
+
+    def finish_step(self, index, status, result=None, error=None):
+        """Record a step outcome; returns False if the step had already finished (e.g. timed out)"""
+        record = self.results[index]
+        if record['status'] in STEP_DONE:
+            return False
+        record.update(status=status, result=result, error=error, finished_at=time.time())
+        if status != STEP_SUCCEEDED:
+            self.skip_dependents(index)
+        self.update_progress()
+        return True
+
+    def skip_dependents(self, index):
+        failed = self.results[index]
+        for dependent in self.dependents[index]:
+            record = self.results[dependent]
+            if record['status'] == STEP_PENDING:
+                record.update(status=STEP_SKIPPED, error=f"Dependency {failed['step']} {failed['status']}",
+                              finished_at=time.time())
+                self.skip_dependents(dependent)
+
+    def cancel_pending(self, reason):
+        for record in self.results:
+            if record['status'] == STEP_PENDING:
+                record.update(status=STEP_CANCELLED, error=reason, finished_at=time.time())
+        self.update_progress()
+
+    def update_progress(self):
+        finished = sum(1 for record in self.results if record['status'] in STEP_DONE)
+        self.workflow['progress'] = finished / len(self.results) if self.results else 1.0
+
+    def is_finished(self):
+        return all(record['status'] in STEP_DONE for record in self.results)
+
+    def is_idle(self):
+        return not any(record['status'] == STEP_RUNNING for record in self.results)
+
+    def succeeded(self):
+        return all(record['status'] == STEP_SUCCEEDED for record in self.results)
+
+
+class WorkflowExecutor:
+    """
+    Runs workflow steps through the engine's platform adapters.
+    One dispatch thread blocks on an event queue (submissions, step completions,
+    timeouts, resumes) and starts every step whose dependencies have succeeded
+    on a bounded thread pool, so independent steps run in parallel. A step that
+    exceeds its timeout is recorded as timed out and its dependents skipped; the
+    adapter call itself cannot be interrupted and its late result is ignored.
+    New executions are admitted through a bounded priority queue and start
+    once fewer than `max_running` runs are active (paused runs keep their slot).
+    """
+
+    def __init__(self, engine, workers=4, step_timeout=DEFAULT_STEP_TIMEOUT, scheduler=None, on_finished=None,
+                 on_progress=None, max_running=8, queue_capacity=100, on_start=None):
+        self.engine = engine
+        self.workers = workers
+        self.step_timeout = step_timeout
+        # An idle TimerScheduler is falsy (it defines __len__), so test for None explicitly
+        self.scheduler = scheduler if scheduler is not None else TimerScheduler(name='workflow-timeouts')
+        # Called with (workflow, final status) when a run ends; by default the status is just assigned
+        self.on_finished = on_finished
+        self.on_progress = on_progress   # Called with the workflow after its step results changed
+        # Called with (workflow, seconds queued) before a queued execution starts; False drops it
+        self.on_start = on_start
+        self.max_running = max_running
+        self.queue = ExecutionQueue(capacity=queue_capacity)
+        self.events = queue.Queue()
+        self.runs = {}                   # workflow id -> active WorkflowRun
+        self.pool = None
+        self.thread = None
+        self.lock = threading.Lock()
+        self.steps_started = 0
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='workflow-step')
+                self.thread = threading.Thread(target=self._dispatch_loop, name='workflow-executor', daemon=True)
+                self.thread.start()
+
+    def submit(self, workflow, resume=False):
+        """
+        Start running a workflow's steps; an active run of the same workflow is
+        resumed instead. With `resume`, steps recorded as succeeded are not run again.
+        """
+        self.start()
+        self.events.put(('submit', workflow, resume))
+
+    def enqueue(self, workflow, priority=DEFAULT_PRIORITY, force=False):
+        """
+        Admit a new execution; it starts when a slot is free, higher priorities
+        first. Raises ExecutionQueueFull when its priority's share of the queue is used up.
+        """
+        self.queue.put(workflow, priority, force=force)
+        self.start()
+        self.events.put(('admit', None, None))
+
+    def wake(self, workflow_id):
+        """Re-check a workflow after its status changed (resumed, paused, timed out, cancelled)"""
+        if self.thread is not None:
+            self.events.put(('wake', workflow_id, None))
+
+    def stop(self):
+        if self.thread is None:
+            return
+        self.events.put(('stop', None, None))
+        self.thread.join(2.0)
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.thread = None
+
+    def _dispatch_loop(self):
+        while True:
+            kind, key, payload = self.events.get()
+            if kind == 'stop':
+                break
+            try:
+                run = self.handle_event(kind, key, payload)
+                if run is not None:
+                    self.advance(run)
+                    if self.on_progress is not None and kind != 'wake':
+                        self.on_progress(run.workflow)
+                self.start_queued()
+            except Exception as e:
+                logger.error(f"Workflow executor error on {kind}: {e}")
+
+    def start_queued(self):
+        """Start queued executions while there are free slots"""
+        while len(self.runs) < self.max_running:
+            entry = self.queue.pop()
+            if entry is None:
+                return
+            priority, queued_at, workflow = entry
+            waited = time.time() - queued_at
+            WORKFLOW_QUEUE_WAIT_SECONDS.observe(waited, priority)
+            if self.on_start is not None and not self.on_start(workflow, waited):
+                continue
+            run = self.handle_event('submit', workflow, False)
+            if run is not None:
+                self.advance(run)
+                if self.on_progress is not None:
+                    self.on_progress(workflow)
+
+    def handle_event(self, kind, key, payload):
+        if kind == 'submit':
+            run = self.runs.get(key['id'])
+            if run is None:
+                try:
+                    run = WorkflowRun(key, resume=payload)
+                except ValueError as e:
+                    key['error'] = str(e)
+                    self.finish(key, 'failed')
+                    return None
+                self.runs[key['id']] = run
+            return run
+
+        if kind == 'wake':
+            return self.runs.get(key)
+        if kind == 'admit':
+            return None
+
+        # 'done' and 'timeout' carry the run itself, so events of a finished run are dropped
+        run = key
+        if self.runs.get(run.workflow_id) is not run:
+            return None
+        index = payload[0]
+        if kind == 'done':
+            result, error = payload[1], payload[2]
+            self.scheduler.cancel(('step_timeout', id(run), index))
+            run.finish_step(index, STEP_SUCCEEDED if error is None else STEP_FAILED, result, error)
+        elif kind == 'timeout':
+            run.finish_step(index, STEP_TIMED_OUT, error=f"Step timed out after {payload[1]}s")
+        return run
+
+    def advance(self, run):
+        """Start ready steps, or finish the run"""
+        status = run.workflow['status']
+        if status == 'running':
+            for index in run.ready_steps():
+                self.start_step(run, index)
+        elif status != 'paused':
+            # Timed out or cancelled - nothing new starts; running steps are left to finish
+            run.cancel_pending(f"Workflow {status}")
+
+        if run.is_finished() or (status not in ('running', 'paused') and run.is_idle()):
+            del self.runs[run.workflow_id]
+            if status in ('running', 'paused'):
+                status = 'completed' if run.succeeded() else 'failed'
+            self.finish(run.workflow, status)
+
+    def finish(self, workflow, status):
+        if self.on_finished is not None:
+            self.on_finished(workflow, status)
+        else:
+            workflow['status'] = status
+
+    def start_step(self, run, index):
+        step = run.steps[index]
+        timeout = step.get('timeout', self.step_timeout)
+        run.results[index].update(status=STEP_RUNNING, started_at=time.time())
+        self.steps_started += 1
+        if timeout:
+            self.scheduler.schedule(timeout, self.events.put, ('timeout', run, (index, timeout)),
+                                    key=('step_timeout', id(run), index))
+        future = self.pool.submit(self.execute_step, step)
+        future.add_done_callback(lambda done: self.events.put(('done', run, (index,) + done.result())))
+
+    def execute_step(self, step):
+        """Runs on a pool thread; returns (result, error)"""
+        try:
+            result = self.engine.execute_step(step)
+        except Exception as e:
+            return None, str(e)
+        if isinstance(result, dict) and not result.get('success', True):
+            return result, result.get('error') or 'Step failed'
+        return result, None
+
+    def get_stats(self):
+        return {
+            'workers': self.workers,
+            'active_runs': len(self.runs),
+            'max_running': self.max_running,
+            'queue': self.queue.get_stats(),
+            'queued_events': self.events.qsize(),
+            'steps_started': self.steps_started
+        }
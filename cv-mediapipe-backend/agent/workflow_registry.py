@@ -0,0 +1,208 @@
+# workflow_registry.py
+import threading
+from itertools import islice
+from types import MappingProxyType
+
+
+def copy_workflow(workflow):
+    """Copy of a workflow record that shares no lists or dicts (step results, platforms) with it"""
+    copied = {}
+    for key, value in list(workflow.items()):
+        if isinstance(value, list):
+            value = [dict(item) if isinstance(item, dict) else item for item in list(value)]
+        elif isinstance(value, dict):
+            value = dict(value)
+        copied[key] = value
+    return copied
+
+
+class RegistrySnapshot:
+    """Immutable view of the registry at one point in time"""
+    __slots__ = ('workflows', 'by_status', 'counts')
+
+    def __init__(self, workflows, by_status, counts):
+        self.workflows = workflows   # id -> copy of the workflow, in creation order
+        self.by_status = by_status   # status -> tuple of ids, in the order they entered the status
+        self.counts = counts         # status -> number of workflows
+
+
+class WorkflowRegistry:
+    """
+    Workflows by id with a secondary index by status and per-status counters.
+    Writers serialize on a lock and only mark what changed, so a write is O(1).
+    Readers use a snapshot of copied records and never lock unless it is stale;
+    the first read after a batch of writes rebuilds it, copying the changed
+    records and the id map (references only), so the O(n) part is paid at most
+    once per batch rather than once per write.
+    Status changes must go through set_status() so the index stays in step.
+    Other fields are changed on the live record from record(), followed by
+    touch() so readers see them.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.workflows = {}   # id -> live record, owned by the writers
+        self.by_status = {}   # status -> {id: None}, an insertion-ordered set
+        self.copies = {}      # id -> record as last published
+        self.dirty = {}       # Ids whose published copy is out of date, in the order they changed
+        self.dirty_statuses = set()
+        self.stale = False
+        self.snapshot = RegistrySnapshot(MappingProxyType({}), MappingProxyType({}), MappingProxyType({}))
+        # Called with (workflow, old status, new status) after every change, outside the lock
+        self.on_status_change = None
+
+    # Writers
+
+    def add(self, workflow):
+        """Register a workflow (replacing one with the same id)"""
+        self.add_many([workflow])
+
+    def add_many(self, workflows):
+        """Register several workflows in one batch, e.g. when restoring from the store"""
+        with self.lock:
+            for workflow in workflows:
+                workflow_id = workflow['id']
+                previous = self.workflows.pop(workflow_id, None)
+                if previous is not None:
+                    self.by_status[previous['status']].pop(workflow_id, None)
+                    self.copies.pop(workflow_id, None)
+                    self.dirty_statuses.add(previous['status'])
+                self.workflows[workflow_id] = workflow
+                self.by_status.setdefault(workflow['status'], {})[workflow_id] = None
+                self.mark(workflow_id, workflow['status'])
+
+    def remove(self, workflow_id):
+        with self.lock:
+            workflow = self.workflows.pop(workflow_id, None)
+            if workflow is None:
+                return None
+            self.by_status[workflow['status']].pop(workflow_id, None)
+            self.mark(workflow_id, workflow['status'])
+            return workflow
+
+    def set_status(self, workflow_id, status, expected=None):
+        """
+        Move a workflow to `status`. With `expected`, only if its current status is
+        one of those (compare-and-set). Returns whether the status was changed.
+        """
+        with self.lock:
+            workflow = self.workflows.get(workflow_id)
+            if workflow is None:
+                return False
+            current = workflow['status']
+            if expected is not None and current not in expected:
+                return False
+            if current == status:
+                return True
+            self.by_status[current].pop(workflow_id, None)
+            # Ids are re-inserted, so each status lists workflows in the order they entered it
+            self.by_status.setdefault(status, {})[workflow_id] = None
+            workflow['status'] = status
+            self.dirty_statuses.add(current)
+            self.mark(workflow_id, status)
+        if self.on_status_change is not None:
+            self.on_status_change(workflow, current, status)
+        return True
+
+    def touch(self, workflow_id):
+        """Publish changes made to a live record (progress, step results, ...) with the next snapshot"""
+        with self.lock:
+            if workflow_id in self.workflows:
+                self.mark(workflow_id)
+
+    def record(self, workflow_id, default=None):
+        """The live record, for writers that change it in place - readers use get()"""
+        return self.workflows.get(workflow_id, default)
+
+    def mark(self, workflow_id, status=None):
+        """Note a change for the next snapshot (called with the lock held)"""
+        self.dirty[workflow_id] = None
+        if status is not None:
+            self.dirty_statuses.add(status)
+        self.stale = True
+
+    def current(self):
+        """The current snapshot, rebuilt first if there were writes since the last one"""
+        if self.stale:
+            with self.lock:
+                if self.stale:
+                    self.publish()
+        return self.snapshot
+
+    def publish(self):
+        """Build the next snapshot (called with the lock held)"""
+        previous = self.snapshot
+        for workflow_id in self.dirty:
+            workflow = self.workflows.get(workflow_id)
+            if workflow is None:
+                self.copies.pop(workflow_id, None)
+            else:
+                self.copies[workflow_id] = copy_workflow(workflow)
+        by_status = dict(previous.by_status)
+        counts = dict(previous.counts)
+        for status in self.dirty_statuses:
+            ids = self.by_status.get(status)
+            if ids:
+                by_status[status] = tuple(ids)
+                counts[status] = len(ids)
+            else:
+                by_status.pop(status, None)
+                counts.pop(status, None)
+        workflows = MappingProxyType(dict(self.copies)) if self.dirty else previous.workflows
+        self.snapshot = RegistrySnapshot(workflows, MappingProxyType(by_status), MappingProxyType(counts))
+        self.dirty.clear()
+        self.dirty_statuses.clear()
+        self.stale = False
+
+    # Readers - lock-free unless the snapshot is stale
+
+    def get(self, workflow_id, default=None):
+        return self.current().workflows.get(workflow_id, default)
+
+    def __getitem__(self, workflow_id):
+        return self.current().workflows[workflow_id]
+
+    def __contains__(self, workflow_id):
+        return workflow_id in self.current().workflows
+
+    def __len__(self):
+        return len(self.current().workflows)
+
+    def items(self):
+        return self.current().workflows.items()
+
+    def values(self):
+        return self.current().workflows.values()
+
+    def count(self, status=None):
+        snapshot = self.current()
+        if status is None:
+            return len(snapshot.workflows)
+        return snapshot.counts.get(status, 0)
+
+    def status_counts(self):
+        return dict(self.current().counts)
+
+    def first(self, status):
+        """The workflow that has been in `status` the longest, or None"""
+        snapshot = self.current()
+        ids = snapshot.by_status.get(status)
+        return snapshot.workflows.get(ids[0]) if ids else None
+
+    def list(self, statuses=None, platform=None, offset=0, limit=50, newest_first=False):
+        """
+        One page of workflows, optionally filtered by status (through the index,
+        grouped in the order given) and platform. Returns (workflows, total matching).
+        """
+        snapshot = self.current()
+        if statuses is None:
+            ids = snapshot.workflows
+        else:
+            ids = ()
+            for status in statuses:
+                ids += snapshot.by_status.get(status, ())
+        if platform is not None:
+            ids = tuple(i for i in ids if platform in snapshot.workflows[i]['platforms'])
+        ordered = reversed(ids) if newest_first else iter(ids)
+        stop = offset + limit if limit is not None else None
+        return [snapshot.workflows[i] for i in islice(ordered, offset, stop)], len(ids)
@@ -0,0 +1,246 @@
+# workflow_store.py
+"""
+SQLite persistence for workflows and their executions.
+
+The database runs in WAL mode so the write-behind thread never blocks readers.
+Creations are written immediately; status, progress and step results are
+coalesced per workflow and written in batches every `flush_interval` seconds
+(status changes trigger an early flush). On restart load_workflows() returns
+everything in one indexed scan so the registry can be rebuilt and running
+workflows resumed.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+
+logger = logging.getLogger(__name__)
+
+CROCKFORD = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+
+# Workflow keys with their own columns; everything else is kept in the JSON `config` column
+COLUMN_KEYS = ('id', 'name', 'status', 'progress', 'created_at', 'step_results', 'error', 'execution_id')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS workflows (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    execution_id TEXT,
+    error TEXT,
+    config TEXT NOT NULL,
+    step_results TEXT NOT NULL DEFAULT '[]'
+);
+CREATE INDEX IF NOT EXISTS workflows_status ON workflows (status);
+CREATE INDEX IF NOT EXISTS workflows_created_at ON workflows (created_at);
+CREATE TABLE IF NOT EXISTS executions (
+    id TEXT PRIMARY KEY,
+    workflow_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    step_results TEXT
+);
+CREATE INDEX IF NOT EXISTS executions_workflow ON executions (workflow_id, started_at);
+"""
+WORKFLOW_COLUMNS = 'id, name, status, progress, created_at, updated_at, execution_id, error, config, step_results'
+UPSERT_WORKFLOW = f"""
+INSERT INTO workflows ({WORKFLOW_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    name = excluded.name, status = excluded.status, progress = excluded.progress,
+    updated_at = excluded.updated_at, execution_id = excluded.execution_id, error = excluded.error,
+    config = excluded.config, step_results = excluded.step_results
+"""
+UPSERT_EXECUTION = """
+INSERT INTO executions (id, workflow_id, status, started_at, finished_at, step_results) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    status = excluded.status, started_at = excluded.started_at, finished_at = excluded.finished_at,
+    step_results = excluded.step_results
+"""
+
+
+class UlidGenerator:
+    """
+    ULID-style ids: 48-bit millisecond timestamp + 80 random bits in Crockford
+    base32. Ids created in the same millisecond increment the random part, so
+    they stay unique and sort in creation order.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.last_ms = -1
+        self.last_random = 0
+
+    def new(self):
+        with self.lock:
+            now_ms = int(time.time() * 1000)
+            if now_ms <= self.last_ms:
+                now_ms = self.last_ms
+                self.last_random = (self.last_random + 1) & ((1 << 80) - 1)
+            else:
+                self.last_random = int.from_bytes(os.urandom(10), 'big')
+            self.last_ms = now_ms
+            value = (now_ms << 80) | self.last_random
+        return ''.join(CROCKFORD[(value >> shift) & 31] for shift in range(125, -1, -5))
+
+
+ULIDS = UlidGenerator()
+
+
+def new_workflow_id():
+    return f"workflow_{ULIDS.new()}"
+
+
+def new_execution_id():
+    return f"exec_{ULIDS.new()}"
+
+
+class WorkflowStore:
+    """Durable workflow and execution records with batched write-behind"""
+
+    def __init__(self, path, flush_interval=0.5, batch_size=256):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')   # Durable at checkpoints; WAL keeps it consistent
+        self.conn.executescript(SCHEMA)
+        self.db_lock = threading.Lock()                   # One connection, used by request threads and the writer
+
+        self.pending = {}             # workflow id -> latest row
+        self.pending_executions = {}  # execution id -> latest row
+        self.condition = threading.Condition()
+        self.urgent = False
+        self.is_running = True
+        self.batches = 0
+        self.rows_written = 0
+        self.thread = threading.Thread(target=self._write_loop, name='workflow-store', daemon=True)
+        self.thread.start()
+
+    # Rows
+
+    def workflow_row(self, workflow):
+        created_at = workflow['created_at']
+        config = {key: value for key, value in workflow.items() if key not in COLUMN_KEYS}
+        return (
+            workflow['id'], workflow['name'], workflow['status'], workflow.get('progress', 0.0),
+            created_at.timestamp() if isinstance(created_at, datetime) else created_at, time.time(),
+            workflow.get('execution_id'), workflow.get('error'),
+            json.dumps(config, default=str), json.dumps(workflow.get('step_results', []), default=str)
+        )
+
+    def row_to_workflow(self, row):
+        (workflow_id, name, status, progress, created_at, _, execution_id, error, config, step_results) = row
+        workflow = json.loads(config)
+        workflow.update(
+            id=workflow_id, name=name, status=status, progress=progress,
+            created_at=datetime.fromtimestamp(created_at), step_results=json.loads(step_results)
+        )
+        if execution_id is not None:
+            workflow['execution_id'] = execution_id
+        if error is not None:
+            workflow['error'] = error
+        return workflow
+
+    # Writes
+
+    def create(self, workflow):
+        """Insert a new workflow and commit before returning"""
+        with self.db_lock:
+            self.conn.execute(UPSERT_WORKFLOW, self.workflow_row(workflow))
+
+    def save(self, workflow, urgent=False):
+        """Queue the workflow's current state; rows for the same workflow coalesce until the next batch"""
+        row = self.workflow_row(workflow)
+        with self.condition:
+            self.pending[workflow['id']] = row
+            if urgent or len(self.pending) >= self.batch_size:
+                self.urgent = True
+                self.condition.notify()
+
+    def save_execution(self, execution_id, workflow_id, status, started_at, finished_at=None, step_results=None):
+        row = (execution_id, workflow_id, status, started_at, finished_at,
+               json.dumps(step_results, default=str) if step_results is not None else None)
+        with self.condition:
+            self.pending_executions[execution_id] = row
+            self.urgent = True
+            self.condition.notify()
+
+    def _write_loop(self):
+        while True:
+            with self.condition:
+                if not self.urgent and self.is_running:
+                    self.condition.wait(self.flush_interval)
+                self.urgent = False
+                running = self.is_running
+            self.flush()
+            if not running:
+                break
+
+    def flush(self):
+        """Write everything queued in one transaction"""
+        # Holding the database lock while taking the queue keeps concurrent flushes in order
+        with self.db_lock:
+            with self.condition:
+                rows, self.pending = list(self.pending.values()), {}
+                executions, self.pending_executions = list(self.pending_executions.values()), {}
+            if not rows and not executions:
+                return
+            try:
+                self.conn.execute('BEGIN')
+                self.conn.executemany(UPSERT_WORKFLOW, rows)
+                self.conn.executemany(UPSERT_EXECUTION, executions)
+                self.conn.execute('COMMIT')
+                self.batches += 1
+                self.rows_written += len(rows) + len(executions)
+            except sqlite3.Error as e:
+                logger.error(f"Failed to write {len(rows)} workflow rows: {e}")
+                if self.conn.in_transaction:
+                    self.conn.execute('ROLLBACK')
+
+    # Reads
+
+    def load_workflows(self):
+        """All workflows in creation order, for rebuilding the registry on startup"""
+        with self.db_lock:
+            rows = self.conn.execute(f'SELECT {WORKFLOW_COLUMNS} FROM workflows ORDER BY created_at, id').fetchall()
+        return [self.row_to_workflow(row) for row in rows]
+
+    def list_executions(self, workflow_id, limit=20):
+        with self.db_lock:
+            rows = self.conn.execute(
+                'SELECT id, status, started_at, finished_at FROM executions '
+                'WHERE workflow_id = ? ORDER BY started_at DESC LIMIT ?', (workflow_id, limit)
+            ).fetchall()
+        return [
+            {'execution_id': row[0], 'status': row[1], 'started_at': row[2], 'finished_at': row[3]}
+            for row in rows
+        ]
+
+    def close(self):
+        """Flush pending writes and close the database"""
+        with self.condition:
+            self.is_running = False
+            self.condition.notify()
+        self.thread.join(5.0)
+        self.flush()
+        with self.db_lock:
+            self.conn.close()
+
+    def get_stats(self):
+        return {
+            'path': self.path,
+            'pending': len(self.pending),
+            'batches': self.batches,
+            'rows_written': self.rows_written
+        }
+
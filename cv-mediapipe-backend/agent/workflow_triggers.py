@@ -0,0 +1,411 @@
+# workflow_triggers.py
+import heapq
+import itertools
+import logging
+import math
+import re
+import threading
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta
+
+from .execution_queue import ExecutionQueueFull
+from .scheduler import TimerScheduler
+
+
+logger = logging.getLogger(__name__)
+
+MISFIRE_FIRE_ONCE = 'fire_once'   # Any number of missed fires runs the workflow once
+MISFIRE_CATCH_UP = 'catch_up'     # Every missed fire runs, up to max_catch_up, one after another
+MISFIRE_SKIP = 'skip'             # Missed fires are dropped; only a fire within the grace period runs
+MISFIRE_POLICIES = (MISFIRE_FIRE_ONCE, MISFIRE_CATCH_UP, MISFIRE_SKIP)
+
+DEFAULT_MISFIRE_GRACE = 60.0
+DEFAULT_MAX_CATCH_UP = 10
+MAX_TIMER_DELAY = 3600.0    # Long waits are re-armed, so wall clock changes are picked up within the hour
+MAX_SEARCH_DAYS = 366 * 5   # A cron expression that matches nothing in this span never fires
+
+CRON_ALIASES = {
+    '@yearly': '0 0 1 1 *',
+    '@annually': '0 0 1 1 *',
+    '@monthly': '0 0 1 * *',
+    '@weekly': '0 0 * * 0',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@hourly': '0 * * * *'
+}
+MONTH_NAMES = {name: index + 1 for index, name in enumerate(
+    ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'))}
+WEEKDAY_NAMES = {name: index for index, name in enumerate(('sun', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat'))}
+INTERVAL_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+INTERVAL_PATTERN = re.compile(r'(\d+)([smhd])')
+
+
+def parse_cron_field(text, low, high, names=None):
+    """Values of one cron field: '*', 'n', 'a-b', lists and '/step' (names allowed for months and weekdays)"""
+    def value(token):
+        token = token.strip()
+        if names and token in names:
+            return names[token]
+        if not token.isdigit():
+            raise ValueError(f"Invalid cron value: {token!r}")
+        return int(token)
+
+    values = set()
+    for part in text.lower().split(','):
+        expression, has_step, step = part.partition('/')
+        step = value(step) if has_step else 1
+        if expression == '*':
+            start, end = low, high
+        else:
+            first, has_range, last = expression.partition('-')
+            start = value(first)
+            end = value(last) if has_range else (high if has_step else start)
+        if not low <= start <= end <= high or step < 1:
+            raise ValueError(f"Cron field out of range {low}-{high}: {part!r}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """Standard five-field cron expression (minute hour day month weekday), in local time"""
+
+    def __init__(self, expression):
+        self.expression = expression
+        fields = CRON_ALIASES.get(expression.strip().lower(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+        self.minutes = sorted(parse_cron_field(fields[0], 0, 59))
+        self.hours = sorted(parse_cron_field(fields[1], 0, 23))
+        self.days = parse_cron_field(fields[2], 1, 31)
+        self.months = parse_cron_field(fields[3], 1, 12, MONTH_NAMES)
+        self.weekdays = {day % 7 for day in parse_cron_field(fields[4], 0, 7, WEEKDAY_NAMES)}   # 7 is Sunday too
+        # As in cron, a day and weekday that both restrict (do not start with '*') match either one;
+        # otherwise both must match, so '0 0 */2 * 1' is every other day that is also a Monday
+        self.days_or_weekdays = not fields[2].startswith('*') and not fields[4].startswith('*')
+
+    def day_matches(self, moment):
+        day = moment.day in self.days
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        return (day or weekday) if self.days_or_weekdays else (day and weekday)
+
+    def next_after(self, timestamp):
+        """First fire time strictly after `timestamp`, or None if the expression never matches"""
+        moment = datetime.fromtimestamp(timestamp).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=MAX_SEARCH_DAYS)
+        while moment < limit:
+            if moment.month not in self.months:
+                moment = (moment.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+                continue
+            if not self.day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            index = bisect_left(self.hours, moment.hour)
+            if index == len(self.hours):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if self.hours[index] != moment.hour:
+                moment = moment.replace(hour=self.hours[index], minute=0)
+            index = bisect_left(self.minutes, moment.minute)
+            if index == len(self.minutes):
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+                continue
+            return moment.replace(minute=self.minutes[index]).timestamp()
+        return None
+
+    def describe(self):
+        return self.expression
+
+
+class IntervalSchedule:
+    """Fires every `seconds`, aligned to `anchor` (the workflow's creation time)"""
+
+    def __init__(self, seconds, anchor):
+        if seconds < 1:
+            raise ValueError(f"Schedule interval must be at least 1 second: {seconds}")
+        self.seconds = seconds
+        self.anchor = anchor
+
+    @staticmethod
+    def parse_interval(text):
+        """Seconds in '90', '90s', '15m', '1h30m' or '2d'"""
+        text = str(text).strip().lower()
+        if text.isdigit():
+            return int(text)
+        parts = INTERVAL_PATTERN.findall(text)
+        if not parts or ''.join(number + unit for number, unit in parts) != text:
+            raise ValueError(f"Invalid schedule interval: {text!r}")
+        return sum(int(number) * INTERVAL_UNITS[unit] for number, unit in parts)
+
+    def next_after(self, timestamp):
+        periods = math.floor((timestamp - self.anchor) / self.seconds) + 1
+        return self.anchor + max(periods, 0) * self.seconds
+
+    def describe(self):
+        return f"@every {self.seconds}s"
+
+
+class WorkflowSchedule:
+    """When a workflow fires and what happens to fires that were missed"""
+
+    def __init__(self, timing, misfire=MISFIRE_FIRE_ONCE, misfire_grace=DEFAULT_MISFIRE_GRACE,
+                 max_catch_up=DEFAULT_MAX_CATCH_UP):
+        if misfire not in MISFIRE_POLICIES:
+            raise ValueError(f"Unknown misfire policy {misfire!r}, expected one of {', '.join(MISFIRE_POLICIES)}")
+        self.timing = timing
+        self.misfire = misfire
+        self.misfire_grace = float(misfire_grace)
+        self.max_catch_up = max(int(max_catch_up), 1)
+
+    def next_after(self, timestamp):
+        return self.timing.next_after(timestamp)
+
+    def upcoming(self, after, until=None):
+        """Fire times after `after` (up to `until`), lazily"""
+        fire = self.next_after(after)
+        while fire is not None and (until is None or fire <= until):
+            yield fire
+            fire = self.next_after(fire)
+
+    def describe(self):
+        return {
+            'expression': self.timing.describe(),
+            'misfire': self.misfire,
+            'misfire_grace': self.misfire_grace,
+            'max_catch_up': self.max_catch_up
+        }
+
+
+def parse_schedule(spec, anchor=None):
+    """
+    A workflow's `schedule`: a cron expression or alias ('*/5 * * * *', '@daily'),
+    '@every 15m', or an object with 'cron' or 'every' plus 'misfire',
+    'misfire_grace' and 'max_catch_up'. Returns None for no schedule; raises
+    ValueError for anything invalid or a schedule that never fires.
+    """
+    if not spec:
+        return None
+    options = {}
+    if isinstance(spec, dict):
+        options = {key: spec[key] for key in ('misfire', 'misfire_grace', 'max_catch_up') if key in spec}
+        if 'every' in spec:
+            spec = f"@every {spec['every']}"
+        elif 'cron' in spec:
+            spec = spec['cron']
+        else:
+            raise ValueError("Schedule object needs 'cron' or 'every'")
+    if not isinstance(spec, str):
+        raise ValueError(f"Invalid schedule: {spec!r}")
+
+    anchor = time.time() if anchor is None else anchor
+    if spec.strip().lower().startswith('@every'):
+        timing = IntervalSchedule(IntervalSchedule.parse_interval(spec.strip()[len('@every'):]), anchor)
+    else:
+        timing = CronSchedule(spec)
+    try:
+        schedule = WorkflowSchedule(timing, **options)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid schedule options: {e}")
+    if schedule.next_after(time.time()) is None:
+        raise ValueError(f"Schedule never fires: {spec!r}")
+    return schedule
+
+
+def parse_triggers(triggers):
+    """
+    A workflow's `triggers`: event names, or objects with an 'event' and
+    payload fields that must match, e.g. {'event': 'gesture', 'gesture': 'thumbs_up'}.
+    Returns a list of (event, filters); raises ValueError on malformed entries.
+    """
+    parsed = []
+    for trigger in triggers or []:
+        if isinstance(trigger, str):
+            trigger = {'event': trigger}
+        if not isinstance(trigger, dict) or not isinstance(trigger.get('event'), str) or not trigger['event']:
+            raise ValueError(f"Trigger needs an 'event' name: {trigger!r}")
+        filters = {key: value for key, value in trigger.items() if key != 'event'}
+        if any(isinstance(value, (dict, list)) for value in filters.values()):
+            raise ValueError(f"Trigger filters must be plain values: {trigger!r}")
+        parsed.append((trigger['event'], filters))
+    return parsed
+
+
+class ScheduledWorkflow:
+    """Trigger scheduler state of one scheduled workflow"""
+    __slots__ = ('workflow', 'schedule', 'next_fire', 'backlog')
+
+    def __init__(self, workflow, schedule, next_fire):
+        self.workflow = workflow
+        self.schedule = schedule
+        self.next_fire = next_fire   # Wall clock time of the next fire, None once it never fires again
+        self.backlog = 0             # Caught-up fires waiting for the current run to finish
+
+
+class WorkflowTriggerScheduler:
+    """
+    Starts workflows on their schedules and on events.
+    Each scheduled workflow has one keyed timer on the shared TimerScheduler
+    heap, so a fire costs O(log n) and nothing polls. Event triggers are
+    indexed by event name. A workflow runs once at a time: a fire while it is
+    running is dropped, except fires kept for catch-up, which run after it finishes.
+    """
+
+    def __init__(self, execute, timer=None, on_fired=None):
+        # Called with (workflow id, reason); returns an execution id, or None if the workflow is busy.
+        # May raise ExecutionQueueFull, after which caught-up fires are retried
+        self.execute = execute
+        self.timer = timer if timer is not None else TimerScheduler(name='workflow-triggers')
+        self.on_fired = on_fired   # Called with the workflow after 'last_fire_at' moved, to persist it
+        self.lock = threading.Lock()
+        self.scheduled = {}        # workflow id -> ScheduledWorkflow
+        self.event_triggers = {}   # event -> {workflow id: [filters]}
+        self.fired = 0
+        self.missed = 0
+        self.skipped = 0
+
+    def add(self, workflow):
+        """Register a workflow's schedule and triggers; a schedule resumes from its 'last_fire_at'"""
+        created_at = workflow['created_at']
+        created_at = created_at.timestamp() if isinstance(created_at, datetime) else created_at
+        schedule = parse_schedule(workflow.get('schedule'), anchor=created_at)
+        triggers = parse_triggers(workflow.get('triggers'))
+
+        with self.lock:
+            workflow_id = workflow['id']
+            for event, filters in triggers:
+                self.event_triggers.setdefault(event, {}).setdefault(workflow_id, []).append(filters)
+            if schedule is None:
+                return
+            # Fires due while the service was down are treated as misfires on the first timer
+            entry = ScheduledWorkflow(workflow, schedule, schedule.next_after(workflow.get('last_fire_at', created_at)))
+            self.scheduled[workflow_id] = entry
+            self.arm(entry)
+
+    def arm(self, entry):
+        if entry.next_fire is None:
+            return
+        delay = min(max(entry.next_fire - time.time(), 0.0), MAX_TIMER_DELAY)
+        self.timer.schedule(delay, self.on_timer, entry.workflow['id'], key=('workflow_schedule', entry.workflow['id']))
+
+    def on_timer(self, workflow_id):
+        """Timer callback - runs on the scheduler thread"""
+        now = time.time()
+        with self.lock:
+            entry = self.scheduled.get(workflow_id)
+            if entry is None or entry.next_fire is None:
+                return
+            if entry.next_fire > now:
+                # Capped delay, or the wall clock moved back
+                self.arm(entry)
+                return
+
+            schedule = entry.schedule
+            due = list(itertools.islice(schedule.upcoming(entry.next_fire - 1e-6, until=now), schedule.max_catch_up + 1))
+            if schedule.misfire == MISFIRE_CATCH_UP:
+                runs = min(len(due), schedule.max_catch_up)
+            elif schedule.misfire == MISFIRE_FIRE_ONCE:
+                runs = 1
+            else:
+                # Only a fire within the grace period counts
+                recent = schedule.next_after(now - schedule.misfire_grace)
+                runs = 1 if recent is not None and recent <= now else 0
+            self.missed += max(len(due) - runs, 0)
+            if len(due) > runs:
+                logger.warning(f"Workflow {workflow_id} missed {len(due) - runs}"
+                               f"{'+' if len(due) > schedule.max_catch_up else ''} scheduled runs "
+                               f"({schedule.misfire})")
+
+            entry.backlog += runs
+            entry.next_fire = schedule.next_after(now)
+            entry.workflow['last_fire_at'] = now
+            self.arm(entry)
+
+        if self.on_fired is not None:
+            self.on_fired(entry.workflow)
+        self.dispatch(entry)
+
+    def dispatch(self, entry):
+        """Start the workflow for one waiting fire, unless it is still running"""
+        with self.lock:
+            if entry.backlog == 0:
+                return
+            entry.backlog -= 1
+        workflow_id = entry.workflow['id']
+        try:
+            execution_id = self.execute(workflow_id, 'schedule')
+            retry_after = None
+        except ExecutionQueueFull as e:
+            execution_id = None
+            retry_after = e.retry_after
+        with self.lock:
+            if execution_id is not None:
+                self.fired += 1
+            elif entry.schedule.misfire != MISFIRE_CATCH_UP:
+                self.skipped += 1
+            else:
+                entry.backlog += 1
+                if retry_after is not None:
+                    # Never started, so no workflow_finished() will come - try again once the queue drains
+                    self.timer.schedule(retry_after, self.dispatch, entry, key=('workflow_dispatch', workflow_id))
+                # Otherwise it runs when the current run finishes
+
+    def workflow_finished(self, workflow_id):
+        """A run ended; start the next caught-up fire, if any"""
+        with self.lock:
+            entry = self.scheduled.get(workflow_id)
+        if entry is not None:
+            self.dispatch(entry)
+
+    def fire_event(self, event, payload=None):
+        """Start every workflow with a trigger matching this event; returns [(workflow id, execution id)]"""
+        payload = payload or {}
+        with self.lock:
+            candidates = [
+                workflow_id for workflow_id, filters in self.event_triggers.get(event, {}).items()
+                if any(all(payload.get(key) == value for key, value in match.items()) for match in filters)
+            ]
+        started = []
+        for workflow_id in candidates:
+            if payload.get('workflow_id') == workflow_id:
+                continue   # A workflow's own events never re-trigger it
+            try:
+                execution_id = self.execute(workflow_id, f"event:{event}")
+            except ExecutionQueueFull:
+                execution_id = None
+            with self.lock:
+                if execution_id is None:
+                    self.skipped += 1
+                else:
+                    self.fired += 1
+                    started.append((workflow_id, execution_id))
+        return started
+
+    def next_fire(self, workflow_id):
+        with self.lock:
+            entry = self.scheduled.get(workflow_id)
+            return entry.next_fire if entry is not None else None
+
+    def upcoming(self, limit=20, until=None):
+        """
+        Dry run: the next fires of all scheduled workflows in time order, as
+        (fire time, workflow). Nothing is executed.
+        """
+        with self.lock:
+            entries = list(self.scheduled.values())
+        streams = [self.entry_fires(entry, until) for entry in entries if entry.next_fire is not None]
+        return list(itertools.islice(heapq.merge(*streams, key=lambda item: item[0]), limit))
+
+    def entry_fires(self, entry, until):
+        for fire in entry.schedule.upcoming(entry.next_fire - 1e-6, until):
+            yield fire, entry.workflow
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                'scheduled': len(self.scheduled),
+                'event_triggers': sum(len(workflows) for workflows in self.event_triggers.values()),
+                'fired': self.fired,
+                'missed': self.missed,
+                'skipped': self.skipped,
+                'backlog': sum(entry.backlog for entry in self.scheduled.values())
+            }
@@ -1,14 +1,24 @@
-from flask import Flask, request, jsonify, websocket
+from flask import Flask, request, jsonify, g, Response
 from flask_cors import CORS
-from conductor_service import ConductorOrchestrationService, WorkflowEngine
+from agent.emotion_monitor import ConductorOrchestrationService
+from agent.session_manager import CameraSessionManager
+from agent.metrics import REGISTRY, HTTP_REQUEST_SECONDS, HTTP_REQUESTS_TOTAL
+from agent.video_stream import FrameBroadcaster, DEFAULT_QUALITY, MJPEG_BOUNDARY
+from agent.landmark_stream import LandmarkBroadcaster
+from agent.analytics import RollupService, combine_rollups
+from agent.recorder import is_valid_session_id
+from agent.workflow_triggers import parse_schedule
+from agent.execution_queue import ExecutionQueueFull
 import threading
+import multiprocessing
+import os
 import logging
 import time
 import json
 from datetime import datetime
+from itertools import islice
 from typing import Dict, List, Optional
 import asyncio
-import queue
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger()
@@ -18,18 +28,63 @@ logger.level = logging.DEBUG
 app = Flask(__name__)
 CORS(app)
 
+# The local camera; additional camera sessions run in worker processes
+DEFAULT_SESSION = 'default'
+
+# Opt-in frame recordings (agent/recorder.py) land here
+RECORDINGS_DIR = os.environ.get('CONDUCTOR_RECORDINGS_DIR', 'recordings')
+
 # Initialize Conductor orchestration service
-conductor_service = ConductorOrchestrationService()
-workflow_engine = WorkflowEngine()
+# CONDUCTOR_HEADLESS=1 skips the local preview window and all overlay drawing.
+# MediaPipe runs in CONDUCTOR_INFERENCE_WORKERS worker processes (0 = in this process)
+# so Flask request handling and inference do not compete for the GIL.
+# The camera and models load in the background so Flask binds immediately; /api/health
+# reports each component, and CONDUCTOR_WARMUP=0 skips the warm-up inference.
+# Workflows are kept in the SQLite database CONDUCTOR_WORKFLOW_DB and resumed after a restart.
+# At most CONDUCTOR_MAX_RUNNING_WORKFLOWS run at once; up to CONDUCTOR_WORKFLOW_QUEUE more wait by priority.
+# Spawned worker processes (inference, camera sessions, rollups) re-import this module as
+# __mp_main__; only the server process builds the service, session manager and rollup pool.
+if multiprocessing.parent_process() is None:
+    conductor_service = ConductorOrchestrationService(
+        headless=os.environ.get('CONDUCTOR_HEADLESS', '0') == '1',
+        inference_workers=int(os.environ.get('CONDUCTOR_INFERENCE_WORKERS', '1')),
+        workflow_workers=int(os.environ.get('CONDUCTOR_WORKFLOW_WORKERS', '4')),
+        workflow_db=os.environ.get('CONDUCTOR_WORKFLOW_DB', 'conductor.db'),
+        max_running_workflows=int(os.environ.get('CONDUCTOR_MAX_RUNNING_WORKFLOWS', '8')),
+        workflow_queue_capacity=int(os.environ.get('CONDUCTOR_WORKFLOW_QUEUE', '100')),
+        warmup=os.environ.get('CONDUCTOR_WARMUP', '1') == '1'
+    )
+    conductor_service.startup.start()
+    # Live annotated video for remote viewers - encodes each frame once per quality level
+    frame_broadcaster = FrameBroadcaster(conductor_service)
+    # Binary landmark packets for the avatar frontends (format in agent/landmark_stream.py)
+    landmark_broadcaster = LandmarkBroadcaster(conductor_service)
+    # Platform adapters registered here run the steps of executed workflows
+    workflow_engine = conductor_service.workflow_engine
+    # Camera sessions other than DEFAULT_SESSION
+    session_manager = CameraSessionManager(
+        on_gesture_command=lambda session_id, command: conductor_service.execute_gesture_command(command)
+    )
+    # Rollups of recordings are served from cache and recomputed in the background
+    rollup_service = RollupService(RECORDINGS_DIR)
+else:
+    conductor_service = frame_broadcaster = landmark_broadcaster = workflow_engine = None
+    session_manager = rollup_service = None
 
 # Global state for real-time updates
 active_connections = set()
-execution_queue = queue.Queue()
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
 
 @app.after_request
 def log_response(response):
-    print(f"Response Status: {response.status}")
-    print(f"Response Headers: {dict(response.headers)}")
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    if 'request_started' in g:
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - g.request_started, route, request.method)
+    HTTP_REQUESTS_TOTAL.inc(route, request.method, response.status_code)
+    logger.debug(f"Response Status: {response.status}")
     return response
 
 @app.route('/test', methods=['GET', 'POST', 'OPTIONS'])
@@ -57,7 +112,8 @@ def create_workflow():
             'platforms': data.get('platforms', []),
             'triggers': data.get('triggers', []),
             'schedule': data.get('schedule', None),
-            'priority': data.get('priority', 'medium')
+            'priority': data.get('priority', 'medium'),
+            'timeout': data.get('timeout', None)
         }
 
         # Validate workflow configuration
@@ -67,8 +123,14 @@ def create_workflow():
                 'message': 'Workflow must contain at least one step'
             }), 400
 
-        # Create workflow through conductor service
-        workflow_id = conductor_service.create_workflow(workflow_config)
+        # Create workflow through conductor service; rejects unknown or cyclic depends_on
+        try:
+            workflow_id = conductor_service.create_workflow(workflow_config)
+        except ValueError as e:
+            return jsonify({
+                'status': 'error',
+                'message': str(e)
+            }), 400
         
         logger.info(f"Created workflow: {workflow_id}")
 
@@ -87,26 +149,23 @@ def create_workflow():
 
 @app.route('/api/workflows/<workflow_id>/execute', methods=['POST'])
 def execute_workflow(workflow_id):
-    """Execute a specific workflow"""
+    """Execute a specific workflow; 429 with Retry-After when the execution queue is full"""
     try:
-        data = request.get_json() or {}
-        execution_params = data.get('parameters', {})
-        
-        success = conductor_service.execute_workflow(workflow_id)
+        try:
+            execution_id = conductor_service.execute_workflow(workflow_id)
+        except ExecutionQueueFull as e:
+            return jsonify({
+                'status': 'error',
+                'message': str(e),
+                'retry_after': e.retry_after
+            }), 429, {'Retry-After': str(e.retry_after)}
         
-        if success:
-            # Add to execution queue for real-time processing
-            execution_queue.put({
-                'type': 'workflow_execution',
-                'workflow_id': workflow_id,
-                'timestamp': datetime.now().isoformat(),
-                'parameters': execution_params
-            })
-            
+        if execution_id:
             return jsonify({
                 'status': 'success',
-                'message': f'Workflow {workflow_id} execution started',
-                'execution_id': f"exec_{int(time.time())}"
+                'message': f'Workflow {workflow_id} execution queued',
+                'execution_id': execution_id,
+                'workflow_status': conductor_service.active_workflows[workflow_id]['status']
             }), 200
         else:
             return jsonify({
@@ -137,8 +196,19 @@ def get_workflow_status(workflow_id):
                     'progress': workflow_status['progress'],
                     'created_at': workflow_status['created_at'].isoformat(),
                     'platforms': workflow_status['platforms'],
-                    'steps_completed': int(workflow_status['progress'] * len(workflow_status['steps'])),
-                    'total_steps': len(workflow_status['steps'])
+                    'steps_completed': sum(1 for r in workflow_status['step_results'] if r['status'] == 'succeeded'),
+                    'total_steps': len(workflow_status['steps']),
+                    'step_results': workflow_status['step_results'],
+                    'error': workflow_status.get('error'),
+                    'execution_id': workflow_status.get('execution_id'),
+                    'trigger': workflow_status.get('trigger'),
+                    'queue_wait': workflow_status.get('queue_wait'),
+                    'priority': workflow_status.get('priority'),
+                    'schedule': workflow_status.get('schedule'),
+                    'triggers': workflow_status.get('triggers', []),
+                    'next_fire_at': fire_time_iso(conductor_service.workflow_triggers.next_fire(workflow_id)),
+                    'executions': (conductor_service.workflow_store.list_executions(workflow_id)
+                                   if conductor_service.workflow_store else [])
                 }
             }), 200
         else:
@@ -155,24 +225,42 @@ def get_workflow_status(workflow_id):
 
 @app.route('/api/workflows', methods=['GET'])
 def list_workflows():
-    """List all workflows with their current status"""
+    """
+    List workflows with their current status.
+    Query parameters: status (comma-separated), platform, offset, limit (max 500), order=newest
+    """
     try:
-        workflows = []
-        for workflow_id, workflow_data in conductor_service.active_workflows.items():
-            workflows.append({
-                'id': workflow_id,
-                'name': workflow_data['name'],
-                'status': workflow_data['status'],
-                'progress': workflow_data['progress'],
-                'created_at': workflow_data['created_at'].isoformat(),
-                'platforms': workflow_data['platforms']
-            })
+        status = request.args.get('status')
+        statuses = [s for s in status.split(',') if s] if status else None
+        offset = max(0, request.args.get('offset', 0, type=int))
+        limit = min(500, max(1, request.args.get('limit', 50, type=int)))
+        
+        registry = conductor_service.active_workflows
+        page, total = registry.list(
+            statuses=statuses,
+            platform=request.args.get('platform'),
+            offset=offset,
+            limit=limit,
+            newest_first=request.args.get('order') == 'newest'
+        )
+        workflows = [{
+            'id': workflow_data['id'],
+            'name': workflow_data['name'],
+            'status': workflow_data['status'],
+            'progress': workflow_data['progress'],
+            'created_at': workflow_data['created_at'].isoformat(),
+            'platforms': workflow_data['platforms']
+        } for workflow_data in page]
         
         return jsonify({
             'status': 'success',
             'data': {
                 'workflows': workflows,
-                'total_count': len(workflows)
+                'total_count': total,
+                'offset': offset,
+                'limit': limit,
+                'next_offset': offset + len(workflows) if offset + len(workflows) < total else None,
+                'status_counts': registry.status_counts()
             }
         }), 200
 
@@ -186,10 +274,9 @@ def list_workflows():
 def pause_workflow(workflow_id):
     """Pause a running workflow"""
     try:
-        if workflow_id in conductor_service.active_workflows:
-            workflow = conductor_service.active_workflows[workflow_id]
-            if workflow['status'] == 'running':
-                workflow['status'] = 'paused'
+        workflow = conductor_service.active_workflows.get(workflow_id)
+        if workflow is not None:
+            if conductor_service.active_workflows.set_status(workflow_id, 'paused', expected=('running',)):
                 conductor_service.avatar_speak(f"Workflow {workflow['name']} paused")
                 
                 return jsonify({
@@ -213,6 +300,110 @@ def pause_workflow(workflow_id):
             'message': str(e)
         }), 500
 
+@app.route('/api/workflows/queue', methods=['GET'])
+def get_workflow_queue():
+    """Execution slots in use and executions waiting, by priority"""
+    try:
+        return jsonify({
+            'status': 'success',
+            'data': conductor_service.workflow_executor.get_stats()
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+def fire_time_iso(timestamp):
+    return datetime.fromtimestamp(timestamp).isoformat() if timestamp is not None else None
+
+@app.route('/api/workflows/schedule/upcoming', methods=['GET'])
+def upcoming_workflow_runs():
+    """
+    Dry run of the trigger scheduler: the next scheduled fires of all workflows, in time order.
+    Query parameters: limit (max 1000), hours (only fires within this many hours)
+    """
+    try:
+        limit = min(1000, max(1, request.args.get('limit', 50, type=int)))
+        hours = request.args.get('hours', type=float)
+        until = time.time() + hours * 3600 if hours is not None else None
+        
+        fires = conductor_service.workflow_triggers.upcoming(limit=limit, until=until)
+        return jsonify({
+            'status': 'success',
+            'data': {
+                'fires': [{
+                    'fire_at': fire_time_iso(fire),
+                    'workflow_id': workflow['id'],
+                    'name': workflow['name'],
+                    'status': workflow['status'],
+                    'priority': workflow.get('priority')
+                } for fire, workflow in fires],
+                'stats': conductor_service.workflow_triggers.get_stats()
+            }
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/api/workflows/schedule/preview', methods=['POST'])
+def preview_workflow_schedule():
+    """Validate a schedule (cron expression, '@every 15m' or schedule object) and list its next fires"""
+    try:
+        data = request.get_json() or {}
+        count = min(100, max(1, int(data.get('count', 10))))
+        try:
+            schedule = parse_schedule(data.get('schedule'))
+        except ValueError as e:
+            return jsonify({
+                'status': 'error',
+                'message': str(e)
+            }), 400
+        if schedule is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'No schedule given'
+            }), 400
+        
+        return jsonify({
+            'status': 'success',
+            'data': {
+                'schedule': schedule.describe(),
+                'fires': [fire_time_iso(fire) for fire in islice(schedule.upcoming(time.time()), count)]
+            }
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/api/events/<event>', methods=['POST'])
+def fire_workflow_event(event):
+    """Raise an event; workflows with a matching trigger start. The JSON body is the event payload."""
+    try:
+        payload = request.get_json(silent=True) or {}
+        started = conductor_service.workflow_triggers.fire_event(event, payload)
+        return jsonify({
+            'status': 'success',
+            'data': {
+                'event': event,
+                'started': [{'workflow_id': workflow_id, 'execution_id': execution_id}
+                            for workflow_id, execution_id in started]
+            }
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
 # ================================================
 # Platform Integration Endpoints
 # ================================================
@@ -312,6 +503,126 @@ def disconnect_platform(platform_name):
             'message': str(e)
         }), 500
 
+# ================================================
+# Camera Session Endpoints
+# ================================================
+
+def requested_session_id():
+    """Session id from the query string or JSON body, defaulting to the local camera"""
+    data = request.get_json(silent=True) or {}
+    return request.args.get('session_id') or data.get('session_id') or DEFAULT_SESSION
+
+def get_session_engagement(session_id):
+    """Engagement report and monitoring flag of a camera session, or None if unknown"""
+    if session_id == DEFAULT_SESSION:
+        return conductor_service.get_engagement_report(), conductor_service.is_monitoring
+    
+    report = session_manager.get_report(session_id)
+    if report is None:
+        return None
+    
+    # Workflows and platforms live in this process, not in the camera worker
+    engagement_report = dict(report['engagement'])
+    engagement_report['active_workflows'] = len(conductor_service.active_workflows)
+    engagement_report['platform_connections'] = sum(
+        1 for p in conductor_service.platform_connections.values() if p['connected'])
+    return engagement_report, report['is_monitoring']
+
+@app.route('/api/sessions', methods=['POST'])
+def create_session():
+    """Start a camera session (device index, video file or stream URL)"""
+    try:
+        data = request.get_json() or {}
+        session_id = data.get('session_id', '')
+        source = data.get('source', None)
+        
+        if not session_id or source is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'session_id and source are required'
+            }), 400
+        
+        # Session ids name the session's recordings directory
+        if not is_valid_session_id(session_id):
+            return jsonify({
+                'status': 'error',
+                'message': 'session_id must be 1-64 letters, digits, "_" or "-"'
+            }), 400
+        
+        if session_id == DEFAULT_SESSION:
+            return jsonify({
+                'status': 'error',
+                'message': f'Session {session_id} already exists'
+            }), 409
+        
+        session = session_manager.create_session(session_id, source)
+        
+        return jsonify({
+            'status': 'success',
+            'data': session
+        }), 201
+
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 409
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/api/sessions', methods=['GET'])
+def list_sessions():
+    """List camera sessions"""
+    try:
+        sessions = [{
+            'session_id': DEFAULT_SESSION,
+            'source': conductor_service.source,
+            'status': 'running' if conductor_service.is_running else 'stopped',
+            'error': None,
+            'worker': 'main',
+            'is_monitoring': conductor_service.is_monitoring,
+            'presence': conductor_service.get_presence_status()
+        }]
+        sessions.extend(session_manager.list_sessions())
+        
+        return jsonify({
+            'status': 'success',
+            'data': {
+                'sessions': sessions,
+                'total_count': len(sessions)
+            }
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/api/sessions/<session_id>', methods=['DELETE'])
+def stop_session(session_id):
+    """Stop a camera session"""
+    try:
+        if session_manager.stop_session(session_id):
+            return jsonify({
+                'status': 'success',
+                'message': f'Session {session_id} stopped'
+            }), 200
+        else:
+            return jsonify({
+                'status': 'error',
+                'message': 'Session not found'
+            }), 404
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
 # ================================================
 # Computer Vision & User Interaction Endpoints
 # ================================================
@@ -328,11 +639,19 @@ def start_monitoring():
             'engagement_analytics': data.get('engagement_analytics', True)
         }
         
-        conductor_service.start_orchestration_session()
+        session_id = requested_session_id()
+        if session_id == DEFAULT_SESSION:
+            conductor_service.start_orchestration_session()
+        elif not session_manager.start_monitoring(session_id):
+            return jsonify({
+                'status': 'error',
+                'message': 'Session not found'
+            }), 404
         
         return jsonify({
             'status': 'success',
             'message': 'Computer vision monitoring started',
+            'session_id': session_id,
             'session_config': session_config
         }), 200
 
@@ -346,14 +665,22 @@ def start_monitoring():
 def get_engagement_metrics():
     """Get real-time user engagement analytics"""
     try:
-        engagement_report = conductor_service.get_engagement_report()
+        session_id = requested_session_id()
+        engagement = get_session_engagement(session_id)
+        if engagement is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'Session not found'
+            }), 404
+        engagement_report, session_active = engagement
         
         return jsonify({
             'status': 'success',
             'data': {
+                'session_id': session_id,
                 'engagement_metrics': engagement_report,
                 'timestamp': datetime.now().isoformat(),
-                'session_active': conductor_service.is_monitoring
+                'session_active': session_active
             }
         }), 200
 
@@ -392,6 +719,65 @@ def execute_gesture_command():
             'message': str(e)
         }), 500
 
+@app.route('/api/monitoring/recording', methods=['POST'])
+def start_recording():
+    """Start recording interaction data and landmarks of a camera session to disk"""
+    try:
+        data = request.get_json(silent=True) or {}
+        session_id = requested_session_id()
+        if session_id == DEFAULT_SESSION:
+            recording = conductor_service.start_recording(
+                RECORDINGS_DIR, record_landmarks=data.get('record_landmarks', True)
+            )
+        elif session_manager.start_recording(session_id, RECORDINGS_DIR):
+            recording = None   # Reported by the session's worker once it has started
+        else:
+            return jsonify({
+                'status': 'error',
+                'message': 'Session not found'
+            }), 404
+        
+        return jsonify({
+            'status': 'success',
+            'message': 'Recording started',
+            'session_id': session_id,
+            'recording': recording
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/api/monitoring/recording', methods=['DELETE'])
+def stop_recording():
+    """Stop recording a camera session"""
+    try:
+        session_id = requested_session_id()
+        if session_id == DEFAULT_SESSION:
+            recording = conductor_service.stop_recording()
+        elif session_manager.stop_recording(session_id):
+            recording = None
+        else:
+            return jsonify({
+                'status': 'error',
+                'message': 'Session not found'
+            }), 404
+        
+        return jsonify({
+            'status': 'success',
+            'message': 'Recording stopped',
+            'session_id': session_id,
+            'recording': recording
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
 # ================================================
 # Avatar & Guidance System Endpoints
 # ================================================
@@ -454,14 +840,23 @@ def get_avatar_status():
 def get_dashboard_analytics():
     """Get comprehensive dashboard analytics"""
     try:
-        engagement_report = conductor_service.get_engagement_report()
+        session_id = requested_session_id()
+        engagement = get_session_engagement(session_id)
+        if engagement is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'Session not found'
+            }), 404
+        engagement_report, session_active = engagement
         
-        # Workflow analytics
+        # Workflow analytics - maintained counters, no scan
+        registry = conductor_service.active_workflows
         workflow_stats = {
-            'total_workflows': len(conductor_service.active_workflows),
-            'running_workflows': sum(1 for w in conductor_service.active_workflows.values() if w['status'] == 'running'),
-            'completed_workflows': sum(1 for w in conductor_service.active_workflows.values() if w['status'] == 'completed'),
-            'paused_workflows': sum(1 for w in conductor_service.active_workflows.values() if w['status'] == 'paused')
+            'total_workflows': registry.count(),
+            'running_workflows': registry.count('running'),
+            'completed_workflows': registry.count('completed'),
+            'paused_workflows': registry.count('paused'),
+            'failed_workflows': registry.count('failed')
         }
         
         # Platform health
@@ -478,7 +873,8 @@ def get_dashboard_analytics():
                 'workflow_analytics': workflow_stats,
                 'platform_health': platform_health,
                 'system_status': {
-                    'monitoring_active': conductor_service.is_monitoring,
+                    'session_id': session_id,
+                    'monitoring_active': session_active,
                     'uptime': time.time() - (conductor_service.monitoring_start if hasattr(conductor_service, 'monitoring_start') else time.time()),
                     'avatar_active': conductor_service.avatar_state['is_speaking']
                 },
@@ -494,8 +890,20 @@ def get_dashboard_analytics():
 
 @app.route('/api/analytics/export', methods=['GET'])
 def export_analytics():
-    """Export analytics data for reporting"""
+    """Export analytics data for reporting, including rollups of recorded sessions"""
     try:
+        # Cached per recording; new or changed recordings are analyzed in the background
+        try:
+            rollups, pending = rollup_service.rollups(request.args.get('session_id'),
+                                                      refresh=request.args.get('refresh') == '1')
+        except ValueError as e:
+            return jsonify({
+                'status': 'error',
+                'message': str(e)
+            }), 400
+        if request.args.get('series') != '1':
+            rollups = [{k: v for k, v in rollup.items() if k != 'attention_series'} for rollup in rollups]
+        
         export_data = {
             'workflows': [
                 {
@@ -509,8 +917,13 @@ def export_analytics():
                 for wid, wdata in conductor_service.active_workflows.items()
             ],
             'platform_connections': conductor_service.platform_connections,
-            'engagement_history': list(conductor_service.attention_buffer),
+            'engagement_history': conductor_service.get_attention_history().tolist(),
             'execution_history': list(conductor_service.execution_buffer),
+            'recorded_sessions': {
+                'totals': combine_rollups(rollups),
+                'sessions': rollups,
+                'pending': len(pending)   # Recordings still being analyzed for the first time
+            },
             'export_timestamp': datetime.now().isoformat()
         }
         
@@ -533,8 +946,13 @@ def export_analytics():
 def health_check():
     """System health check endpoint"""
     try:
+        components = conductor_service.get_readiness()
+        starting = any(c['status'] in ('pending', 'loading') for c in components.values())
+        failed = any(c['status'] == 'failed' for c in components.values())
         health_status = {
-            'service_status': 'healthy',
+            'service_status': 'degraded' if failed else 'starting' if starting else 'healthy',
+            'ready': conductor_service.startup.is_ready(),
+            'components': components,
             'computer_vision': conductor_service.cap.isOpened() if conductor_service.cap else False,
             'workflow_engine': len(conductor_service.active_workflows) >= 0,
             'avatar_system': conductor_service.avatar_state is not None,
@@ -564,13 +982,57 @@ def health_check():
             'message': str(e)
         }), 500
 
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus metrics: per-stage CV latency histograms, frame counters, HTTP latency"""
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
 # ================================================
-# WebSocket for Real-time Updates (Future Enhancement)
+# Live Video Stream
 # ================================================
 
-# Note: For production, consider adding WebSocket support for real-time updates
-# This would enable live workflow status updates, engagement metrics streaming,
-# and real-time avatar communication
+@app.route('/api/stream', methods=['GET'])
+def stream_video():
+    """
+    MJPEG stream of the annotated camera feed, e.g. <img src="/api/stream?quality=60">.
+    Slow viewers skip frames rather than queueing them.
+    """
+    if requested_session_id() != DEFAULT_SESSION:
+        return jsonify({
+            'status': 'error',
+            'message': 'Streaming is only available for the local camera session'
+        }), 404
+
+    quality = request.args.get('quality', DEFAULT_QUALITY, type=int)
+    return Response(frame_broadcaster.mjpeg_stream(quality),
+                    mimetype=f'multipart/x-mixed-replace; boundary={MJPEG_BOUNDARY}')
+
+@app.route('/api/stream/stats', methods=['GET'])
+def stream_stats():
+    """Viewer count and encode statistics of the live video and landmark streams"""
+    return jsonify({
+        'status': 'success',
+        'data': {
+            'video': frame_broadcaster.get_stats(),
+            'landmarks': landmark_broadcaster.get_stats()
+        }
+    }), 200
+
+@app.route('/api/landmarks/stream', methods=['GET'])
+def stream_landmarks():
+    """
+    Length-prefixed binary landmark packets at ?rate= packets per second (1, 5, 10, 15 or 30);
+    a zero length is a heartbeat.
+    Replaces JSON polling of /api/monitoring/engagement for avatar rendering.
+    """
+    if requested_session_id() != DEFAULT_SESSION:
+        return jsonify({
+            'status': 'error',
+            'message': 'Streaming is only available for the local camera session'
+        }), 404
+
+    rate = request.args.get('rate', 15, type=int)
+    return Response(landmark_broadcaster.binary_stream(rate), mimetype='application/octet-stream')
 
 # ================================================
 # Error Handlers
@@ -601,31 +1063,8 @@ def bad_request(error):
 # Application Startup
 # ================================================
 
-def start_background_workers():
-    """Start background workers for workflow execution"""
-    def workflow_processor():
-        while True:
-            try:
-                if not execution_queue.empty():
-                    task = execution_queue.get(timeout=1)
-                    logger.info(f"Processing task: {task}")
-                    # Process workflow execution tasks
-                    # In a real implementation, this would handle actual platform integrations
-                time.sleep(0.1)
-            except queue.Empty:
-                continue
-            except Exception as e:
-                logger.error(f"Error in workflow processor: {e}")
-    
-    # Start background worker thread
-    worker_thread = threading.Thread(target=workflow_processor, daemon=True)
-    worker_thread.start()
-
 # Run the app
 if __name__ == '__main__':
-    # Start background workers
-    start_background_workers()
-    
     # Start Flask in a daemon thread
     flask_thread = threading.Thread(
         target=lambda: app.run(host='0.0.0.0', port=8000, debug=False, threaded=True)
@@ -633,11 +1072,29 @@ if __name__ == '__main__':
     flask_thread.daemon = True
     flask_thread.start()
     
+    # Extra cameras, e.g. CONDUCTOR_CAMERAS="room-a=1,lobby=rtsp://localhost:8554/lobby"
+    for camera in filter(None, os.environ.get('CONDUCTOR_CAMERAS', '').split(',')):
+        camera_id, _, camera_source = camera.partition('=')
+        try:
+            session_manager.create_session(camera_id.strip(), camera_source.strip())
+        except ValueError as e:
+            logger.error(f"Skipping camera {camera!r} from CONDUCTOR_CAMERAS: {e}")
+    
     # Run Conductor interface in main thread
     try:
         logger.info("Starting Conductor AI Orchestration Service...")
-        conductor_service.run_conductor_interface()
+        while True:
+            try:
+                conductor_service.run_conductor_interface()
+                break
+            except RuntimeError as e:
+                # No camera - keep the API up; /api/health reports what failed. Starting
+                # monitoring retries the camera, and the interface runs once it opens
+                logger.error(f"Conductor interface unavailable: {e}")
+                conductor_service.startup.wait_ready('camera')
     except KeyboardInterrupt:
         logger.info("Shutting down Conductor AI...")
     finally:
+        session_manager.shutdown()
+        rollup_service.close()
         conductor_service.stop()
\ No newline at end of file
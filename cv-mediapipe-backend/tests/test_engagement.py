@@ -0,0 +1,82 @@
+# test_engagement.py
+import numpy as np
+import pytest
+
+from agent.engagement import EngagementBuffer
+
+
+def fill(buffer, attentions, start=0.0, interval=0.1, face_present=1):
+    for index, attention in enumerate(attentions):
+        buffer.append(start + index * interval, attention, face_present, 0, 0)
+
+
+def test_window_aggregates_follow_the_trailing_window():
+    buffer = EngagementBuffer(capacity=10, windows=(3, 10))
+    fill(buffer, [0.1, 0.2, 0.3, 0.9, 0.8, 0.7])
+
+    assert buffer.mean_attention(3) == pytest.approx(0.8)
+    assert buffer.mean_attention(10) == pytest.approx(0.5)
+    summary = buffer.summary()
+    assert summary['window_frames'] == 3
+    assert summary['face_frames'] == 3
+
+
+def test_frames_without_a_face_do_not_count_towards_attention():
+    buffer = EngagementBuffer(capacity=10, windows=(4,))
+    fill(buffer, [0.5, 0.5])
+    fill(buffer, [0.0, 0.0], start=1.0, face_present=0)
+
+    assert buffer.mean_attention(4) == pytest.approx(0.5)
+    assert buffer.summary()['face_frames'] == 2
+
+
+def test_window_is_a_contiguous_view_after_wrapping():
+    buffer = EngagementBuffer(capacity=5, windows=(5,))
+    fill(buffer, [i / 10 for i in range(8)])
+
+    window = buffer.window()
+    assert window.base is not None   # A view into the ring, not a copy
+    np.testing.assert_allclose(window['attention'], [0.3, 0.4, 0.5, 0.6, 0.7], rtol=1e-6)
+    np.testing.assert_allclose(buffer.window(2)['timestamp'], [0.6, 0.7])
+    assert buffer.mean_attention(5) == pytest.approx(0.5)
+
+
+def test_percentiles_use_histogram_bins():
+    buffer = EngagementBuffer(capacity=100, windows=(100,))
+    fill(buffer, [i / 100 for i in range(100)])
+
+    assert buffer.attention_percentile(50, 100) == pytest.approx(0.495, abs=0.011)
+    assert buffer.attention_percentile(90, 100) == pytest.approx(0.895, abs=0.011)
+
+
+def test_ewma_tracks_attention():
+    buffer = EngagementBuffer(capacity=10, windows=(5,), ewma_alpha=0.5)
+    fill(buffer, [1.0, 0.0])
+
+    assert buffer.attention_ewma == pytest.approx(0.5)
+
+
+def test_last_interval_uses_real_timestamps_capped_at_the_frame_gap():
+    buffer = EngagementBuffer(capacity=10, windows=(5,), max_frame_gap=1.0)
+    buffer.append(10.0, 0.5, 1, 0, 0)
+    assert buffer.last_interval == 0.0
+    buffer.append(10.25, 0.5, 1, 0, 0)
+    assert buffer.last_interval == pytest.approx(0.25)
+    buffer.append(20.0, 0.5, 1, 0, 0)   # A stall
+    assert buffer.last_interval == 1.0
+
+
+def test_reset_clears_samples_and_aggregates():
+    buffer = EngagementBuffer(capacity=10, windows=(5,))
+    fill(buffer, [0.5] * 6)
+    buffer.reset()
+
+    assert buffer.count == 0
+    assert len(buffer.window()) == 0
+    assert buffer.mean_attention(5) == 0.0
+    assert buffer.attention_ewma is None
+
+
+def test_windows_larger_than_the_capacity_are_rejected():
+    with pytest.raises(ValueError):
+        EngagementBuffer(capacity=10, windows=(20,))
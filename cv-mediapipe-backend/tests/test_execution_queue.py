@@ -0,0 +1,98 @@
+# test_execution_queue.py
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+
+from agent import execution_queue
+from agent.execution_queue import (
+    DEFAULT_RETRY_AFTER, MAX_RETRY_AFTER, ExecutionQueue, ExecutionQueueFull
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replaces the queue's clock; set `clock.now` to move it"""
+    clock = SimpleNamespace(now=1000.0)
+    clock.time = lambda: clock.now
+    monkeypatch.setattr(execution_queue, 'time', clock)
+    return clock
+
+
+def test_priorities_share_dequeues_by_weight():
+    queue = ExecutionQueue(capacity=100)
+    for priority in ('low', 'medium', 'high', 'critical'):
+        for index in range(20):
+            queue.put(f"{priority}-{index}", priority=priority, force=True)
+
+    popped = [queue.pop() for _ in range(15)]
+    assert Counter(priority for priority, _, _ in popped) == {'critical': 8, 'high': 4, 'medium': 2, 'low': 1}
+    # Each priority stays first in, first out
+    assert [item for priority, _, item in popped if priority == 'high'] == ['high-0', 'high-1', 'high-2', 'high-3']
+
+
+def test_idle_priorities_do_not_bank_credit():
+    queue = ExecutionQueue(capacity=100)
+    for index in range(10):
+        queue.put(index, priority='low')
+    for _ in range(5):
+        queue.pop()
+    queue.put('urgent', priority='critical')
+
+    assert queue.pop()[2] == 'urgent'
+    assert queue.pop()[2] == 5
+
+
+def test_admission_keeps_room_for_higher_priorities():
+    queue = ExecutionQueue(capacity=10)
+    for index in range(5):
+        queue.put(index, priority='low')
+    with pytest.raises(ExecutionQueueFull) as rejected:
+        queue.put('one too many', priority='low')
+    assert rejected.value.priority == 'low'
+    assert rejected.value.depth == 5
+    assert rejected.value.retry_after == DEFAULT_RETRY_AFTER
+
+    for index in range(5):
+        queue.put(index, priority='critical')
+    with pytest.raises(ExecutionQueueFull):
+        queue.put('full', priority='critical')
+    queue.put('forced', priority='low', force=True)
+    assert len(queue) == 11
+    assert queue.get_stats()['rejected'] == 2
+
+
+def test_unknown_priority_is_an_error():
+    with pytest.raises(ValueError):
+        ExecutionQueue().put('item', priority='urgent')
+
+
+def drain(queue, clock, count, interval):
+    for _ in range(count):
+        queue.put('drained', priority='critical')
+        queue.pop()
+        clock.now += interval
+
+
+def test_retry_after_follows_the_drain_rate(clock):
+    queue = ExecutionQueue(capacity=10)
+    drain(queue, clock, 11, interval=2.0)
+    clock.now -= 2.0   # Right after the last dequeue: 10 dequeues in 20 seconds
+    for index in range(10):
+        queue.put(index, priority='critical')
+
+    with pytest.raises(ExecutionQueueFull) as rejected:
+        queue.put('late', priority='low')
+    # Six executions have to leave before a low priority one fits, at one every two seconds
+    assert rejected.value.retry_after == 12
+
+
+def test_retry_after_is_capped(clock):
+    queue = ExecutionQueue(capacity=10)
+    drain(queue, clock, 3, interval=1000.0)
+    for index in range(5):
+        queue.put(index, priority='low')
+
+    with pytest.raises(ExecutionQueueFull) as rejected:
+        queue.put('late', priority='low')
+    assert rejected.value.retry_after == MAX_RETRY_AFTER
@@ -0,0 +1,109 @@
+# test_landmark_stream.py
+import numpy as np
+import pytest
+
+from agent.landmark_stream import (
+    FLAG_KEYFRAME, HEADER, LENGTH, LandmarkBroadcaster, LandmarkDecoder, LandmarkEncoder, stream_rate
+)
+from agent.landmarks import FACE_LANDMARK_COUNT, HAND_LANDMARK_COUNT
+
+
+def random_landmarks(rng, faces=1, hands=2):
+    return (rng.random((faces, FACE_LANDMARK_COUNT, 3), dtype=np.float32),
+            rng.random((hands, HAND_LANDMARK_COUNT, 3), dtype=np.float32))
+
+
+def is_keyframe(packet):
+    return bool(HEADER.unpack_from(packet)[1] & FLAG_KEYFRAME)
+
+
+def test_deltas_reconstruct_without_drift():
+    rng = np.random.default_rng(0)
+    encoder, decoder = LandmarkEncoder(keyframe_interval=10 ** 9), LandmarkDecoder()
+    faces, hands = random_landmarks(rng)
+    for _ in range(300):
+        faces += rng.normal(0, 0.002, faces.shape).astype(np.float32)
+        hands += rng.normal(0, 0.005, hands.shape).astype(np.float32)
+        decoded = decoder.decode(encoder.encode(1.0, 0, faces, hands))
+
+    # Each delta is taken against the client's reconstruction, so the error stays at one quantization step
+    assert np.abs(decoded['faces'] - faces).max() < 1e-3
+    assert np.abs(decoded['hands'] - hands).max() < 1e-3
+    assert decoded['faces'].shape == (1, FACE_LANDMARK_COUNT, 3)
+    assert decoded['hands'].shape == (2, HAND_LANDMARK_COUNT, 3)
+
+
+def test_still_landmarks_compress_to_small_deltas():
+    rng = np.random.default_rng(1)
+    encoder = LandmarkEncoder()
+    faces, hands = random_landmarks(rng)
+    keyframe = encoder.encode(1.0, 0, faces, hands)
+    encoder.encode(1.1, 0, faces, hands)   # Settles the float16 rounding of the keyframe
+    delta = encoder.encode(1.2, 0, faces, hands)
+
+    assert is_keyframe(keyframe) and not is_keyframe(delta)
+    assert len(delta) < len(keyframe) / 10
+
+
+def test_keyframes_on_interval_and_count_change():
+    rng = np.random.default_rng(2)
+    encoder = LandmarkEncoder(keyframe_interval=3)
+    faces, hands = random_landmarks(rng)
+    flags = [is_keyframe(encoder.encode(float(i), 0, faces, hands)) for i in range(5)]
+    assert flags == [True, False, False, False, True]
+
+    faces, hands = random_landmarks(rng, hands=1)
+    assert is_keyframe(encoder.encode(6.0, 0, faces, hands))
+
+
+def test_decoder_waits_for_a_keyframe():
+    rng = np.random.default_rng(3)
+    encoder = LandmarkEncoder()
+    faces, hands = random_landmarks(rng)
+    encoder.encode(1.0, 0, faces, hands)
+    delta = encoder.encode(2.0, 5, faces, hands)
+
+    decoder = LandmarkDecoder()
+    assert decoder.decode(delta) is None
+    encoder.force_keyframe = True
+    decoded = decoder.decode(encoder.encode(3.0, 5, faces, hands))
+    assert decoded['gesture_id'] == 5
+    assert decoded['timestamp'] == 3.0
+
+
+def test_unknown_packet_version_is_rejected():
+    encoder = LandmarkEncoder()
+    faces, hands = np.zeros((0, FACE_LANDMARK_COUNT, 3)), np.zeros((0, HAND_LANDMARK_COUNT, 3))
+    packet = bytearray(encoder.encode(1.0, 0, faces, hands))
+    packet[0] = 99
+    with pytest.raises(ValueError):
+        LandmarkDecoder().decode(bytes(packet))
+
+
+def test_stream_rates_snap_to_supported_values():
+    assert stream_rate(14) == 15
+    assert stream_rate(100) == 30
+    assert stream_rate(0) == 1
+
+
+class FakeService:
+    def __init__(self):
+        self.landmark_consumers = []
+
+    def add_landmark_consumer(self, consumer):
+        self.landmark_consumers.append(consumer)
+
+    def remove_landmark_consumer(self, consumer):
+        self.landmark_consumers.remove(consumer)
+
+
+def test_idle_stream_sends_heartbeats_and_releases_the_consumer():
+    service = FakeService()
+    broadcaster = LandmarkBroadcaster(service)
+    stream = broadcaster.binary_stream(15)
+
+    assert next(stream) == LENGTH.pack(0)
+    assert broadcaster.subscribers[0].needs_keyframe
+    stream.close()   # What the WSGI server does once a write fails
+    assert service.landmark_consumers == []
+    assert broadcaster.subscribers == []
@@ -0,0 +1,102 @@
+# test_workflow_registry.py
+from agent.workflow_registry import WorkflowRegistry
+
+
+def workflow(workflow_id, status='queued', platforms=('youtube',)):
+    return {'id': workflow_id, 'status': status, 'platforms': list(platforms),
+            'progress': 0, 'step_results': []}
+
+
+def registry_with(*workflows):
+    registry = WorkflowRegistry()
+    registry.add_many([dict(item) for item in workflows])
+    return registry
+
+
+def test_readers_see_copies_until_touch_publishes_the_change():
+    registry = registry_with(workflow('a'))
+    before = registry['a']
+
+    live = registry.record('a')
+    live['progress'] = 50
+    live['step_results'].append({'step': 'upload', 'ok': True})
+    assert registry['a']['progress'] == 0
+
+    registry.touch('a')
+    after = registry['a']
+    assert after['progress'] == 50
+    assert after['step_results'] == [{'step': 'upload', 'ok': True}]
+    # Published copies share nothing with the live record or with each other
+    live['step_results'][0]['ok'] = False
+    assert after['step_results'][0]['ok'] is True
+    assert before['step_results'] == []
+
+
+def test_status_index_keeps_entry_order_and_counts():
+    registry = registry_with(workflow('a'), workflow('b'), workflow('c'))
+
+    assert registry.set_status('b', 'running')
+    assert registry.set_status('a', 'running')
+    assert registry.status_counts() == {'queued': 1, 'running': 2}
+    assert registry.count() == 3
+    assert registry.count('failed') == 0
+    assert registry.first('running')['id'] == 'b'
+    ids, total = registry.list(statuses=['running'])
+    assert [item['id'] for item in ids] == ['b', 'a'] and total == 2
+
+    registry.set_status('b', 'completed')
+    assert registry.first('running')['id'] == 'a'
+    assert registry.status_counts() == {'queued': 1, 'running': 1, 'completed': 1}
+
+
+def test_set_status_compare_and_set():
+    registry = registry_with(workflow('a', status='running'))
+
+    assert not registry.set_status('a', 'cancelled', expected=('queued',))
+    assert registry['a']['status'] == 'running'
+    assert registry.set_status('a', 'cancelled', expected=('queued', 'running'))
+    assert registry['a']['status'] == 'cancelled'
+    assert not registry.set_status('missing', 'cancelled')
+
+
+def test_remove_drops_the_workflow_from_snapshot_and_index():
+    registry = registry_with(workflow('a'), workflow('b'))
+    registry.current()
+
+    assert registry.remove('a')['id'] == 'a'
+    assert registry.remove('a') is None
+    assert 'a' not in registry
+    assert len(registry) == 1
+    assert registry.status_counts() == {'queued': 1}
+
+
+def test_list_filters_by_platform_and_pages():
+    registry = registry_with(*[workflow(str(index), platforms=('youtube',) if index % 2 else ('tiktok',))
+                               for index in range(6)])
+
+    page, total = registry.list(platform='youtube', offset=1, limit=1)
+    assert [item['id'] for item in page] == ['3'] and total == 3
+    page, total = registry.list(limit=2, newest_first=True)
+    assert [item['id'] for item in page] == ['5', '4'] and total == 6
+    page, total = registry.list(statuses=['queued', 'failed'], limit=None)
+    assert len(page) == 6 and total == 6
+
+
+def test_status_change_callback_runs_for_real_changes_only():
+    registry = registry_with(workflow('a'))
+    changes = []
+    registry.on_status_change = lambda item, old, new: changes.append((item['id'], old, new))
+
+    registry.set_status('a', 'running')
+    registry.set_status('a', 'running')
+    registry.set_status('a', 'completed', expected=('queued',))
+
+    assert changes == [('a', 'queued', 'running')]
+
+
+def test_adding_an_existing_id_replaces_it_in_the_index():
+    registry = registry_with(workflow('a'))
+    registry.add(workflow('a', status='failed'))
+
+    assert len(registry) == 1
+    assert registry.status_counts() == {'failed': 1}
@@ -0,0 +1,96 @@
+# test_workflow_store.py
+from datetime import datetime
+
+import pytest
+
+from agent.workflow_store import WorkflowStore, new_execution_id, new_workflow_id
+
+
+@pytest.fixture
+def store():
+    store = WorkflowStore(':memory:', flush_interval=60)
+    yield store
+    store.close()
+
+
+def workflow(status='queued', **fields):
+    record = {
+        'id': new_workflow_id(), 'name': 'Clip upload', 'status': status, 'progress': 0.0,
+        'created_at': datetime(2026, 3, 1, 12, 30, 15), 'platforms': ['youtube', 'tiktok'],
+        'step_results': []
+    }
+    record.update(fields)
+    return record
+
+
+def test_round_trip_keeps_columns_and_config(store):
+    original = workflow(trigger={'type': 'cron', 'schedule': '0 9 * * *'}, error='timeout', execution_id='exec_1')
+    store.create(original)
+
+    (loaded,) = store.load_workflows()
+    assert loaded == original
+    assert isinstance(loaded['created_at'], datetime)
+
+
+def test_saves_coalesce_until_flush(store):
+    record = workflow()
+    store.create(record)
+    for progress in (0.25, 0.5, 0.75):
+        record['progress'] = progress
+        store.save(record)
+    record['step_results'] = [{'step': 'render', 'status': 'completed'}]
+    store.save(record)
+
+    assert store.load_workflows()[0]['progress'] == 0.0
+    assert store.get_stats()['pending'] == 1
+    store.flush()
+    (loaded,) = store.load_workflows()
+    assert loaded['progress'] == 0.75
+    assert loaded['step_results'] == [{'step': 'render', 'status': 'completed'}]
+    assert store.rows_written == 1
+
+
+def test_load_returns_creation_order(store):
+    records = [workflow(created_at=datetime(2026, 3, day)) for day in (3, 1, 2)]
+    for record in records:
+        store.create(record)
+
+    assert [item['created_at'].day for item in store.load_workflows()] == [1, 2, 3]
+
+
+def test_executions_are_listed_newest_first(store):
+    record = workflow()
+    for started_at in (100.0, 300.0, 200.0):
+        store.save_execution(new_execution_id(), record['id'], 'completed', started_at, started_at + 5)
+    store.save_execution(new_execution_id(), 'other', 'failed', 400.0)
+    store.flush()
+
+    executions = store.list_executions(record['id'], limit=2)
+    assert [item['started_at'] for item in executions] == [300.0, 200.0]
+    assert executions[0]['finished_at'] == 305.0
+
+
+def test_ids_are_unique_and_sort_in_creation_order():
+    ids = [new_workflow_id() for _ in range(1000)]
+
+    assert len(set(ids)) == len(ids)
+    assert sorted(ids) == ids
+    assert all(len(item) == len('workflow_') + 26 for item in ids)
+
+
+def test_pending_writes_survive_a_restart(tmp_path):
+    path = str(tmp_path / 'conductor.db')
+    store = WorkflowStore(path, flush_interval=60)
+    running = workflow(status='running')
+    store.create(running)
+    running['progress'] = 0.5
+    store.save(running)
+    store.close()
+
+    reopened = WorkflowStore(path)
+    try:
+        (loaded,) = reopened.load_workflows()
+        assert loaded['status'] == 'running'
+        assert loaded['progress'] == 0.5
+    finally:
+        reopened.close()
@@ -0,0 +1,156 @@
+# test_workflow_triggers.py
+import time
+from datetime import datetime
+
+import pytest
+
+from agent.execution_queue import ExecutionQueueFull
+from agent.workflow_triggers import (
+    CronSchedule, WorkflowTriggerScheduler, parse_cron_field, parse_schedule
+)
+
+
+class FakeTimer:
+    """Records what the trigger scheduler arms instead of running it"""
+
+    def __init__(self):
+        self.armed = {}
+
+    def schedule(self, delay, callback, arg, key=None):
+        self.armed[key] = (delay, callback, arg)
+
+    def cancel(self, key):
+        self.armed.pop(key, None)
+
+
+class FakeExecutor:
+    def __init__(self):
+        self.calls = []
+        self.error = None
+
+    def __call__(self, workflow_id, reason):
+        if self.error is not None:
+            raise self.error
+        self.calls.append((workflow_id, reason))
+        return f"exec_{len(self.calls)}"
+
+
+def local(*args):
+    return datetime(*args).timestamp()
+
+
+def test_parse_cron_field():
+    assert parse_cron_field('*/15', 0, 59) == {0, 15, 30, 45}
+    assert parse_cron_field('1-5', 0, 6) == {1, 2, 3, 4, 5}
+    assert parse_cron_field('10-20/5,59', 0, 59) == {10, 15, 20, 59}
+    assert parse_cron_field('5/20', 0, 59) == {5, 25, 45}
+    assert parse_cron_field('JAN,mar', 1, 12, {'jan': 1, 'mar': 3}) == {1, 3}
+    for text in ('60', '5-1', 'x', '*/0', ''):
+        with pytest.raises(ValueError):
+            parse_cron_field(text, 0, 59)
+
+
+def test_next_after_finds_the_next_matching_minute():
+    schedule = CronSchedule('30 9 * * *')
+
+    assert schedule.next_after(local(2026, 1, 1, 9, 0)) == local(2026, 1, 1, 9, 30)
+    assert schedule.next_after(local(2026, 1, 1, 9, 30)) == local(2026, 1, 2, 9, 30)
+    assert CronSchedule('@hourly').next_after(local(2026, 1, 1, 23, 59, 30)) == local(2026, 1, 2, 0, 0)
+
+
+def test_day_and_weekday_combine_like_cron():
+    # Both restricted: either matches (2026-02-01 is a Sunday)
+    assert CronSchedule('0 0 1 * 1').next_after(local(2026, 1, 1)) == local(2026, 1, 5)
+    assert CronSchedule('0 0 1 * 1').next_after(local(2026, 1, 26)) == local(2026, 2, 1)
+    # A day field starting with '*' narrows the weekdays instead: odd days that are Mondays
+    every_other = CronSchedule('0 0 */2 * 1')
+    assert every_other.next_after(local(2026, 1, 1)) == local(2026, 1, 5)
+    assert every_other.next_after(local(2026, 1, 5)) == local(2026, 1, 19)
+
+
+def test_impossible_schedules_are_rejected():
+    assert CronSchedule('0 0 30 2 *').next_after(local(2026, 1, 1)) is None
+    with pytest.raises(ValueError):
+        parse_schedule('0 0 30 2 *')
+    with pytest.raises(ValueError):
+        parse_schedule({'cron': '@daily', 'misfire': 'later'})
+    with pytest.raises(ValueError):
+        parse_schedule('@every 0s')
+
+
+def scheduler_with(schedule, created_ago, execute=None):
+    """A scheduler with one workflow on `schedule`, created `created_ago` seconds ago"""
+    timer = FakeTimer()
+    execute = execute or FakeExecutor()
+    scheduler = WorkflowTriggerScheduler(execute, timer=timer)
+    scheduler.add({'id': 'w1', 'created_at': time.time() - created_ago, 'schedule': schedule})
+    return scheduler, timer, execute
+
+
+def test_catch_up_runs_missed_fires_one_after_another():
+    scheduler, timer, execute = scheduler_with(
+        {'every': '60s', 'misfire': 'catch_up', 'max_catch_up': 3}, created_ago=630)
+    assert timer.armed[('workflow_schedule', 'w1')][0] == 0.0
+
+    scheduler.on_timer('w1')
+    assert len(execute.calls) == 1
+    stats = scheduler.get_stats()
+    assert stats['backlog'] == 2 and stats['missed'] == 1
+
+    scheduler.workflow_finished('w1')
+    scheduler.workflow_finished('w1')
+    scheduler.workflow_finished('w1')
+    assert len(execute.calls) == 3
+    assert scheduler.get_stats()['backlog'] == 0
+    assert scheduler.next_fire('w1') > time.time()
+
+
+def test_fire_once_runs_a_single_time_for_any_number_of_misses():
+    scheduler, timer, execute = scheduler_with({'every': '60s', 'misfire': 'fire_once'}, created_ago=630)
+
+    scheduler.on_timer('w1')
+    scheduler.workflow_finished('w1')
+
+    assert execute.calls == [('w1', 'schedule')]
+    assert scheduler.get_stats()['missed'] == 9
+
+
+def test_skip_runs_only_within_the_grace_period():
+    scheduler, timer, execute = scheduler_with(
+        {'every': '60s', 'misfire': 'skip', 'misfire_grace': 5}, created_ago=630)
+    scheduler.on_timer('w1')
+    assert execute.calls == []
+    assert scheduler.get_stats()['missed'] == 10
+
+    scheduler, timer, execute = scheduler_with(
+        {'every': '60s', 'misfire': 'skip', 'misfire_grace': 5}, created_ago=602)
+    scheduler.on_timer('w1')
+    assert len(execute.calls) == 1
+
+
+def test_catch_up_retries_fires_rejected_by_a_full_queue():
+    execute = FakeExecutor()
+    execute.error = ExecutionQueueFull('medium', 75, 12)
+    scheduler, timer, execute = scheduler_with(
+        {'every': '60s', 'misfire': 'catch_up', 'max_catch_up': 2}, created_ago=150, execute=execute)
+
+    scheduler.on_timer('w1')
+    delay, callback, entry = timer.armed[('workflow_dispatch', 'w1')]
+    assert delay == 12
+    assert scheduler.get_stats()['backlog'] == 2
+
+    execute.error = None
+    callback(entry)
+    assert len(execute.calls) == 1
+    assert scheduler.get_stats()['backlog'] == 1
+
+
+def test_events_start_matching_workflows_only():
+    scheduler = WorkflowTriggerScheduler(FakeExecutor(), timer=FakeTimer())
+    scheduler.add({'id': 'thumbs', 'created_at': 0, 'triggers': [{'event': 'gesture', 'gesture': 'thumbs_up'}]})
+    scheduler.add({'id': 'any', 'created_at': 0, 'triggers': ['gesture']})
+
+    started = scheduler.fire_event('gesture', {'gesture': 'wave'})
+    assert [workflow_id for workflow_id, _ in started] == ['any']
+    started = scheduler.fire_event('gesture', {'gesture': 'thumbs_up', 'workflow_id': 'any'})
+    assert [workflow_id for workflow_id, _ in started] == ['thumbs']